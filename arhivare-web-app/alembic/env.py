@@ -45,6 +45,15 @@ def run_migrations_offline() -> None:
     with context.begin_transaction():
         context.run_migrations()
 
+# Modul "online" (zero-downtime): `alembic -x online=true upgrade head` sau MIGRATION_ONLINE=true
+# - fiecare migrare în tranzacția ei: indexurile CONCURRENTLY și backfill-urile din
+#   app.migration_helpers pot ieși din tranzacție fără să țină lock-uri pe migrările anterioare
+# - lock_timeout: un ALTER TABLE care așteaptă un lock renunță repede în loc să blocheze
+#   toate query-urile din spatele lui; migrarea se poate relua
+x_args = context.get_x_argument(as_dictionary=True)
+online_mode = (x_args.get("online") or os.getenv("MIGRATION_ONLINE", "false")).lower() == "true"
+lock_timeout = x_args.get("lock_timeout") or os.getenv("MIGRATION_LOCK_TIMEOUT", "5s")
+
 def run_migrations_online() -> None:
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
@@ -53,7 +62,17 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        if online_mode and connection.dialect.name == "postgresql":
+            connection.exec_driver_sql(f"SET lock_timeout = '{lock_timeout}'")
+            connection.exec_driver_sql("SET statement_timeout = 0")
+            connection.commit()
+            print(f"🟢 Online migration mode (lock_timeout={lock_timeout})")
+
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            transaction_per_migration=online_mode,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,61 @@
+"""Refresh tokens and the access-token revocation list
+
+Revision ID: auth_tokens
+Revises: user_token_version
+Create Date: 2025-09-12 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = 'auth_tokens'
+down_revision = 'user_token_version'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create refresh_tokens and revoked_tokens"""
+
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'refresh_tokens' not in existing:
+        print("🔧 Creating refresh_tokens...")
+        op.create_table(
+            'refresh_tokens',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('token_hash', sa.String(length=64), nullable=False),
+            sa.Column('family_id', sa.String(length=32), nullable=False),
+            sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+            sa.Column('revoked_at', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        )
+        op.create_index('ix_refresh_tokens_id', 'refresh_tokens', ['id'])
+        op.create_index('ix_refresh_tokens_user_id', 'refresh_tokens', ['user_id'])
+        op.create_index('ix_refresh_tokens_token_hash', 'refresh_tokens', ['token_hash'], unique=True)
+        op.create_index('ix_refresh_tokens_family_id', 'refresh_tokens', ['family_id'])
+
+    if 'revoked_tokens' not in existing:
+        print("🔧 Creating revoked_tokens...")
+        op.create_table(
+            'revoked_tokens',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('jti', sa.String(length=32), nullable=False, unique=True),
+            sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+            sa.Column('revoked_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        )
+        op.create_index('ix_revoked_tokens_id', 'revoked_tokens', ['id'])
+        op.create_index('ix_revoked_tokens_expires_at', 'revoked_tokens', ['expires_at'])
+
+    print("\n🎉 Auth token tables created!")
+
+
+def downgrade():
+    """Drop refresh_tokens and revoked_tokens"""
+
+    print("⏪ Dropping auth token tables...")
+    op.drop_table('revoked_tokens')
+    op.drop_table('refresh_tokens')
+    print("⏪ Migration rolled back successfully!")
@@ -0,0 +1,48 @@
+"""Append-only change log for fond mutations
+
+Revision ID: fond_change_log
+Revises: auth_tokens
+Create Date: 2025-09-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = 'fond_change_log'
+down_revision = 'auth_tokens'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create fond_changes (no foreign keys: history outlives fonds and users)"""
+
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'fond_changes' not in existing:
+        print("🔧 Creating fond_changes...")
+        op.create_table(
+            'fond_changes',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('fond_id', sa.Integer(), nullable=False),
+            sa.Column('actor_id', sa.Integer(), nullable=True),
+            sa.Column('action', sa.String(length=32), nullable=False),
+            sa.Column('changes', sa.JSON(), nullable=False),
+            sa.Column('changed_at', sa.DateTime(timezone=True), nullable=False),
+            sa.Column('recorded_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        )
+        op.create_index('ix_fond_changes_id', 'fond_changes', ['id'])
+        op.create_index('ix_fond_changes_fond_id', 'fond_changes', ['fond_id'])
+        op.create_index('ix_fond_changes_actor_id', 'fond_changes', ['actor_id'])
+        op.create_index('ix_fond_changes_changed_at', 'fond_changes', ['changed_at'])
+
+    print("\n🎉 Fond change log created!")
+
+
+def downgrade():
+    """Drop fond_changes"""
+
+    print("⏪ Dropping fond_changes...")
+    op.drop_table('fond_changes')
+    print("⏪ Migration rolled back successfully!")
@@ -0,0 +1,76 @@
+"""Persisted normalized owner names with B-tree and trigram indexes
+
+Revision ID: normalized_owner_names
+Revises: complete_ownership_roles
+Create Date: 2025-09-02 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.migration_helpers import (
+    add_column_if_missing, backfill_in_batches, create_index_online, drop_index_online, is_postgresql
+)
+from app.services.company_names import match_key
+
+# revision identifiers
+revision = 'normalized_owner_names'
+down_revision = 'complete_ownership_roles'
+branch_labels = None
+depends_on = None
+
+# (tabel, coloana sursă, coloana normalizată)
+NORMALIZED_COLUMNS = [
+    ('users', 'company_name', 'company_name_normalized'),
+    ('fonds', 'holder_name', 'holder_name_normalized'),
+]
+
+
+def upgrade():
+    """Add normalized owner-name columns, backfill them and index them"""
+
+    print("🔧 Adding normalized owner-name columns...")
+    for table, _, target in NORMALIZED_COLUMNS:
+        add_column_if_missing(table, sa.Column(target, sa.String(length=255), nullable=True))
+
+    print("📝 Backfilling normalized names...")
+    for table, source, target in NORMALIZED_COLUMNS:
+        updated = backfill_in_batches(
+            table, [source],
+            pending=f"{source} IS NOT NULL AND {target} IS NULL",
+            compute=lambda row, source=source, target=target: {target: match_key(row._mapping[source]) or None},
+        )
+        print(f"  ✅ {table}.{target} backfilled ({updated} rows)")
+
+    print("📊 Creating B-tree indexes (exact match)...")
+    for table, _, target in NORMALIZED_COLUMNS:
+        create_index_online(f'ix_{table}_{target}', table, [target])
+
+    if not is_postgresql():
+        print("  ℹ️  Trigram indexes skipped (PostgreSQL only)")
+        return
+
+    print("📊 Creating trigram indexes (LIKE '%...%' / similarity)...")
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, _, target in NORMALIZED_COLUMNS:
+        create_index_online(
+            f'ix_{table}_{target}_trgm', table, [target],
+            postgresql_using='gin',
+            postgresql_ops={target: 'gin_trgm_ops'},
+        )
+
+    print("\n🎉 Normalized owner-name migration completed!")
+
+
+def downgrade():
+    """Drop normalized owner-name columns and their indexes"""
+
+    print("⏪ Reverting normalized owner-name migration...")
+
+    for table, _, target in NORMALIZED_COLUMNS:
+        if is_postgresql():
+            drop_index_online(f'ix_{table}_{target}_trgm', table)
+        drop_index_online(f'ix_{table}_{target}', table)
+        op.drop_column(table, target)
+
+    print("⏪ Migration rolled back successfully!")
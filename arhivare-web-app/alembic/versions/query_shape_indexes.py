@@ -0,0 +1,89 @@
+"""Partial and covering indexes matching the hot query shapes
+
+Revision ID: query_shape_indexes
+Revises: normalized_owner_names
+Create Date: 2025-09-03 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.migration_helpers import create_index_online, drop_index_online, is_postgresql
+
+# revision identifiers
+revision = 'query_shape_indexes'
+down_revision = 'normalized_owner_names'
+branch_labels = None
+depends_on = None
+
+# Coloanele căutate cu ILIKE '%q%' de /search (crud.fond.search_fonds)
+SEARCH_COLUMNS = ['company_name', 'holder_name', 'address', 'notes']
+
+
+def _postgresql_indexes():
+    """(nume, tabel, coloane, kwargs) - construite CONCURRENTLY pe PostgreSQL"""
+    return [
+        # get_multi(owner_id=0) / auto-assignment: fonduri nealocate, paginate după id
+        ('ix_fonds_unassigned', 'fonds', ['active', 'id'], {
+            'postgresql_where': sa.text('owner_id IS NULL'),
+        }),
+        # /search: un singur index GIN trigram multi-coloană, doar pe fondurile active;
+        # fiecare ramură a OR-ului ILIKE devine un bitmap scan pe același index
+        ('ix_fonds_search_trgm_active', 'fonds', SEARCH_COLUMNS, {
+            'postgresql_using': 'gin',
+            'postgresql_ops': {column: 'gin_trgm_ops' for column in SEARCH_COLUMNS},
+            'postgresql_where': sa.text('active'),
+        }),
+        # get_client_statistics: cel mai recent fond al unui owner, index-only scan
+        ('ix_fonds_owner_id_desc', 'fonds', ['owner_id', sa.text('id DESC')], {
+            'postgresql_include': ['company_name'],
+        }),
+        # find_client_by_company_name: doar clienții, după cheia normalizată
+        ('ix_users_client_company_name_normalized', 'users', ['company_name_normalized'], {
+            'postgresql_where': sa.text("role = 'client'"),
+        }),
+    ]
+
+
+def _generic_indexes():
+    """Variante portabile (ex. SQLite în dezvoltare): fără GIN / INCLUDE"""
+    return [
+        ('ix_fonds_unassigned', 'fonds', ['active', 'id'], {
+            'sqlite_where': sa.text('owner_id IS NULL'),
+        }),
+        ('ix_fonds_owner_id_desc', 'fonds', ['owner_id', sa.text('id DESC')], {}),
+        ('ix_users_client_company_name_normalized', 'users', ['company_name_normalized'], {
+            'sqlite_where': sa.text("role = 'client'"),
+        }),
+    ]
+
+
+def _indexes():
+    if is_postgresql():
+        return _postgresql_indexes()
+    return _generic_indexes()
+
+
+def upgrade():
+    """Create partial/covering indexes without locking writes on PostgreSQL"""
+
+    print("📊 Creating query-shape indexes...")
+
+    if is_postgresql():
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for name, table, columns, kwargs in _indexes():
+        create_index_online(name, table, columns, **kwargs)
+
+    print("\n🎉 Query-shape indexes created!")
+
+
+def downgrade():
+    """Drop the query-shape indexes"""
+
+    print("⏪ Dropping query-shape indexes...")
+
+    for name, table, _, _ in reversed(_indexes()):
+        drop_index_online(name, table)
+
+    print("⏪ Migration rolled back successfully!")
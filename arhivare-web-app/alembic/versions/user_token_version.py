@@ -0,0 +1,36 @@
+"""Per-user token version for stateless JWT revocation
+
+Revision ID: user_token_version
+Revises: query_shape_indexes
+Create Date: 2025-09-10 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.migration_helpers import add_column_if_missing
+
+# revision identifiers
+revision = 'user_token_version'
+down_revision = 'query_shape_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add users.token_version (NOT NULL, default 0 - no backfill needed)"""
+
+    print("🔧 Adding users.token_version...")
+    add_column_if_missing('users', sa.Column(
+        'token_version', sa.Integer(), nullable=False, server_default=sa.text('0')
+    ))
+
+    print("\n🎉 Token version column added!")
+
+
+def downgrade():
+    """Drop users.token_version"""
+
+    print("⏪ Dropping users.token_version...")
+    op.drop_column('users', 'token_version')
+    print("⏪ Migration rolled back successfully!")
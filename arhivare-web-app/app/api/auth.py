@@ -1,12 +1,25 @@
 # app/api/auth.py - AUTENTIFICARE REPARATĂ
-from fastapi import APIRouter, Depends, HTTPException, status
+import math
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from app.database import get_db  # Import unificat
-from app.core.security import create_access_token, verify_password, verify_token
+from app.core.config import settings
+from app.core.security import (
+    create_stream_ticket, create_user_access_token, decode_stream_ticket, decode_token, verify_password,
+)
+from app.crud import auth_token as crud_auth_token
+from app.crud.user import get_user_by_username
 from app.models.user import User
+from app.services.login_throttle import login_throttle
+from app.services.token_revocation import revocation_list
+from app.services.token_versions import token_versions
 
 router = APIRouter(tags=["Authentication"])
 security = HTTPBearer(auto_error=False)
@@ -19,39 +32,131 @@ class LoginResponse(BaseModel):
     access_token: str
     token_type: str
     user: dict
+    refresh_token: Optional[str] = None
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
 
 class UserInfo(BaseModel):
     id: int
     username: str
     role: str
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> User:
-    """Get current authenticated user"""
+class StreamTicketResponse(BaseModel):
+    ticket: str
+    expires_in: int
+
+@dataclass(frozen=True)
+class Principal:
+    """Identitatea din claim-urile token-ului - suficientă pentru rutele read-only"""
+    id: int
+    username: str
+    role: str
+
+    @property
+    def is_admin(self):
+        return self.role == "admin"
+
+    @property
+    def is_audit(self):
+        return self.role == "audit"
+
+    @property
+    def is_client(self):
+        return self.role == "client"
+
+def _token_payload(credentials: Optional[HTTPAuthorizationCredentials], db: Session) -> Dict[str, Any]:
     if credentials is None or not credentials.scheme or credentials.scheme.lower() != "bearer":
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, 
             detail="Not authenticated"
         )
 
-    username = verify_token(credentials.credentials)
-    if not username:
+    payload = decode_token(credentials.credentials)
+    if not payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, 
             detail="Invalid token"
         )
 
-    user = db.query(User).filter(User.username == username).first()
+    # Lista de revocare e în memorie; DB-ul e citit cel mult o dată la TOKEN_REVOCATION_SYNC_SECONDS
+    revocation_list.sync_if_due(db)
+    if "jti" in payload and revocation_list.is_revoked(payload["jti"]):
+        raise _token_revoked()
+    return payload
+
+def _token_revoked() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Token revoked"
+    )
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db),
+) -> User:
+    """Get current authenticated user"""
+    payload = _token_payload(credentials, db)
+
+    user = get_user_by_username(db, payload["sub"])
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, 
             detail="User not found"
         )
 
+    # Token-urile vechi (doar `sub`) nu au versiune
+    if "ver" in payload and payload["ver"] != user.token_version:
+        raise _token_revoked()
+
     return user
 
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db),
+) -> Principal:
+    """
+    Ca get_current_user, dar fără SELECT pe users: se folosesc claim-urile `uid`/`role`,
+    iar versiunea token-ului se compară cu cea din cache (services.token_versions).
+    Doar pentru rutele read-only - scrierile folosesc get_current_user.
+    """
+    payload = _token_payload(credentials, db)
+
+    if not all(claim in payload for claim in ("uid", "role", "ver")):
+        user = await get_current_user(credentials, db)
+        return Principal(id=user.id, username=user.username, role=user.role)
+
+    return _principal_from_claims(payload, db)
+
+def _principal_from_claims(payload: Dict[str, Any], db: Session) -> Principal:
+    version, role = token_versions.get(db, payload["uid"])
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, 
+            detail="User not found"
+        )
+    if version != payload["ver"] or role != payload["role"]:
+        raise _token_revoked()
+
+    return Principal(id=payload["uid"], username=payload["sub"], role=payload["role"])
+
+def get_stream_principal(ticket: Optional[str], db: Session) -> Principal:
+    """Principal-ul dintr-un ticket de stream (POST /auth/stream-ticket), cu aceleași verificări de revocare"""
+    payload = decode_stream_ticket(ticket) if ticket else None
+    if not payload:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid stream ticket"
+        )
+
+    revocation_list.sync_if_due(db)
+    if "jti" in payload and revocation_list.is_revoked(payload["jti"]):
+        raise _token_revoked()
+    return _principal_from_claims(payload, db)
+
 async def get_current_admin_user(current_user: User = Depends(get_current_user)) -> User:
     """Require admin role"""
     if current_user.role != 'admin':
@@ -66,28 +171,89 @@ async def get_current_client_user(current_user: User = Depends(get_current_user)
 
 # === AUTH ROUTES ===
 @router.post("/login", response_model=LoginResponse)
-async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
+async def login(login_data: LoginRequest, request: Request, db: Session = Depends(get_db)):
     """User login endpoint"""
-    user = db.query(User).filter(User.username == login_data.username).first()
+    # Throttling înainte de orice query sau bcrypt verify
+    retry_after = login_throttle.check(login_data.username, request.client.host if request.client else None)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, try again later",
+            headers={"Retry-After": str(math.ceil(retry_after))}
+        )
+
+    user = get_user_by_username(db, login_data.username)
     if not user or not verify_password(login_data.password, user.password_hash):
+        login_throttle.record_failure(login_data.username)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, 
             detail="Invalid username or password"
         )
 
-    token = create_access_token(subject=user.username)
+    login_throttle.record_success(login_data.username)
+
+    return _token_response(user, crud_auth_token.issue_refresh_token(db, user))
+
+def _token_response(user: User, refresh_token: str) -> LoginResponse:
     return LoginResponse(
-        access_token=token,
+        access_token=create_user_access_token(user),
         token_type="bearer",
         user={
             "id": user.id, 
             "username": user.username, 
             "role": user.role
-        }
+        },
+        refresh_token=refresh_token
     )
 
+@router.post("/refresh", response_model=LoginResponse)
+async def refresh(request: RefreshRequest, db: Session = Depends(get_db)):
+    """Schimbă un refresh token pe o pereche nouă (access + refresh); token-ul vechi devine invalid"""
+    user, refresh_token = crud_auth_token.rotate_refresh_token(db, request.refresh_token)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token"
+        )
+    return _token_response(user, refresh_token)
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    request: Optional[LogoutRequest] = None,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db),
+):
+    """Revocă access token-ul curent și, dacă e trimis, sesiunea refresh token-ului"""
+    user = await get_current_user(credentials, db)
+    payload = decode_token(credentials.credentials)
+
+    if "jti" in payload:
+        expires_at = datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
+        crud_auth_token.revoke_access_token(db, payload["jti"], expires_at)
+    if request is not None and request.refresh_token:
+        crud_auth_token.revoke_refresh_token(db, request.refresh_token, user.id)
+    return None
+
+@router.post("/stream-ticket", response_model=StreamTicketResponse)
+async def stream_ticket(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db),
+):
+    """
+    Ticket pentru GET /events/stream?ticket=...: expiră după EVENTS_TICKET_SECONDS și
+    nu e acceptat ca access token. Poartă jti-ul token-ului din care a fost emis, deci
+    logout-ul îl revocă și pe el.
+    """
+    principal = await get_current_principal(credentials, db)
+    version, _ = token_versions.get(db, principal.id)
+    claims = {"sub": principal.username, "uid": principal.id, "role": principal.role, "ver": version}
+    parent_jti = decode_token(credentials.credentials).get("jti")
+    if parent_jti:
+        claims["jti"] = parent_jti
+    return StreamTicketResponse(ticket=create_stream_ticket(claims), expires_in=settings.EVENTS_TICKET_SECONDS)
+
 @router.get("/me", response_model=UserInfo)
-async def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: Principal = Depends(get_current_principal)):
     """Get current user information"""
     return UserInfo(
         id=current_user.id,
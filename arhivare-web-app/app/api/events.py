@@ -0,0 +1,80 @@
+# app/api/events.py - Server-Sent Events stream for dashboards
+import json
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.orm import Session
+
+from app.api.auth import Principal, get_current_principal, get_stream_principal, security
+from app.core.config import settings
+from app.database import get_db
+from app.services.events import FondEvent, Subscription, fond_events
+
+router = APIRouter(tags=["Dashboard Events"])
+
+_STREAM_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # nginx nu trebuie să țină evenimentele în buffer
+}
+
+
+def format_event(event_type: str, data: dict, event_id: Optional[int] = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event_type}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def _event_frames(request: Request, principal: Principal, subscription: Subscription) -> AsyncIterator[str]:
+    try:
+        yield f"retry: {settings.EVENTS_RETRY_MS}\n\n"
+        yield format_event("ready", {"role": principal.role, "user_id": principal.id})
+        while True:
+            item: Optional[FondEvent] = await subscription.next_event(settings.EVENTS_HEARTBEAT_SECONDS)
+            if item is None:
+                if await request.is_disconnected():
+                    return
+                # Comentariu SSE: ține conexiunea deschisă prin proxy-uri, ignorat de EventSource
+                yield ": keep-alive\n\n"
+                continue
+            yield format_event(item.type, item.data, fond_events.next_id())
+    finally:
+        fond_events.unsubscribe(subscription)
+
+
+@router.get("/events/stream")
+async def event_stream(
+    request: Request,
+    ticket: Optional[str] = Query(None, description="Ticket din POST /auth/stream-ticket (EventSource nu poate trimite header-ul Authorization)"),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: Session = Depends(get_db),
+):
+    """
+    Stream text/event-stream cu evenimentele fondurilor vizibile utilizatorului:
+    fond_created, fond_updated, fond_assigned, fond_deleted, stats_changed și
+    resync (reîncarcă tot). Autentificarea (header Bearer sau `ticket` de scurtă
+    durată - niciodată access token-ul în URL, unde ar ajunge în loguri) se face o
+    singură dată, la conectare; după aceea stream-ul nu mai atinge baza de date.
+    """
+    if credentials is None and ticket:
+        principal = get_stream_principal(ticket, db)
+    else:
+        principal = await get_current_principal(credentials, db)
+
+    subscription = fond_events.subscribe(principal.role, principal.id)
+    if subscription is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many open event streams",
+            headers={"Retry-After": "30"},
+        )
+
+    return StreamingResponse(
+        _event_frames(request, principal, subscription),
+        media_type="text/event-stream",
+        headers=_STREAM_HEADERS,
+    )
@@ -0,0 +1,59 @@
+# app/api/fieldsets.py - Sparse fieldsets (`fields=`) for fond endpoints
+"""
+`fields=id,company_name,holder_name` restrânge atât SELECT-ul (load_only) cât și
+răspunsul JSON. `id` este inclus mereu; `owner` adaugă un joinedload pe owner.
+"""
+from typing import Any, Dict, Iterable, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import joinedload, load_only
+
+from app.models.fond import Fond
+
+# Câmpurile publice ale unui fond (ordinea din FondResponse)
+FOND_FIELDS = (
+    "id", "company_name", "holder_name", "address", "email", "phone", "notes",
+    "source_url", "active", "owner_id", "created_at", "updated_at", "owner",
+)
+
+FIELDS_QUERY_DESCRIPTION = "Câmpuri separate prin virgulă (ex. id,company_name,holder_name); implicit toate"
+
+
+def parse_fields(fields: Optional[str], extra: Iterable[str] = ()) -> Optional[List[str]]:
+    """Lista de câmpuri cerute (cu `id` primul) sau None pentru răspunsul complet"""
+    if fields is None or not fields.strip():
+        return None
+
+    allowed = set(FOND_FIELDS) | set(extra)
+    requested = []
+    for name in (part.strip() for part in fields.split(",")):
+        if name and name not in requested:
+            requested.append(name)
+
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(sorted(allowed))}"
+        )
+
+    if "id" in requested:
+        requested.remove("id")
+    return ["id"] + requested
+
+
+def fond_load_options(fields: Optional[List[str]]) -> List[Any]:
+    """Opțiunile de încărcare pentru câmpurile cerute: doar coloanele necesare"""
+    if fields is None:
+        return []
+
+    columns = [getattr(Fond, name) for name in fields if name in FOND_FIELDS and name != "owner"]
+    options = [load_only(*columns)]
+    if "owner" in fields:
+        options.append(joinedload(Fond.owner))
+    return options
+
+
+def fond_to_dict(fond: Fond, fields: List[str]) -> Dict[str, Any]:
+    """Doar câmpurile cerute - nu atinge atributele neîncărcate (fără lazy load)"""
+    return {name: getattr(fond, name) for name in fields if name in FOND_FIELDS}
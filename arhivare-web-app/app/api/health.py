@@ -0,0 +1,63 @@
+# app/api/health.py - Liveness / readiness probes
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+from app.services.health import database_probe, pool_status
+
+router = APIRouter(tags=["Health"])
+
+APP_VERSION = "1.0.0"
+
+
+@router.get("/health/live")
+def liveness():
+    """Procesul răspunde - fără I/O (restart doar dacă event loop-ul e blocat)"""
+    return {"status": "alive"}
+
+
+@router.get("/health/ready")
+def readiness():
+    """
+    Gata de trafic: ultimul rezultat al probei de DB din fundal, saturația
+    pool-ului de conexiuni și starea migrărilor. 503 dacă DB-ul nu răspunde.
+    """
+    probe = database_probe.snapshot()
+    ready = probe["ok"]
+    if settings.HEALTH_REQUIRE_MIGRATIONS_HEAD and not probe["migrations"]["up_to_date"]:
+        ready = False
+
+    body = {
+        "status": "ready" if ready else "unavailable",
+        "database": {
+            "ok": probe["ok"],
+            "latency_ms": probe["latency_ms"],
+            "checked_seconds_ago": probe["age_seconds"],
+            "error": probe["error"],
+        },
+        "pool": pool_status(database_probe.engine),
+        "migrations": probe["migrations"],
+    }
+    return JSONResponse(body, status_code=200 if ready else 503)
+
+
+@router.get("/health/startup")
+def startup_report(request: Request):
+    """Timpul de import și durata fiecărui pas de warmup de la pornirea workerului"""
+    report = getattr(request.app.state, "startup_report", None)
+    if report is None:
+        return JSONResponse({"status": "not started"}, status_code=503)
+    return report
+
+
+@router.get("/health")
+def health_check():
+    """Health check endpoint (compat: Docker/compose healthcheck) - folosește proba din cache"""
+    probe = database_probe.snapshot()
+    body = {
+        "status": "ok" if probe["ok"] else "unavailable",
+        "version": APP_VERSION,
+        "app": settings.PROJECT_NAME,
+        "database": "connected" if probe["ok"] else "unavailable",
+    }
+    return JSONResponse(body, status_code=200 if probe["ok"] else 503)
@@ -1,14 +1,16 @@
 # app/api/routes/admin_fonds.py - Enhanced with Owner Assignment
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session
 from typing import List, Optional
-from ...database import get_db
+from ...database import get_db, get_read_db
 from ...models.user import User
 from ...models.fond import Fond
-from ...schemas.fond import FondResponse, FondCreate, FondUpdate
+from ...schemas.fond import FondResponse, FondPartialResponse, FondCreate, FondUpdate, FondAdminSearchResponse
+from ..fieldsets import FIELDS_QUERY_DESCRIPTION, parse_fields, fond_load_options, fond_to_dict
 from ...schemas.user import UserResponse
 from ...api.auth import get_current_user, get_current_admin_user
 from ...crud import fond as fond_crud, user as user_crud
+from ...services.change_log import change_log, fond_change
 import logging
 
 logger = logging.getLogger(__name__)
@@ -29,29 +31,32 @@ class OwnerAssignmentResponse(BaseModel):
     success: bool = True
 
 # Enhanced Fond endpoints with owner information
-@router.get("/fonds/", response_model=List[FondResponse])
+@router.get("/fonds/", response_model=List[FondPartialResponse], response_model_exclude_unset=True)
 def get_all_fonds(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     active_only: bool = Query(True),
     include_owner: bool = Query(False),  # NEW: Include owner information
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get all fonds with optional owner information (Admin only)
+    
+    `fields=` selects only the listed columns (include `owner` for owner details).
     """
+    selected = parse_fields(fields)
     try:
-        # Build query with optional owner join
-        query = db.query(Fond)
-        
-        if include_owner:
-            query = query.options(joinedload(Fond.owner))
-        
-        if active_only:
-            query = query.filter(Fond.active == True)
+        # Statement precompilat; cu `fields=` owner-ul se încarcă doar dacă e cerut
+        fonds = fond_crud.get_fonds(
+            db, skip=skip, limit=limit, active_only=active_only,
+            include_owner=include_owner and selected is None,
+            options=fond_load_options(selected)
+        )
         
-        fonds = query.offset(skip).limit(limit).all()
+        if selected is not None:
+            return [fond_to_dict(fond, selected) for fond in fonds]
         
         # Convert to response format
         result = []
@@ -72,6 +77,7 @@ def get_all_fonds(
             }
             
             # Add owner information if requested and available
+            fond_dict["owner"] = None
             if include_owner and fond.owner:
                 fond_dict["owner"] = {
                     "id": fond.owner.id,
@@ -90,6 +96,54 @@ def get_all_fonds(
             detail="Error retrieving fonds"
         )
 
+# Admin search with facets
+@router.get("/fonds/search", response_model=FondAdminSearchResponse, response_model_exclude_unset=True)
+def search_fonds_with_facets(
+    query: Optional[str] = Query(None, min_length=2, max_length=100, description="Termenul de căutare"),
+    active: Optional[bool] = Query(None, description="Filtru activ/inactiv (implicit toate)"),
+    assigned: Optional[bool] = Query(None, description="Filtru asignat/neasignat"),
+    owner_id: Optional[int] = Query(None, description="Filtru după owner"),
+    facets: bool = Query(False, description="Include numărătorile pe fațete"),
+    top_owners: int = Query(10, ge=1, le=100, description="Câți owneri apar în fațeta de owneri"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Admin search with optional facet counts (Admin only).
+    
+    Totalul și fațetele (asignat/neasignat, activ/inactiv, top owneri) vin dintr-un
+    singur query grupat, nu din count()-uri separate per filtru.
+    """
+    query = query.strip() if query else None
+    
+    facet_summary = fond_crud.summarize_facets(
+        fond_crud.get_search_facet_rows(db, query),
+        active=active,
+        assigned=assigned,
+        owner_id=owner_id,
+        top_owners=top_owners
+    )
+    
+    results = []
+    if facet_summary["total"] > skip:
+        results = fond_crud.search_fonds_filtered(
+            db, query, active=active, assigned=assigned, owner_id=owner_id, skip=skip, limit=limit
+        )
+    
+    response = {
+        "query": query,
+        "total": facet_summary["total"],
+        "skip": skip,
+        "limit": limit,
+        "results": results
+    }
+    if facets:
+        response["facets"] = facet_summary["facets"]
+    
+    return response
+
 # NEW: Manual Owner Assignment Endpoint
 @router.post("/fonds/{fond_id}/assign-owner", response_model=OwnerAssignmentResponse)
 def assign_fond_owner(
@@ -132,6 +186,15 @@ def assign_fond_owner(
         db.commit()
         db.refresh(fond)
         
+        if old_owner_id != new_owner_id:
+            if new_owner_id and old_owner_id:
+                action = "reassigned"
+            else:
+                action = "assigned" if new_owner_id else "unassigned"
+            change_log.record([
+                fond_change(fond_id, action, {"owner_id": (old_owner_id, new_owner_id)}, current_user.id)
+            ])
+        
         # Prepare response message
         if new_owner_id and old_owner_id:
             message = f"Fond reassigned from user {old_owner_id} to {new_owner.username}"
@@ -186,7 +249,7 @@ def create_fond_with_owner(
                 )
         
         # Create the fond
-        db_fond = fond_crud.create_fond(db=db, fond=fond_data)
+        db_fond = fond_crud.create_fond(db=db, fond=fond_data, actor_id=current_user.id)
         
         logger.info(f"Admin {current_user.username} created fond {db_fond.id}")
         if fond_data.owner_id:
@@ -225,6 +288,7 @@ def update_fond_with_owner(
             )
         
         old_holder_name = db_fond.holder_name
+        old_holder_key = db_fond.holder_name_normalized
         old_owner_id = db_fond.owner_id
         
         # Validate new owner if provided
@@ -241,11 +305,12 @@ def update_fond_with_owner(
                 )
         
         # Update the fond
-        updated_fond = fond_crud.update_fond(db=db, fond_id=fond_id, fond_update=fond_data)
+        updated_fond = fond_crud.update_fond(db=db, fond_id=fond_id, fond_update=fond_data, actor_id=current_user.id)
         
         # Check for auto-reassignment if holder name changed and auto_reassign is enabled
         reassignment_suggestions = None
-        if auto_reassign and old_holder_name != updated_fond.holder_name:
+        # Doar o schimbare reală de deținător (nu de majuscule/diacritice) poate cere reasignare
+        if auto_reassign and old_holder_key != updated_fond.holder_name_normalized:
             # Import here to avoid circular imports
             from ...services.reassignment_service import check_reassignment_needed
             
@@ -321,7 +386,7 @@ def get_client_users(
 @router.get("/fonds/statistics/ownership")
 def get_ownership_statistics(
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get ownership statistics for fonds (Admin only)
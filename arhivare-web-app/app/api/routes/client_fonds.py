@@ -95,7 +95,7 @@ def create_my_fond(
         )
     
     # Creează fondul și îl assignează automat clientului
-    return crud_fond.create_fond(db, fond_in, owner_id=current_user.id)
+    return crud_fond.create_fond(db, fond_in, owner_id=current_user.id, actor_id=current_user.id)
 
 
 @router.put("/my-fonds/{fond_id}", response_model=FondResponse)
@@ -114,7 +114,7 @@ def update_my_fond(
     if not is_allowed:
         raise HTTPException(status_code=403, detail=error_msg)
     
-    db_fond = crud_fond.update_fond(db, fond_id, fond_in)
+    db_fond = crud_fond.update_fond(db, fond_id, fond_in, actor_id=current_user.id)
     if not db_fond:
         raise HTTPException(status_code=404, detail="Fond not found")
     
@@ -138,9 +138,9 @@ def delete_my_fond(
         raise HTTPException(status_code=403, detail=error_msg)
     
     if permanent:
-        success = crud_fond.permanently_delete_fond(db, fond_id)
+        success = crud_fond.permanently_delete_fond(db, fond_id, actor_id=current_user.id)
     else:
-        success = crud_fond.soft_delete_fond(db, fond_id)
+        success = crud_fond.soft_delete_fond(db, fond_id, actor_id=current_user.id)
     
     if not success:
         raise HTTPException(status_code=404, detail="Fond not found")
@@ -1,15 +1,25 @@
 # app/api/routes/fonds.py - ENHANCED with Auto-Reassignment Endpoints
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import literal, or_
 from typing import List, Optional
+import logging
 
-from app.database import get_db
-from app.api.auth import get_current_user
+from app.database import get_db, get_read_db
+from app.api.auth import Principal, get_current_principal, get_current_user
 from app.models.user import User as UserModel
 from app.models.fond import Fond
-from app.schemas.fond import FondCreate, FondUpdate, FondResponse
+from app.schemas.fond import (
+    FondCreate, FondUpdate, FondResponse, FondPartialResponse, FondBatchGetRequest, FondBatchGetResponse,
+    FondBatchRequest, FondBatchResponse
+)
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.api.fieldsets import FIELDS_QUERY_DESCRIPTION, parse_fields, fond_load_options, fond_to_dict
 from app.crud import fond as crud_fond, user as crud_user
+from app.services.company_names import match_key, significant_words
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -40,13 +50,14 @@ class ConfirmReassignmentRequest(BaseModel):
     confirmed: bool = True
 
 
-@router.get("/", response_model=List[FondResponse])
+@router.get("/", response_model=List[FondPartialResponse], response_model_exclude_unset=True)
 def list_fonds(
     skip: int = Query(0, ge=0, description="Numărul de înregistrări de sărit"),
     limit: int = Query(50, ge=1, le=100, description="Numărul maxim de înregistrări returnate"),
     active_only: bool = Query(True, description="Afișează doar fondurile active"),
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Listează fondurile pe care utilizatorul le poate vedea, pe baza rolului său.
@@ -54,37 +65,49 @@ def list_fonds(
     - Admin: toate fondurile
     - Audit: toate fondurile (read-only)
     - Client: doar fondurile proprii
+    
+    `fields=` restrânge coloanele selectate și câmpurile returnate.
     """
-    fonds = crud_fond.get_fonds_for_user(db, current_user, skip=skip, limit=limit, active_only=active_only)
-    return fonds
+    selected = parse_fields(fields)
+    fonds = crud_fond.get_fonds_for_user(
+        db, current_user, skip=skip, limit=limit, active_only=active_only,
+        options=fond_load_options(selected)
+    )
+    if selected is None:
+        return fonds
+    return [fond_to_dict(fond, selected) for fond in fonds]
 
 
-@router.get("/my-fonds", response_model=List[FondResponse])
+@router.get("/my-fonds", response_model=List[FondPartialResponse], response_model_exclude_unset=True)
 def list_my_fonds(
     skip: int = Query(0, ge=0, description="Numărul de înregistrări de sărit"),
     limit: int = Query(50, ge=1, le=100, description="Numărul maxim de înregistrări returnate"),
     active_only: bool = Query(True, description="Afișează doar fondurile active"),
     search: Optional[str] = Query(None, description="Termenul de căutare"),
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Endpoint specific pentru clienți - returnează doar fondurile proprii.
     Poate fi folosit de toți utilizatorii, dar va returna rezultate diferite pe baza rolului.
     """
-    if current_user.role == "client":
-        if search:
-            fonds = crud_fond.search_my_fonds(db, current_user.id, search, skip=skip, limit=limit)
-        else:
-            fonds = crud_fond.get_my_fonds(db, current_user.id, skip=skip, limit=limit, active_only=active_only)
+    selected = parse_fields(fields)
+    options = fond_load_options(selected)
+    
+    # Clientul vede doar fondurile proprii, admin și audit pe toate (crud_fond.visible_to)
+    if search:
+        fonds = crud_fond.search_fonds_for_user(
+            db, current_user, search, skip=skip, limit=limit, active_only=active_only, options=options
+        )
     else:
-        # Pentru admin și audit, my-fonds = toate fondurile
-        if search:
-            fonds = crud_fond.search_all_fonds(db, search, skip=skip, limit=limit, active_only=active_only)
-        else:
-            fonds = crud_fond.get_fonds(db, skip=skip, limit=limit, active_only=active_only)
+        fonds = crud_fond.get_fonds_for_user(
+            db, current_user, skip=skip, limit=limit, active_only=active_only, options=options
+        )
     
-    return fonds
+    if selected is None:
+        return fonds
+    return [fond_to_dict(fond, selected) for fond in fonds]
 
 
 @router.get("/unassigned", response_model=List[FondResponse])
@@ -92,7 +115,7 @@ def list_unassigned_fonds(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Listează fondurile care nu au owner (doar pentru admin).
@@ -105,23 +128,76 @@ def list_unassigned_fonds(
     return fonds
 
 
+@router.post("/batch-get", response_model=FondBatchGetResponse, response_model_exclude_unset=True)
+def batch_get_fonds(
+    request: FondBatchGetRequest,
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Returnează mai multe fonduri după ID într-un singur request și un singur SELECT.
+    
+    Ordinea din request este păstrată (duplicatele sunt ignorate). ID-urile care nu
+    există sau pe care utilizatorul nu le poate vedea apar în `missing` - cele două
+    cazuri nu se disting, ca să nu se expună existența fondurilor altor clienți.
+    """
+    ids = list(dict.fromkeys(request.ids))
+    selected = parse_fields(fields)
+    
+    fonds = crud_fond.get_fonds_by_ids(db, ids, current_user, options=fond_load_options(selected))
+    by_id = {fond.id: fond for fond in fonds}
+    
+    found = [by_id[fond_id] for fond_id in ids if fond_id in by_id]
+    return {
+        "fonds": found if selected is None else [fond_to_dict(fond, selected) for fond in found],
+        "missing": [fond_id for fond_id in ids if fond_id not in by_id]
+    }
+
+
+@router.post("/batch", response_model=FondBatchResponse)
+def batch_write_fonds(
+    request: FondBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    """
+    Aplică mai multe operații create / update / delete (soft) într-o singură tranzacție.
+    
+    - Admin: orice fond, poate seta owner-ul
+    - Client: doar fondurile proprii; fondurile create îi aparțin automat
+    - Audit: nu poate modifica fonduri
+    
+    Cu `atomic=true` (implicit), dacă o operație e invalidă nu se aplică nimic și
+    răspunsul este 422 cu rezultatele per operație.
+    """
+    if current_user.role not in ("admin", "client"):
+        raise HTTPException(status_code=403, detail="Nu ai permisiuni pentru a modifica fonduri")
+    
+    applied, results = crud_fond.apply_fond_batch(db, request.operations, current_user, atomic=request.atomic)
+    
+    response = {"applied": applied, "results": results}
+    if not applied:
+        return JSONResponse(status_code=422, content=jsonable_encoder(FondBatchResponse(**response)))
+    return response
+
+
 @router.get("/{fond_id}", response_model=FondResponse)
 def get_fond(
     fond_id: int,
     db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Returnează detaliile unui fond după ID.
     Verifică permisiunile de vizualizare pe baza rolului.
     """
-    # Verifică dacă utilizatorul poate vedea acest fond
-    if not crud_fond.can_user_view_fond(db, current_user, fond_id):
-        raise HTTPException(status_code=403, detail="Nu ai permisiuni pentru a vedea acest fond")
-    
-    db_fond = crud_fond.get_fond(db, fond_id)
+    # Fondul și permisiunea de vizualizare vin din același SELECT
+    db_fond, visible = crud_fond.get_fond_for_user(db, current_user, fond_id)
     if not db_fond:
         raise HTTPException(status_code=404, detail="Fond not found")
+    if not visible:
+        raise HTTPException(status_code=403, detail="Nu ai permisiuni pentru a vedea acest fond")
     
     return db_fond
 
@@ -130,51 +206,58 @@ def find_client_by_company_name(db: Session, company_name: str) -> Optional[User
     """
     Găsește un client pe baza numelui companiei din holder_name.
     Încearcă mai multe strategii de matching.
+    Toate strategiile filtrează în SQL pe users.company_name_normalized (index B-tree
+    pentru egalitate, trigram pentru LIKE pe PostgreSQL); Python doar confirmă candidații.
     """
     if not company_name:
         return None
     
-    # Normalizează numele pentru căutare
-    normalized_name = company_name.lower().strip()
+    normalized_name = match_key(company_name)
+    if not normalized_name:
+        return None
     
-    # Strategie 1: Exact match
-    client = db.query(UserModel).filter(
+    clients = db.query(UserModel).filter(
         UserModel.role == "client",
-        func.lower(UserModel.company_name) == normalized_name
-    ).first()
+        UserModel.company_name_normalized.isnot(None)
+    ).order_by(UserModel.id)
+    
+    # Strategie 1: Exact match (index scan)
+    client = clients.filter(UserModel.company_name_normalized == normalized_name).first()
     
     if client:
         return client
     
-    # Strategie 2: Caută dacă company_name conține holder_name
-    clients = db.query(UserModel).filter(UserModel.role == "client").all()
-    for client in clients:
-        if client.company_name:
-            client_name_normalized = client.company_name.lower().strip()
-            # Verifică dacă holder_name conține numele companiei clientului
-            if client_name_normalized in normalized_name or normalized_name in client_name_normalized:
-                return client
-    
-    # Strategie 3: Matching parțial pe cuvinte cheie
-    # Elimină prefixe comune (SRL, SA, etc.)
-    for prefix in ['srl', 'sa', 'sc', 'ltd', 'inc', 'corp']:
-        normalized_name = normalized_name.replace(f' {prefix}', '').replace(f'{prefix} ', '')
+    # Strategie 2: Caută dacă company_name conține holder_name (sau invers)
+    # Invers, coloana e subșirul căutat: instr/strpos, nu LIKE (un `%` sau `_` din date ar fi wildcard)
+    substring_candidates = clients.filter(or_(
+        UserModel.company_name_normalized.contains(normalized_name, autoescape=True),
+        crud_fond.substring_position(db, literal(normalized_name), UserModel.company_name_normalized) > 0
+    ))
+    for client in substring_candidates:
+        client_name_normalized = client.company_name_normalized
+        # Verifică dacă holder_name conține numele companiei clientului
+        if client_name_normalized in normalized_name or normalized_name in client_name_normalized:
+            return client
+    
+    # Strategie 3: Matching parțial pe cuvinte cheie, fără formele juridice (SRL, SA, etc.)
+    # Formele juridice se elimină doar ca cuvinte întregi (vechiul replace pe subșir
+    # strica nume ca "Casa Verde" -> "caverde")
+    holder_words = significant_words(company_name)
+    if len(holder_words) < 2:
+        return None
     
-    for client in clients:
-        if client.company_name:
-            client_name_clean = client.company_name.lower().strip()
-            for prefix in ['srl', 'sa', 'sc', 'ltd', 'inc', 'corp']:
-                client_name_clean = client_name_clean.replace(f' {prefix}', '').replace(f'{prefix} ', '')
-            
-            # Split în cuvinte și verifică overlap
-            holder_words = set(normalized_name.split())
-            client_words = set(client_name_clean.split())
-            
-            # Dacă au cel puțin 50% cuvinte comune și cel puțin 2 cuvinte
-            if len(holder_words) >= 2 and len(client_words) >= 2:
-                common_words = holder_words.intersection(client_words)
-                if len(common_words) >= max(1, min(len(holder_words), len(client_words)) // 2):
-                    return client
+    # Doar clienții care conțin cel puțin unul dintre cuvinte pot avea cuvinte comune
+    word_candidates = clients.filter(or_(
+        *(UserModel.company_name_normalized.contains(word, autoescape=True) for word in sorted(holder_words))
+    ))
+    for client in word_candidates:
+        client_words = significant_words(client.company_name)
+        
+        # Dacă au cel puțin 50% cuvinte comune și cel puțin 2 cuvinte
+        if len(client_words) >= 2:
+            common_words = holder_words & client_words
+            if len(common_words) >= max(1, min(len(holder_words), len(client_words)) // 2):
+                return client
     
     return None
 
@@ -211,10 +294,16 @@ def create_fond(
             potential_client = find_client_by_company_name(db, fond_in.holder_name)
             if potential_client:
                 final_owner_id = potential_client.id
-                print(f"🤖 AUTO-ASSIGNMENT: Fond '{fond_in.company_name}' assignat automat la {potential_client.username} ({potential_client.company_name})")
+                logger.info(
+                    f"AUTO-ASSIGNMENT: Fond '{fond_in.company_name}' assignat automat la {potential_client.username} ({potential_client.company_name})",
+                    extra={"sampled": True, "owner_id": potential_client.id}
+                )
             else:
                 # Rămâne unassigned dacă nu găsește client potrivit
-                print(f"⚠️  No matching client found for holder_name: '{fond_in.holder_name}'")
+                logger.info(
+                    f"No matching client found for holder_name: '{fond_in.holder_name}'",
+                    extra={"sampled": True}
+                )
                 
     elif current_user.role == "client":
         # Client poate crea fonduri doar pentru sine
@@ -230,7 +319,7 @@ def create_fond(
         if not owner or owner.role != "client":
             raise HTTPException(status_code=400, detail="Owner must be a client user")
     
-    return crud_fond.create_fond(db, fond_in, owner_id=final_owner_id)
+    return crud_fond.create_fond(db, fond_in, owner_id=final_owner_id, actor_id=current_user.id)
 
 
 # NEW: Enhanced update endpoint with reassignment detection
@@ -256,14 +345,12 @@ def update_fond(
     - fond: Fondul actualizat
     - reassignment_suggestions: Sugestii de reassignment (dacă există)
     """
-    # Verifică dacă utilizatorul poate edita acest fond
-    if not crud_fond.can_user_edit_fond(db, current_user, fond_id):
-        if current_user.role == "audit":
-            raise HTTPException(status_code=403, detail="Audit users have read-only access")
-        elif current_user.role == "client":
-            raise HTTPException(status_code=403, detail="Poți edita doar fondurile care îți aparțin")
-        else:
-            raise HTTPException(status_code=403, detail="Nu ai permisiuni pentru a edita acest fond")
+    if current_user.role == "audit":
+        raise HTTPException(status_code=403, detail="Audit users have read-only access")
+    
+    # Fondul se încarcă deja filtrat pe permisiunea de editare: un fond al altcuiva nu există pentru client
+    if not crud_fond.get_editable_fond(db, current_user, fond_id):
+        raise HTTPException(status_code=404, detail="Fond not found")
     
     # NEW: Folosește funcția enhanced pentru detectarea reassignment-ului
     db_fond, reassignment_suggestions = crud_fond.update_fond_with_reassignment_detection(
@@ -311,17 +398,15 @@ def delete_fond(
     if current_user.role == "audit":
         raise HTTPException(status_code=403, detail="Audit users cannot delete fonds")
     
-    # Verifică permisiunile de editare (delete = edit permission)
-    if not crud_fond.can_user_edit_fond(db, current_user, fond_id):
-        if current_user.role == "client":
-            raise HTTPException(status_code=403, detail="Poți șterge doar fondurile care îți aparțin")
-        else:
-            raise HTTPException(status_code=403, detail="Nu ai permisiuni pentru a șterge acest fond")
+    # Fondul se încarcă deja filtrat pe permisiunea de editare (delete = edit permission)
+    db_fond = crud_fond.get_editable_fond(db, current_user, fond_id)
+    if not db_fond:
+        raise HTTPException(status_code=404, detail="Fond not found")
     
     if permanent:
-        success = crud_fond.permanently_delete_fond(db, fond_id)
+        success = crud_fond.permanently_delete_fond(db, fond_id, actor_id=current_user.id, db_fond=db_fond)
     else:
-        success = crud_fond.soft_delete_fond(db, fond_id)
+        success = crud_fond.soft_delete_fond(db, fond_id, actor_id=current_user.id, db_fond=db_fond)
     
     if not success:
         raise HTTPException(status_code=404, detail="Fond not found")
@@ -332,8 +417,8 @@ def delete_fond(
 @router.get("/stats/count")
 def get_fonds_stats(
     active_only: bool = Query(True, description="Contorizează doar fondurile active"),
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Returnează statistici despre fonduri pe baza rolului utilizatorului.
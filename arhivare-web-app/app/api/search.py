@@ -1,23 +1,32 @@
 # app/api/search.py - FIXED VERSION
 from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from app.database import get_db  # FIXED: Use unified database import
-from app.schemas.fond import FondResponse
+from app.database import get_db, get_read_db  # get_read_db: replică de citire dacă e configurată
+from app.core.config import settings
+from app.schemas.fond import FondSearchHit
 from app.crud import fond as crud_fond
+from app.api.fieldsets import FIELDS_QUERY_DESCRIPTION, parse_fields, fond_load_options, fond_to_dict
+from app.services.search_snippets import make_snippet
+from app.services.name_suggestions import suggestion_index
 
 router = APIRouter(tags=["Public Search"])
 
-@router.get("/search", response_model=List[FondResponse])
+@router.get("/search", response_model=List[FondSearchHit], response_model_exclude_unset=True)
 def search_fonds(
     query: str = Query(..., min_length=2, max_length=100, description="Termenul de căutare (min 2 caractere)"),
     skip: int = Query(0, ge=0, description="Numărul de rezultate de sărit pentru paginație"),
     limit: int = Query(20, ge=1, le=50, description="Numărul maxim de rezultate (max 50)"),
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(None, description=f"{FIELDS_QUERY_DESCRIPTION}; `snippet` adaugă fragmentul evidențiat din note"),
+    db: Session = Depends(get_read_db)
 ):
     """
     🔍 **Căutare publică** de fonduri arhivistice după numele companiei sau deținătorului.
+    
+    Cu `fields=...,snippet` fiecare rezultat primește fragmentul din note din jurul
+    potrivirii (fereastra SEARCH_SNIPPET_WINDOW) cu offset-urile de evidențiere,
+    fără să se încarce tot câmpul `notes`.
     """
     if not query.strip():
         raise HTTPException(
@@ -25,15 +34,51 @@ def search_fonds(
             detail="Query parameter cannot be empty"
         )
     
+    query = query.strip()
+    selected = parse_fields(fields, extra=("snippet",))
+    options = fond_load_options(selected)
+    
     # Căutarea se face doar în fondurile active (publice)
-    results = crud_fond.search_fonds(db, query.strip(), skip=skip, limit=limit)
+    if selected is None:
+        return crud_fond.search_fonds(db, query, skip=skip, limit=limit)
+    
+    if "snippet" not in selected:
+        fonds = crud_fond.search_fonds(db, query, skip=skip, limit=limit, options=options)
+        return [fond_to_dict(fond, selected) for fond in fonds]
     
+    rows = crud_fond.search_fonds_with_snippets(
+        db, query, window=settings.SEARCH_SNIPPET_WINDOW, skip=skip, limit=limit, options=options
+    )
+    results = []
+    for fond, fragment, start, notes_length in rows:
+        hit = fond_to_dict(fond, selected)
+        hit["snippet"] = make_snippet(fragment, start, notes_length or 0, query)
+        results.append(hit)
     return results
 
+@router.get("/search/suggest")
+def search_suggest(
+    prefix: str = Query(..., min_length=1, max_length=100, description="Prefixul tastat (company sau holder)"),
+    limit: int = Query(10, ge=1, le=20, description="Numărul maxim de sugestii (max 20)"),
+    db: Session = Depends(get_db)
+):
+    """
+    ⌨️ **Sugestii typeahead**: nume distincte de companii și deținători (fonduri active)
+    care încep cu prefixul dat. Servit dintr-un index în memorie, fără scanarea tabelei.
+    """
+    # Pe primar, nu pe replică: un commit invalidează indexul, iar un rebuild dintr-o
+    # replică rămasă în urmă ar ține numele vechi în cache până la TTL
+    suggestion_index.ensure_fresh(db)
+    
+    return {
+        "prefix": prefix,
+        "suggestions": suggestion_index.suggest(prefix, limit=limit)
+    }
+
 @router.get("/search/count")
 def search_count(
     query: str = Query(..., min_length=2, max_length=100, description="Termenul de căutare"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     📊 **Numără rezultatele** unei căutări publice fără a returna datele.
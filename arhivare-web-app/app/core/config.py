@@ -1,6 +1,6 @@
 # app/core/config.py - FIXED VERSION
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -9,10 +9,33 @@ class Settings(BaseSettings):
     # Database Configuration
     DATABASE_URL: str
     
+    # Read replicas (opțional): URL-uri separate prin virgulă
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_MAX_LAG_SECONDS: float = 5  # peste acest lag, replica e ocolită
+    REPLICA_LAG_CHECK_SECONDS: float = 5  # cât de des se măsoară lag-ul (în fundal)
+    REPLICA_CONNECT_TIMEOUT_SECONDS: int = 2  # conectarea la o replică inaccesibilă eșuează repede
+
     # JWT Configuration  
     JWT_SECRET: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    TOKEN_VERSION_CACHE_TTL_SECONDS: int = 30  # cât poate întârzia revocarea unui token în alt worker
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14
+    TOKEN_REVOCATION_SYNC_SECONDS: int = 5  # cât de des preia un worker logout-urile făcute în alți workeri
+    TOKEN_REVOCATION_SYNC_MARGIN_SECONDS: int = 60  # suprapunerea ferestrelor de sync (tranzacții lungi, skew de ceas)
+    TOKEN_REVOCATION_BLOOM_CAPACITY: int = 100000  # jti-uri revocate simultan înainte ca filtrul să crească
+
+    # Login throttling (înainte de bcrypt)
+    LOGIN_THROTTLE_ENABLED: bool = True
+    LOGIN_THROTTLE_BACKEND: str = "memory"  # "memory" (per worker) sau "redis" (partajat)
+    LOGIN_THROTTLE_REDIS_URL: str = "redis://localhost:6379/0"
+    LOGIN_RATE_PER_IP: float = 30  # încercări pe minut
+    LOGIN_BURST_PER_IP: int = 10
+    LOGIN_RATE_PER_USERNAME: float = 5  # încercări pe minut
+    LOGIN_BURST_PER_USERNAME: int = 5
+    LOGIN_LOCKOUT_THRESHOLD: int = 5  # eșecuri consecutive până la lockout
+    LOGIN_LOCKOUT_BASE_SECONDS: int = 30  # dublat la fiecare eșec următor
+    LOGIN_LOCKOUT_MAX_SECONDS: int = 900
 
     # Admin Bootstrap
     ADMIN_USERNAME: str = "admin"
@@ -24,6 +47,51 @@ class Settings(BaseSettings):
     sqlalchemy_pool_recycle: Optional[int] = None
     sqlalchemy_pool_pre_ping: Optional[bool] = None
 
+    # Startup warmup
+    STARTUP_WARMUP_ENABLED: bool = True
+    STARTUP_WARM_CONNECTIONS: int = 2  # conexiuni deschise în pool la pornire (<= pool_size)
+
+    # Health probes
+    HEALTH_PROBE_INTERVAL_SECONDS: float = 5  # cât de des rulează proba de DB în fundal
+    HEALTH_REQUIRE_MIGRATIONS_HEAD: bool = False  # /health/ready = 503 dacă DB-ul nu e la ultima revizie
+
+    # Change log (audit) pentru modificările de fonduri - scris în loturi, în fundal
+    CHANGE_LOG_ENABLED: bool = True
+    CHANGE_LOG_QUEUE_SIZE: int = 10000  # rânduri în așteptare înainte de backpressure
+    CHANGE_LOG_BATCH_SIZE: int = 500  # rânduri per INSERT executemany
+    CHANGE_LOG_FLUSH_SECONDS: float = 1.0  # întârzierea maximă a unui rând când coada nu se umple
+    CHANGE_LOG_OVERFLOW_POLICY: str = "block"  # "block" (așteaptă, apoi scrie sincron) sau "drop"
+    CHANGE_LOG_BLOCK_SECONDS: float = 2.0  # cât așteaptă "block" loc în coadă
+
+    # Evenimente pentru dashboard-uri (SSE, GET /events/stream)
+    EVENTS_HEARTBEAT_SECONDS: float = 15  # comentariu keep-alive când nu e nimic de trimis
+    EVENTS_RETRY_MS: int = 3000  # după cât se reconectează EventSource
+    EVENTS_TICKET_SECONDS: int = 30  # valabilitatea ticket-ului de conectare la stream (nu e access token)
+    EVENTS_QUEUE_SIZE: int = 100  # evenimente netrimise per stream înainte de "resync"
+    EVENTS_MAX_SUBSCRIBERS: int = 1000  # stream-uri deschise per worker
+    EVENTS_PG_NOTIFY: bool = True  # fan-out între workeri prin LISTEN/NOTIFY (doar PostgreSQL)
+    EVENTS_PG_CHANNEL: str = "arhivare_fond_events"
+
+    # Logging
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = True
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_INFO_SAMPLE_RATE: float = 1.0  # fracțiunea păstrată din log-urile INFO high-volume
+
+    # Owner matching
+    COMPANY_NAME_CACHE_SIZE: int = 50000  # intrări în cache-ul de normalizare a numelor
+
+    # Batch endpoints
+    FONDS_BATCH_MAX_ITEMS: int = 200  # id-uri / operații acceptate într-un singur request batch
+
+    # Search
+    SEARCH_SUGGEST_TTL_SECONDS: int = 60  # staleness maxim al indexului de typeahead
+    SEARCH_SNIPPET_WINDOW: int = 80  # caractere păstrate de fiecare parte a potrivirii în snippet
+
+    @property
+    def replica_urls(self) -> List[str]:
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
     class Config:
         env_file = ".env"
         env_file_encoding = 'utf-8'
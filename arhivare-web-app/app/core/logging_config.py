@@ -0,0 +1,208 @@
+# app/core/logging_config.py - Structured JSON logging with non-blocking queue handler
+import contextvars
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from app.core.config import settings
+
+# Request ID-ul curent, setat de RequestIdMiddleware pentru fiecare request
+request_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+
+# Atributele standard ale unui LogRecord - tot ce nu e aici ajunge în JSON ca "extra"
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Formatează fiecare înregistrare ca un singur obiect JSON pe linie"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            payload["request_id"] = request_id
+
+        for key, value in record.__dict__.items():
+            if key in _RESERVED_ATTRS or key in payload or key in ("request_id", "sampled"):
+                continue
+            payload[key] = value
+
+        # Prin coadă traceback-ul vine deja formatat în exc_text (vezi NonBlockingQueueHandler.prepare)
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc_info"] = record.exc_text
+        if record.stack_info:
+            payload["stack_info"] = record.stack_info
+
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class RequestIdFilter(logging.Filter):
+    """Atașează request_id-ul curent fiecărei înregistrări"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Eșantionează log-urile INFO/DEBUG marcate ca high-volume (extra={"sampled": True}).
+    WARNING și peste trec întotdeauna.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = max(0.0, min(1.0, rate))
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not getattr(record, "sampled", False):
+            return True
+        return self.rate >= 1.0 or random.random() < self.rate
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler care aruncă înregistrările când coada e plină în loc să blocheze request-ul"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        QueueHandler.prepare lipește traceback-ul în `message` și șterge exc_info.
+        Aici mesajul e doar formatat cu argumentele, iar traceback-ul (obiectele
+        excepției nu trec sigur între thread-uri) e randat ca text în exc_text,
+        pe care formatterele îl emit separat.
+        """
+        exc_text = record.exc_text
+        if record.exc_info:
+            exc_text = logging.Formatter().formatException(record.exc_info)
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        record.exc_text = exc_text
+        return record
+
+
+def setup_logging() -> None:
+    """
+    Configurează logging-ul aplicației: handler pe coadă (non-blocking) la root,
+    iar scrierea efectivă în stdout se face pe thread-ul QueueListener-ului.
+    Apelurile repetate nu adaugă handlere duplicate.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if settings.LOG_JSON:
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter(
+            "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+        ))
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+    queue_handler.addFilter(SamplingFilter(settings.LOG_INFO_SAMPLE_RATE))
+
+    root = logging.getLogger()
+    root.addHandler(queue_handler)
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Oprește QueueListener-ul și golește coada (apelat la shutdown)"""
+    global _listener
+    if _listener is None:
+        return
+
+    _listener.stop()
+    _listener = None
+    for handler in list(logging.getLogger().handlers):
+        if isinstance(handler, NonBlockingQueueHandler):
+            logging.getLogger().removeHandler(handler)
+
+
+class RequestIdMiddleware:
+    """
+    Middleware ASGI care asociază fiecărui request un ID (din header-ul X-Request-ID
+    sau generat), îl expune în log-uri și îl întoarce în răspuns.
+    Emite și un access log eșantionat cu durata request-ului.
+    """
+
+    header_name = b"x-request-id"
+
+    def __init__(self, app):
+        self.app = app
+        self.logger = logging.getLogger("app.access")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers", []):
+            if name == self.header_name:
+                request_id = value.decode("latin-1")[:128]
+                break
+        request_id = request_id or uuid.uuid4().hex
+
+        token = request_id_var.set(request_id)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_request_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((self.header_name, request_id.encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            self.logger.info(
+                "request completed",
+                extra={
+                    "sampled": True,
+                    "method": scope.get("method"),
+                    "path": scope.get("path"),
+                    "status": status_code,
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                },
+            )
+            request_id_var.reset(token)
@@ -1,26 +1,88 @@
+import hashlib
+import secrets
 from datetime import datetime, timedelta, timezone
-from typing import Union
+from typing import Any, Dict, Optional, Union
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-def create_access_token(subject: Union[str, int], expires_delta: timedelta = None) -> str:
+def create_access_token(
+    subject: Union[str, int],
+    expires_delta: timedelta = None,
+    extra_claims: Optional[Dict[str, Any]] = None
+) -> str:
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode = {"exp": expire, "sub": str(subject)}
+    if extra_claims:
+        to_encode.update(extra_claims)
     return jwt.encode(to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
 
+def create_user_access_token(user, expires_delta: timedelta = None) -> str:
+    """Token îmbogățit: pe lângă `sub`, poartă `uid`, `role`, `ver` (token_version) și `jti`"""
+    return create_access_token(
+        subject=user.username,
+        expires_delta=expires_delta,
+        extra_claims={
+            "uid": user.id, "role": user.role, "ver": user.token_version or 0, "jti": secrets.token_hex(16)
+        }
+    )
+
+# `aud` face ticket-ul inutilizabil ca access token: decode_token îl respinge (audiență neașteptată)
+STREAM_TICKET_AUDIENCE = "events:stream"
+
+def create_stream_ticket(claims: Dict[str, Any]) -> str:
+    """
+    Ticket de scurtă durată (EVENTS_TICKET_SECONDS) doar pentru GET /events/stream.
+    EventSource nu poate trimite header-ul Authorization, iar un ticket în query
+    ajuns în loguri nu mai valorează nimic după câteva secunde.
+    """
+    to_encode = dict(claims)
+    to_encode.update(
+        exp=datetime.now(timezone.utc) + timedelta(seconds=settings.EVENTS_TICKET_SECONDS),
+        aud=STREAM_TICKET_AUDIENCE,
+    )
+    return jwt.encode(to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
+
+def decode_stream_ticket(ticket: str) -> Optional[Dict[str, Any]]:
+    """Claim-urile unui ticket de stream valid sau None (access token-urile nu trec)"""
+    try:
+        payload = jwt.decode(
+            ticket, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM], audience=STREAM_TICKET_AUDIENCE
+        )
+    except JWTError:
+        return None
+    # jose acceptă și token-uri fără `aud` când se cere o audiență - access token-urile nu au
+    if payload.get("aud") != STREAM_TICKET_AUDIENCE:
+        return None
+    return payload if payload.get("sub") else None
+
+def generate_refresh_token() -> str:
+    return secrets.token_urlsafe(32)
+
+def hash_refresh_token(token: str) -> str:
+    # Token-ul are 256 de biți aleatori - SHA-256 e suficient, fără costul bcrypt
+    return hashlib.sha256(token.encode()).hexdigest()
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+def decode_token(token: str) -> Optional[Dict[str, Any]]:
+    """Claim-urile unui token valid (semnătură + exp) sau None"""
+    try:
+        payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+    except JWTError:
+        return None
+    return payload if payload.get("sub") else None
+
 def verify_token(token: str) -> Union[str, None]:
     try:
         payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
@@ -0,0 +1,87 @@
+# app/core/startup.py - Startup warmup and timing report
+"""
+Pașii rulați o dată la pornire, înainte ca workerul să accepte trafic, ca
+primele request-uri după un deploy să nu plătească:
+
+  - conexiunile din pool (TCP + autentificare PostgreSQL);
+  - configurarea mapper-elor SQLAlchemy;
+  - construirea schemei OpenAPI (compilarea schemelor Pydantic);
+  - încărcarea backend-ului bcrypt din passlib;
+  - indexul de sugestii pentru căutare și cache-ul de normalizare a numelor.
+
+Fiecare pas e cronometrat; un pas eșuat (ex. DB indisponibil) e raportat, dar
+nu oprește pornirea. Raportul e logat și expus pe /health/startup.
+"""
+import logging
+import time
+from typing import Any, Dict, List
+
+from fastapi import FastAPI
+from sqlalchemy.orm import configure_mappers
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_pool(connections: int) -> None:
+    from app.database import engine
+
+    # Conexiunile sunt ținute deschise simultan, altfel pool-ul ar refolosi aceeași
+    opened = []
+    try:
+        for _ in range(connections):
+            opened.append(engine.connect())
+    finally:
+        for connection in opened:
+            connection.close()
+
+
+def _warm_passlib() -> None:
+    from app.core.security import pwd_context
+
+    pwd_context.handler("bcrypt").get_backend()
+
+
+def _warm_caches(app: FastAPI) -> None:
+    from app.database import get_db
+    from app.models.user import User
+    from app.services.company_names import match_key
+    from app.services.name_suggestions import suggestion_index
+
+    # Aceeași sesiune ca request-urile (respectă dependency_overrides)
+    sessions = app.dependency_overrides.get(get_db, get_db)()
+    db = next(sessions)
+    try:
+        # Rebuild-ul normalizează și numele fondurilor active (cache-ul match_key)
+        suggestion_index.ensure_fresh(db)
+        for (company_name,) in db.query(User.company_name).filter(
+            User.role == "client", User.company_name.isnot(None)
+        ):
+            match_key(company_name)
+    finally:
+        sessions.close()
+
+
+def run_warmup(app: FastAPI) -> Dict[str, Any]:
+    """Rulează pașii de warmup (blocant) și întoarce raportul de timpi"""
+    steps: List[tuple] = [
+        ("pool", lambda: _warm_pool(settings.STARTUP_WARM_CONNECTIONS)),
+        ("mappers", configure_mappers),
+        ("openapi", app.openapi),
+        ("passlib", _warm_passlib),
+        ("caches", lambda: _warm_caches(app)),
+    ]
+
+    report: Dict[str, Any] = {"steps": {}, "errors": {}}
+    started = time.perf_counter()
+    for name, step in steps:
+        step_started = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            report["errors"][name] = str(e)
+            logger.warning(f"Warmup step '{name}' failed: {e}")
+        report["steps"][name] = round((time.perf_counter() - step_started) * 1000, 2)
+    report["warmup_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return report
@@ -0,0 +1,93 @@
+# app/crud/auth_token.py - Refresh token rotation and access-token revocation
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.security import generate_refresh_token, hash_refresh_token
+from app.models.auth_token import RefreshToken, RevokedToken
+from app.models.user import User
+from app.services.token_revocation import revocation_list
+
+logger = logging.getLogger(__name__)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+def _is_expired(value: datetime) -> bool:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value <= _utcnow()
+
+def issue_refresh_token(db: Session, user: User, family_id: Optional[str] = None) -> str:
+    """Creează un refresh token (se stochează doar hash-ul); întoarce valoarea în clar"""
+    token = generate_refresh_token()
+    db.add(RefreshToken(
+        user_id=user.id,
+        token_hash=hash_refresh_token(token),
+        family_id=family_id or uuid.uuid4().hex,
+        expires_at=_utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    ))
+    db.commit()
+    return token
+
+def revoke_refresh_family(db: Session, family_id: str) -> int:
+    """Revocă toate token-urile încă active dintr-o familie (o sesiune de login)"""
+    revoked = db.query(RefreshToken).filter(
+        RefreshToken.family_id == family_id,
+        RefreshToken.revoked_at.is_(None)
+    ).update({RefreshToken.revoked_at: _utcnow()}, synchronize_session=False)
+    db.commit()
+    return revoked
+
+def rotate_refresh_token(db: Session, token: str) -> Tuple[Optional[User], Optional[str]]:
+    """
+    Schimbă un refresh token valid pe unul nou din aceeași familie.
+    Întoarce (user, token nou) sau (None, None) dacă token-ul e necunoscut, expirat
+    sau deja folosit - în ultimul caz toată familia este revocată.
+    """
+    stored = db.query(RefreshToken).filter(RefreshToken.token_hash == hash_refresh_token(token)).first()
+    if not stored or _is_expired(stored.expires_at):
+        return None, None
+
+    if stored.revoked_at is not None:
+        logger.warning(f"Refresh token reuse for user {stored.user_id}, revoking family {stored.family_id}")
+        revoke_refresh_family(db, stored.family_id)
+        return None, None
+
+    user = db.query(User).filter(User.id == stored.user_id).first()
+    if not user:
+        return None, None
+
+    # UPDATE condiționat: dintre două rotații concurente ale aceluiași token, doar una reușește
+    claimed = db.query(RefreshToken).filter(
+        RefreshToken.id == stored.id,
+        RefreshToken.revoked_at.is_(None)
+    ).update({RefreshToken.revoked_at: _utcnow()}, synchronize_session=False)
+    if not claimed:
+        db.rollback()
+        return None, None
+    return user, issue_refresh_token(db, user, family_id=stored.family_id)
+
+def revoke_refresh_token(db: Session, token: str, user_id: int) -> bool:
+    """Logout: revocă familia token-ului, dacă aparține utilizatorului"""
+    stored = db.query(RefreshToken.family_id).filter(
+        RefreshToken.token_hash == hash_refresh_token(token),
+        RefreshToken.user_id == user_id
+    ).first()
+    if not stored:
+        return False
+    revoke_refresh_family(db, stored.family_id)
+    return True
+
+def revoke_access_token(db: Session, jti: str, expires_at: datetime) -> None:
+    """Adaugă jti-ul în revoked_tokens (sursa pentru ceilalți workeri) și în lista locală"""
+    db.query(RevokedToken).filter(RevokedToken.expires_at <= _utcnow()).delete(synchronize_session=False)
+    if not db.query(RevokedToken.id).filter(RevokedToken.jti == jti).first():
+        db.add(RevokedToken(jti=jti, expires_at=expires_at))
+    db.commit()
+    revocation_list.revoke(jti, expires_at.timestamp())
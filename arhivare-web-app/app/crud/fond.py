@@ -1,14 +1,110 @@
 # app/crud/fond.py - COMPLETE FIXED VERSION
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, func, desc
-from typing import List, Optional, Dict, Any
+from sqlalchemy import and_, or_, func, desc, case, literal, insert, update, true, false, bindparam, select
+from functools import lru_cache
+from typing import List, Optional, Dict, Any, Sequence, Tuple
 from ..models.fond import Fond
 from ..models.user import User
 from ..schemas.fond import FondCreate, FondUpdate
+from ..services.change_log import change_log, fond_change
 import logging
 
 logger = logging.getLogger(__name__)
 
+# === Predicate de vizibilitate (row-level security în SQL) ===
+# Se compun în orice query pe Fond (`.filter(visible_to(user))`), deci listarea,
+# căutarea și verificările pe un singur fond folosesc aceeași regulă și nu au
+# nevoie de un SELECT separat pentru autorizare.
+
+def visible_to(user):
+    """Fondurile pe care utilizatorul le poate vedea: admin/audit - toate, client - ale sale"""
+    if user.role in ("admin", "audit"):
+        return true()
+    if user.role == "client":
+        return Fond.owner_id == user.id
+    logger.warning(f"Unknown user role: {user.role} for user {user.id}")
+    return false()
+
+def editable_by(user):
+    """Fondurile pe care utilizatorul le poate modifica: admin - toate, client - ale sale, audit - niciunul"""
+    if user.role == "admin":
+        return true()
+    if user.role == "client":
+        return Fond.owner_id == user.id
+    return false()
+
+def _allowed_column(predicate, name: str):
+    # owner_id NULL face comparația NULL, nu FALSE
+    return case((predicate, True), else_=False).label(name)
+
+# === Statement-uri precompilate pentru listări și căutare ===
+# Forma SELECT-ului depinde doar de flag-uri (active_only, filtrul pe owner),
+# deci se construiește o singură dată per combinație; valorile (pattern, owner,
+# skip, limit) intră ca bind parameters. Același obiect statement are aceeași
+# cheie în compiled_cache-ul engine-ului, deci SQL-ul nu se mai recompilează.
+
+def _filter_owner(stmt, owner_filter: Optional[str]):
+    """owner_filter: None - toate, "unassigned" - fără owner, "owner" - bind `owner_id`, "none" - niciunul"""
+    if owner_filter == "unassigned":
+        return stmt.where(Fond.owner_id.is_(None))
+    if owner_filter == "owner":
+        return stmt.where(Fond.owner_id == bindparam("owner_id"))
+    if owner_filter == "none":
+        return stmt.where(false())
+    return stmt
+
+def _visibility_filter(user) -> Tuple[Optional[str], Dict[str, Any]]:
+    """visible_to(user) ca owner_filter + parametri, pentru statement-urile precompilate"""
+    if user.role in ("admin", "audit"):
+        return None, {}
+    if user.role == "client":
+        return "owner", {"owner_id": user.id}
+    logger.warning(f"Unknown user role: {user.role} for user {user.id}")
+    return "none", {}
+
+@lru_cache(maxsize=None)
+def _fonds_statement(active_only: bool, owner_filter: Optional[str], include_owner: bool):
+    stmt = select(Fond)
+    if include_owner:
+        stmt = stmt.options(joinedload(Fond.owner))
+    if active_only:
+        stmt = stmt.where(Fond.active == True)
+    stmt = _filter_owner(stmt, owner_filter)
+    return stmt.offset(bindparam("skip")).limit(bindparam("limit"))
+
+def search_pattern(query: str) -> str:
+    """Pattern-ul ILIKE pentru un termen căutat"""
+    return f"%{query}%"
+
+def search_condition(pattern):
+    """
+    Condiția ILIKE comună tuturor căutărilor (company, holder, adresă, note).
+    `pattern` e un șir (search_pattern) sau bindparam("pattern") în statement-urile
+    precompilate - rezultatele, numărătorile și fragmentele folosesc aceeași regulă.
+    """
+    return or_(
+        Fond.company_name.ilike(pattern),
+        Fond.holder_name.ilike(pattern),
+        Fond.address.ilike(pattern),
+        Fond.notes.ilike(pattern)
+    )
+
+@lru_cache(maxsize=None)
+def _search_statement(active_only: bool, owner_filter: Optional[str] = None):
+    stmt = select(Fond)
+    if active_only:
+        stmt = stmt.where(Fond.active == True)
+    stmt = _filter_owner(stmt, owner_filter)
+    return stmt.where(search_condition(bindparam("pattern"))).offset(bindparam("skip")).limit(bindparam("limit"))
+
+def _execute_fonds(db: Session, stmt, params: Dict[str, Any], options: Optional[List[Any]]) -> List[Fond]:
+    # Opțiunile (ex. load_only din `fields=`) fac parte din cheia de cache, deci
+    # fiecare set distinct de câmpuri are propria intrare compilată
+    if options:
+        stmt = stmt.options(*options)
+    return db.execute(stmt, params).scalars().all()
+
 def get_fond(db: Session, fond_id: int, include_owner: bool = False) -> Optional[Fond]:
     """Get a single fond by ID with optional owner information"""
     query = db.query(Fond).filter(Fond.id == fond_id)
@@ -24,27 +120,33 @@ def get_fonds(
     limit: int = 100, 
     active_only: bool = True,
     include_owner: bool = False,
-    owner_id: Optional[int] = None
+    owner_id: Optional[int] = None,
+    options: Optional[List[Any]] = None
 ) -> List[Fond]:
     """Get multiple fonds with filtering options"""
-    query = db.query(Fond)
-    
-    if include_owner:
-        query = query.options(joinedload(Fond.owner))
-    
-    if active_only:
-        query = query.filter(Fond.active == True)
-    
+    params = {"skip": skip, "limit": limit}
+    owner_filter = None
     if owner_id is not None:
         if owner_id == 0:  # Special case: unassigned fonds
-            query = query.filter(Fond.owner_id.is_(None))
+            owner_filter = "unassigned"
         else:
-            query = query.filter(Fond.owner_id == owner_id)
+            owner_filter = "owner"
+            params["owner_id"] = owner_id
     
-    return query.offset(skip).limit(limit).all()
+    stmt = _fonds_statement(active_only, owner_filter, include_owner)
+    return _execute_fonds(db, stmt, params, options)
+
+def _created_changes(values: Dict[str, Any]) -> Dict[str, Tuple[Any, Any]]:
+    """Câmpurile completate ale unui fond nou, ca (None, valoare) pentru change log"""
+    return {field: (None, value) for field, value in values.items() if value is not None}
 
-def create_fond(db: Session, fond: FondCreate, owner_id: Optional[int] = None) -> Fond:
-    """Create a new fond with optional owner assignment"""
+def create_fond(
+    db: Session,
+    fond: FondCreate,
+    owner_id: Optional[int] = None,
+    actor_id: Optional[int] = None
+) -> Fond:
+    """Create a new fond with optional owner assignment (recorded in the change log)"""
     try:
         # Validate owner if provided
         if owner_id:
@@ -72,6 +174,10 @@ def create_fond(db: Session, fond: FondCreate, owner_id: Optional[int] = None) -
         db.commit()
         db.refresh(db_fond)
         
+        values = fond.dict()
+        values["owner_id"] = db_fond.owner_id
+        change_log.record([fond_change(db_fond.id, "created", _created_changes(values), actor_id)])
+        
         logger.info(f"Created fond {db_fond.id} with owner_id {owner_id}")
         return db_fond
         
@@ -80,8 +186,13 @@ def create_fond(db: Session, fond: FondCreate, owner_id: Optional[int] = None) -
         db.rollback()
         raise
 
-def update_fond(db: Session, fond_id: int, fond_update: FondUpdate) -> Optional[Fond]:
-    """Update an existing fond with optional owner change"""
+def update_fond(
+    db: Session,
+    fond_id: int,
+    fond_update: FondUpdate,
+    actor_id: Optional[int] = None
+) -> Optional[Fond]:
+    """Update an existing fond with optional owner change (recorded in the change log)"""
     try:
         db_fond = db.query(Fond).filter(Fond.id == fond_id).first()
         if not db_fond:
@@ -91,12 +202,21 @@ def update_fond(db: Session, fond_id: int, fond_update: FondUpdate) -> Optional[
         
         # Update fields that are provided
         update_data = fond_update.dict(exclude_unset=True)
+        changes = {
+            field: (getattr(db_fond, field), value)
+            for field, value in update_data.items()
+            if getattr(db_fond, field) != value
+        }
         for field, value in update_data.items():
             setattr(db_fond, field, value)
         
         db.commit()
         db.refresh(db_fond)
         
+        if changes:
+            action = "owner_changed" if "owner_id" in changes else "updated"
+            change_log.record([fond_change(fond_id, action, changes, actor_id)])
+        
         # Log owner changes
         if hasattr(fond_update, 'owner_id') and fond_update.owner_id != old_owner_id:
             logger.info(f"Fond {fond_id} owner changed from {old_owner_id} to {fond_update.owner_id}")
@@ -108,31 +228,247 @@ def update_fond(db: Session, fond_id: int, fond_update: FondUpdate) -> Optional[
         db.rollback()
         raise
 
+# Coloanele NOT NULL pe care FondUpdate le acceptă ca null explicit
+_NOT_NULL_UPDATE_FIELDS = ("company_name", "holder_name", "active")
+
+def _write_fond_batch(
+    db: Session,
+    operations: Sequence[Any],
+    results: List[Dict[str, Any]],
+    create_rows: List[Tuple[int, Dict[str, Any]]],
+    update_rows: List[Tuple[int, Dict[str, Any]]]
+) -> None:
+    """Un INSERT executemany și un UPDATE executemany; completează rezultatele"""
+    if create_rows:
+        new_ids = db.execute(
+            insert(Fond).returning(Fond.id, sort_by_parameter_order=True),
+            [values for _, values in create_rows]
+        ).scalars().all()
+        for (index, _), new_id in zip(create_rows, new_ids):
+            results[index]["id"] = new_id
+            results[index]["status"] = "created"
+    
+    if update_rows:
+        db.execute(update(Fond), [values for _, values in update_rows])
+        for index, _ in update_rows:
+            results[index]["status"] = "deleted" if operations[index].op == "delete" else "updated"
+
+def apply_fond_batch(
+    db: Session,
+    operations: Sequence[Any],
+    user,
+    atomic: bool = True
+) -> Tuple[bool, List[Dict[str, Any]]]:
+    """
+    Aplică o listă de operații create/update/delete (soft) într-o singură tranzacție.
+    
+    Validarea se face pentru tot lotul cu două SELECT-uri (fondurile țintă și
+    ownerii referiți), apoi scrierile sunt un INSERT executemany și un UPDATE
+    executemany după primary key. Cu `atomic`, o singură operație invalidă
+    anulează tot lotul. Dacă baza respinge lotul (constrângere), operațiile se
+    reiau una câte una, fiecare în propriul savepoint, ca eroarea să fie raportată
+    doar pentru operația vinovată. După commit, toate modificările intră în change log ca un
+    singur grup (un singur INSERT). Întoarce (aplicat, rezultate per operație).
+    """
+    is_admin = user.role == "admin"
+    results = [
+        {"index": index, "op": operation.op, "id": getattr(operation, "id", None), "status": "pending", "error": None}
+        for index, operation in enumerate(operations)
+    ]
+    
+    def fail(index: int, message: str):
+        results[index]["status"] = "error"
+        results[index]["error"] = message
+    
+    # Fondurile țintă - un singur SELECT; valorile vechi sunt pentru change log
+    target_ids = [operation.id for operation in operations if operation.op != "create"]
+    existing: Dict[int, Any] = {}
+    if target_ids:
+        existing = {
+            row["id"]: row for row in db.execute(
+                select(Fond.__table__).where(Fond.id.in_(target_ids), editable_by(user))
+            ).mappings()
+        }
+    
+    # Ownerii referiți - un singur SELECT
+    owner_ids = set()
+    for operation in operations:
+        if operation.op in ("create", "update") and operation.data.owner_id is not None:
+            owner_ids.add(operation.data.owner_id)
+    valid_owners = set()
+    if owner_ids:
+        valid_owners = {
+            owner_id for (owner_id,) in db.query(User.id).filter(User.id.in_(owner_ids), User.role == "client")
+        }
+    
+    create_rows: List[Tuple[int, Dict[str, Any]]] = []
+    update_rows: List[Tuple[int, Dict[str, Any]]] = []
+    seen_ids = set()
+    
+    for index, operation in enumerate(operations):
+        if operation.op == "create":
+            values = operation.data.dict()
+            if is_admin:
+                if values["owner_id"] is not None and values["owner_id"] not in valid_owners:
+                    fail(index, "Invalid owner_id: User not found or not a client")
+                    continue
+            else:
+                if values["owner_id"] not in (None, user.id):
+                    fail(index, "Clients can only create fonds for themselves")
+                    continue
+                values["owner_id"] = user.id
+            create_rows.append((index, values))
+            continue
+        
+        # update / delete: fondul trebuie să existe și să fie editabil (fără a distinge cazurile)
+        if operation.id in seen_ids:
+            fail(index, "Duplicate fond id in batch")
+            continue
+        seen_ids.add(operation.id)
+        if operation.id not in existing:
+            fail(index, "Fond not found")
+            continue
+        
+        if operation.op == "delete":
+            update_rows.append((index, {"id": operation.id, "active": False}))
+            continue
+        
+        changes = operation.data.dict(exclude_unset=True)
+        if not changes:
+            fail(index, "No fields to update")
+            continue
+        null_fields = [field for field in _NOT_NULL_UPDATE_FIELDS if field in changes and changes[field] is None]
+        if null_fields:
+            fail(index, f"Field cannot be null: {', '.join(null_fields)}")
+            continue
+        if "owner_id" in changes:
+            if not is_admin and changes["owner_id"] != user.id:
+                fail(index, "Only admin can change the owner")
+                continue
+            if changes["owner_id"] is not None and changes["owner_id"] not in valid_owners:
+                fail(index, "Invalid owner_id: User not found or not a client")
+                continue
+        update_rows.append((index, {"id": operation.id, **changes}))
+    
+    has_errors = any(result["status"] == "error" for result in results)
+    if has_errors and atomic:
+        for result in results:
+            if result["status"] == "pending":
+                result["status"] = "skipped"
+        return False, results
+    
+    try:
+        try:
+            with db.begin_nested():
+                _write_fond_batch(db, operations, results, create_rows, update_rows)
+        except IntegrityError as e:
+            logger.warning(f"Fond batch rejected by the database, retrying item by item: {e.orig}")
+            for index, values in create_rows + update_rows:
+                single = [(index, values)]
+                try:
+                    with db.begin_nested():
+                        if operations[index].op == "create":
+                            _write_fond_batch(db, operations, results, single, [])
+                        else:
+                            _write_fond_batch(db, operations, results, [], single)
+                except IntegrityError as item_error:
+                    results[index]["id"] = getattr(operations[index], "id", None)
+                    fail(index, f"Rejected by the database: {item_error.orig}")
+            
+            if atomic:
+                db.rollback()
+                for result in results:
+                    if result["status"] != "error":
+                        result["status"] = "skipped"
+                        result["id"] = getattr(operations[result["index"]], "id", None)
+                return False, results
+            create_rows = [row for row in create_rows if results[row[0]]["status"] != "error"]
+            update_rows = [row for row in update_rows if results[row[0]]["status"] != "error"]
+        
+        db.commit()
+    except Exception as e:
+        logger.error(f"Error applying fond batch: {str(e)}")
+        db.rollback()
+        raise
+    
+    changes = []
+    for index, values in create_rows:
+        changes.append(fond_change(results[index]["id"], "created", _created_changes(values), user.id))
+    for index, _ in update_rows:
+        # Doar câmpurile cerute: parametrii au acum și cheile derivate (holder_name_normalized)
+        operation = operations[index]
+        requested = {"active": False} if operation.op == "delete" else operation.data.dict(exclude_unset=True)
+        old = existing[operation.id]
+        changed = {
+            field: (old[field], value)
+            for field, value in requested.items()
+            if old[field] != value
+        }
+        if not changed:
+            continue
+        if operation.op == "delete":
+            action = "deleted"
+        else:
+            action = "owner_changed" if "owner_id" in changed else "updated"
+        changes.append(fond_change(operation.id, action, changed, user.id))
+    change_log.record(changes)
+    
+    logger.info(f"Applied fond batch: {len(create_rows)} created, {len(update_rows)} updated/deleted")
+    return True, results
+
+def _search_query(db: Session, query: str, active_only: bool, options: Optional[List[Any]]):
+    search_query = db.query(Fond)
+    
+    if options:
+        search_query = search_query.options(*options)
+    
+    if active_only:
+        search_query = search_query.filter(Fond.active == True)
+    
+    # Search in company_name and holder_name
+    return search_query.filter(search_condition(search_pattern(query)))
+
 def search_fonds(
     db: Session, 
     query: str, 
     skip: int = 0, 
     limit: int = 20,
-    active_only: bool = True
+    active_only: bool = True,
+    options: Optional[List[Any]] = None
 ) -> List[Fond]:
     """Search fonds by company name or holder name (public search)"""
-    search_query = db.query(Fond)
-    
-    if active_only:
-        search_query = search_query.filter(Fond.active == True)
-    
-    # Search in company_name and holder_name
-    search_term = f"%{query}%"
-    search_query = search_query.filter(
-        or_(
-            Fond.company_name.ilike(search_term),
-            Fond.holder_name.ilike(search_term),
-            Fond.address.ilike(search_term),
-            Fond.notes.ilike(search_term)
-        )
-    )
+    params = {"pattern": search_pattern(query), "skip": skip, "limit": limit}
+    return _execute_fonds(db, _search_statement(active_only), params, options)
+
+def substring_position(db: Session, haystack, needle):
+    """Poziția 1-based a subșirului (0 dacă lipsește): strpos pe PostgreSQL, instr în rest"""
+    if db.get_bind().dialect.name == "postgresql":
+        return func.strpos(haystack, needle)
+    return func.instr(haystack, needle)
+
+def search_fonds_with_snippets(
+    db: Session,
+    query: str,
+    window: int,
+    skip: int = 0,
+    limit: int = 20,
+    active_only: bool = True,
+    options: Optional[List[Any]] = None
+) -> List[Any]:
+    """
+    Ca search_fonds, plus fereastra din `notes` din jurul potrivirii, tăiată în SQL.
+    Întoarce rânduri (Fond, fragment, start, notes_length); fără potrivire în note,
+    fragmentul este începutul lor.
+    """
+    match_position = substring_position(db, func.lower(Fond.notes), func.lower(literal(query)))
+    start = case((match_position > window, match_position - window), else_=1)
+    fragment = func.substr(Fond.notes, start, 2 * window + len(query))
     
-    return search_query.offset(skip).limit(limit).all()
+    return _search_query(db, query, active_only, options).add_columns(
+        fragment.label("snippet_fragment"),
+        start.label("snippet_start"),
+        func.length(Fond.notes).label("notes_length")
+    ).offset(skip).limit(limit).all()
 
 def count_search_results(db: Session, query: str, active_only: bool = True) -> int:
     """Count search results for pagination"""
@@ -141,27 +477,137 @@ def count_search_results(db: Session, query: str, active_only: bool = True) -> i
     if active_only:
         search_query = search_query.filter(Fond.active == True)
     
-    search_term = f"%{query}%"
-    search_query = search_query.filter(
-        or_(
-            Fond.company_name.ilike(search_term),
-            Fond.holder_name.ilike(search_term),
-            Fond.address.ilike(search_term),
-            Fond.notes.ilike(search_term)
-        )
-    )
+    search_query = search_query.filter(search_condition(search_pattern(query)))
     
     return search_query.count()
 
-# Additional functions that might be missing
-def get_my_fonds(db: Session, owner_id: int, skip: int = 0, limit: int = 100, active_only: bool = True) -> List[Fond]:
-    """Get fonds for a specific owner (client)"""
-    query = db.query(Fond).filter(Fond.owner_id == owner_id)
+def search_fonds_filtered(
+    db: Session,
+    query: Optional[str] = None,
+    active: Optional[bool] = None,
+    assigned: Optional[bool] = None,
+    owner_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 50
+) -> List[Fond]:
+    """Admin search: text match plus the facet filters (None = fără filtru)"""
+    search_query = db.query(Fond)
     
-    if active_only:
-        query = query.filter(Fond.active == True)
+    if query:
+        search_query = search_query.filter(search_condition(search_pattern(query)))
+    if active is not None:
+        search_query = search_query.filter(Fond.active == active)
+    if assigned is not None:
+        search_query = search_query.filter(Fond.owner_id.isnot(None) if assigned else Fond.owner_id.is_(None))
+    if owner_id is not None:
+        search_query = search_query.filter(Fond.owner_id == owner_id)
+    
+    return search_query.order_by(Fond.id).offset(skip).limit(limit).all()
+
+def get_search_facet_rows(db: Session, query: Optional[str] = None) -> List[Any]:
+    """
+    Un singur query grupat pe (owner, active) pentru toate fațetele căutării:
+    rândurile (owner_id, active, username, owner_company_name, count) acoperă
+    asignat/neasignat, activ/inactiv și distribuția pe owneri.
+    """
+    facet_query = db.query(
+        Fond.owner_id,
+        Fond.active,
+        User.username,
+        User.company_name.label("owner_company_name"),
+        func.count(Fond.id).label("count")
+    ).outerjoin(User, User.id == Fond.owner_id)
     
-    return query.offset(skip).limit(limit).all()
+    if query:
+        facet_query = facet_query.filter(search_condition(search_pattern(query)))
+    
+    return facet_query.group_by(
+        Fond.owner_id, Fond.active, User.username, User.company_name
+    ).all()
+
+def summarize_facets(
+    rows: List[Any],
+    active: Optional[bool] = None,
+    assigned: Optional[bool] = None,
+    owner_id: Optional[int] = None,
+    top_owners: int = 10
+) -> Dict[str, Any]:
+    """
+    Fațetele (calculate pe căutarea text, fără filtrele de fațetă - UI-ul arată
+    cât ar rămâne la fiecare alegere) și totalul cu filtrele aplicate, din aceleași rânduri.
+    """
+    assigned_count = unassigned_count = active_count = inactive_count = total = 0
+    owners: Dict[int, Dict[str, Any]] = {}
+    
+    for row in rows:
+        if row.owner_id is None:
+            unassigned_count += row.count
+        else:
+            assigned_count += row.count
+            owner = owners.setdefault(row.owner_id, {
+                "owner_id": row.owner_id,
+                "username": row.username,
+                "company_name": row.owner_company_name,
+                "count": 0
+            })
+            owner["count"] += row.count
+        
+        if row.active:
+            active_count += row.count
+        else:
+            inactive_count += row.count
+        
+        if active is not None and bool(row.active) != active:
+            continue
+        if assigned is not None and (row.owner_id is not None) != assigned:
+            continue
+        if owner_id is not None and row.owner_id != owner_id:
+            continue
+        total += row.count
+    
+    top = sorted(owners.values(), key=lambda owner: (-owner["count"], owner["owner_id"]))[:top_owners]
+    
+    return {
+        "total": total,
+        "facets": {
+            "assignment": {"assigned": assigned_count, "unassigned": unassigned_count},
+            "active": {"active": active_count, "inactive": inactive_count},
+            "owners": top
+        }
+    }
+
+def get_fonds_by_ids(
+    db: Session,
+    ids: List[int],
+    user,
+    options: Optional[List[Any]] = None
+) -> List[Fond]:
+    """
+    Fondurile cu id-urile date pe care utilizatorul le poate vedea, într-un singur
+    SELECT ... WHERE id IN (...); filtrul de rol este aplicat în SQL.
+    """
+    if not ids:
+        return []
+    
+    query = db.query(Fond).filter(Fond.id.in_(ids), visible_to(user))
+    
+    if options:
+        query = query.options(*options)
+    
+    return query.all()
+
+# Additional functions that might be missing
+def get_my_fonds(
+    db: Session,
+    owner_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    active_only: bool = True,
+    options: Optional[List[Any]] = None
+) -> List[Fond]:
+    """Get fonds for a specific owner (client)"""
+    params = {"owner_id": owner_id, "skip": skip, "limit": limit}
+    return _execute_fonds(db, _fonds_statement(active_only, "owner", False), params, options)
 
 def get_my_fonds_count(db: Session, owner_id: int, active_only: bool = True) -> int:
     """Count fonds for a specific owner"""
@@ -181,16 +627,23 @@ def get_fonds_count(db: Session, active_only: bool = True) -> int:
     
     return query.count()
 
-def soft_delete_fond(db: Session, fond_id: int) -> bool:
-    """Soft delete a fond (set active=False)"""
+def soft_delete_fond(
+    db: Session, fond_id: int, actor_id: Optional[int] = None, db_fond: Optional[Fond] = None
+) -> bool:
+    """Soft delete a fond (set active=False, recorded in the change log); db_fond: already loaded, no extra SELECT"""
     try:
-        db_fond = db.query(Fond).filter(Fond.id == fond_id).first()
+        if db_fond is None:
+            db_fond = db.query(Fond).filter(Fond.id == fond_id).first()
         if not db_fond:
             return False
         
+        was_active = db_fond.active
         db_fond.active = False
         db.commit()
         
+        if was_active:
+            change_log.record([fond_change(fond_id, "deleted", {"active": (True, False)}, actor_id)])
+        
         logger.info(f"Soft deleted fond {fond_id}")
         return True
         
@@ -199,16 +652,32 @@ def soft_delete_fond(db: Session, fond_id: int) -> bool:
         db.rollback()
         return False
 
-def permanently_delete_fond(db: Session, fond_id: int) -> bool:
-    """Permanently delete a fond"""
+# Valorile păstrate în change log la ștergerea definitivă (fără cheile derivate și timestamp-uri)
+_PURGE_LOGGED_FIELDS = tuple(
+    column.key for column in Fond.__table__.columns
+    if column.key not in ("id", "holder_name_normalized", "created_at", "updated_at")
+)
+
+def permanently_delete_fond(
+    db: Session, fond_id: int, actor_id: Optional[int] = None, db_fond: Optional[Fond] = None
+) -> bool:
+    """Permanently delete a fond (the old values stay in the change log); db_fond: already loaded, no extra SELECT"""
     try:
-        db_fond = db.query(Fond).filter(Fond.id == fond_id).first()
+        if db_fond is None:
+            db_fond = db.query(Fond).filter(Fond.id == fond_id).first()
         if not db_fond:
             return False
         
+        old_values = {field: getattr(db_fond, field) for field in _PURGE_LOGGED_FIELDS}
         db.delete(db_fond)
         db.commit()
         
+        change_log.record([fond_change(
+            fond_id, "purged",
+            {field: (value, None) for field, value in old_values.items() if value is not None},
+            actor_id
+        )])
+        
         logger.info(f"Permanently deleted fond {fond_id}")
         return True
         
@@ -241,7 +710,8 @@ def get_client_statistics(db: Session, client_id: int) -> Dict[str, Any]:
         # - Fonds by location/address
         # - etc.
         
-        recent_fond = db.query(Fond).filter(
+        # Doar coloanele din ix_fonds_owner_id_desc (owner_id, id DESC) INCLUDE (company_name)
+        recent_fond = db.query(Fond.id, Fond.company_name).filter(
             Fond.owner_id == client_id
         ).order_by(desc(Fond.id)).first()
         
@@ -273,36 +743,116 @@ def get_fonds_for_user(
     skip: int = 0, 
     limit: int = 100, 
     active_only: bool = True,
-    include_owner: bool = False
+    include_owner: bool = False,
+    options: Optional[List[Any]] = None
 ) -> List[Fond]:
-    """Get fonds based on user role - admins see all, clients see only their own"""
+    """Get fonds based on user role - admins and audit see all, clients see only their own"""
     try:
-        # Check user role
-        if user.role == "admin":
-            # Admins see all fonds
-            return get_fonds(
-                db=db, 
-                skip=skip, 
-                limit=limit, 
-                active_only=active_only, 
-                include_owner=include_owner
-            )
-        elif user.role == "client":
-            # Clients see only their own fonds
-            query = db.query(Fond).filter(Fond.owner_id == user.id)
-            
-            if include_owner:
-                query = query.options(joinedload(Fond.owner))
-            
-            if active_only:
-                query = query.filter(Fond.active == True)
-            
-            return query.offset(skip).limit(limit).all()
-        else:
-            # Unknown role - return empty list
-            logger.warning(f"Unknown user role: {user.role} for user {user.id}")
-            return []
+        owner_filter, params = _visibility_filter(user)
+        params.update(skip=skip, limit=limit)
+        stmt = _fonds_statement(active_only, owner_filter, include_owner)
+        return _execute_fonds(db, stmt, params, options)
             
     except Exception as e:
         logger.error(f"Error getting fonds for user {user.id} with role {user.role}: {str(e)}")
         return []
+
+def get_fond_for_user(db: Session, user, fond_id: int) -> Tuple[Optional[Fond], bool]:
+    """
+    Fondul și dacă utilizatorul îl poate vedea, într-un singur SELECT.
+    Întoarce (None, True) dacă fondul nu există - apelantul răspunde cu 404.
+    """
+    row = db.query(Fond, _allowed_column(visible_to(user), "visible")).filter(Fond.id == fond_id).first()
+    if row is None:
+        return None, True
+    return row[0], bool(row.visible)
+
+def get_editable_fond(db: Session, user, fond_id: int) -> Optional[Fond]:
+    """
+    Fondul, doar dacă utilizatorul îl poate modifica, într-un singur SELECT.
+    None și pentru fondurile inexistente, și pentru cele ale altcuiva - apelantul răspunde cu 404.
+    """
+    return db.query(Fond).filter(Fond.id == fond_id, editable_by(user)).first()
+
+def _fond_permissions(db: Session, user, fond_id: int) -> Optional[Any]:
+    """(visible, editable) pentru un fond, sau None dacă nu există"""
+    return db.query(
+        _allowed_column(visible_to(user), "visible"),
+        _allowed_column(editable_by(user), "editable")
+    ).select_from(Fond).filter(Fond.id == fond_id).first()
+
+def can_user_view_fond(db: Session, user, fond_id: int) -> bool:
+    """False doar dacă fondul există și nu e vizibil (inexistent -> 404 la apelant)"""
+    permissions = _fond_permissions(db, user, fond_id)
+    return permissions is None or bool(permissions.visible)
+
+def can_user_edit_fond(db: Session, user, fond_id: int) -> bool:
+    """False doar dacă fondul există și nu e editabil (inexistent -> 404 la apelant)"""
+    permissions = _fond_permissions(db, user, fond_id)
+    return permissions is None or bool(permissions.editable)
+
+def validate_fond_access(db: Session, user, fond_id: int, action: str = "view") -> Tuple[bool, Optional[str]]:
+    """Verifică accesul pentru `view`, `edit` sau `delete`; întoarce (permis, mesaj de eroare)"""
+    permissions = _fond_permissions(db, user, fond_id)
+    if permissions is None:
+        return True, None
+    
+    if action == "view":
+        if permissions.visible:
+            return True, None
+        return False, "Nu ai permisiuni pentru a vedea acest fond"
+    
+    if permissions.editable:
+        return True, None
+    if user.role == "audit":
+        return False, "Audit users have read-only access"
+    if user.role == "client":
+        verb = "șterge" if action == "delete" else "edita"
+        return False, f"Poți {verb} doar fondurile care îți aparțin"
+    return False, "Nu ai permisiuni pentru această operație"
+
+def search_fonds_for_user(
+    db: Session,
+    user,
+    query: str,
+    skip: int = 0,
+    limit: int = 20,
+    active_only: bool = True,
+    options: Optional[List[Any]] = None
+) -> List[Fond]:
+    """Căutare restrânsă la fondurile vizibile utilizatorului"""
+    owner_filter, params = _visibility_filter(user)
+    params.update(pattern=search_pattern(query), skip=skip, limit=limit)
+    return _execute_fonds(db, _search_statement(active_only, owner_filter), params, options)
+
+def search_my_fonds(
+    db: Session,
+    owner_id: int,
+    query: str,
+    skip: int = 0,
+    limit: int = 20,
+    active_only: bool = True,
+    options: Optional[List[Any]] = None
+) -> List[Fond]:
+    """Search within the fonds of a specific owner"""
+    params = {"owner_id": owner_id, "pattern": search_pattern(query), "skip": skip, "limit": limit}
+    return _execute_fonds(db, _search_statement(active_only, "owner"), params, options)
+
+def search_my_fonds_count(db: Session, owner_id: int, query: str, active_only: bool = True) -> int:
+    """Count search results within the fonds of a specific owner"""
+    return _search_query(db, query, active_only, None).filter(Fond.owner_id == owner_id).count()
+
+def search_all_fonds(
+    db: Session,
+    query: str,
+    skip: int = 0,
+    limit: int = 20,
+    active_only: bool = True,
+    options: Optional[List[Any]] = None
+) -> List[Fond]:
+    """Search across all fonds (admin / audit)"""
+    return search_fonds(db, query, skip=skip, limit=limit, active_only=active_only, options=options)
+
+def get_unassigned_fonds(db: Session, skip: int = 0, limit: int = 50, active_only: bool = True) -> List[Fond]:
+    """Fonds without an owner (owner_id IS NULL)"""
+    return get_fonds(db, skip=skip, limit=limit, active_only=active_only, owner_id=0)
@@ -1,6 +1,6 @@
 # app/crud/user.py - CRUD USER REPARAT
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import bindparam, func, select
 from typing import List, Optional
 from passlib.hash import bcrypt
 from app.models.user import User
@@ -11,9 +11,12 @@ def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
     """Get user by ID"""
     return db.query(User).filter(User.id == user_id).first()
 
+# Construit o singură dată: la fiecare request autentificat se refolosește SQL-ul compilat
+_USER_BY_USERNAME = select(User).where(User.username == bindparam("username")).limit(1)
+
 def get_user_by_username(db: Session, username: str) -> Optional[User]:
     """Get user by username"""
-    return db.query(User).filter(User.username == username).first()
+    return db.execute(_USER_BY_USERNAME, {"username": username}).scalars().first()
 
 def list_users(db: Session, skip: int = 0, limit: int = 100) -> List[User]:
     """List users with pagination"""
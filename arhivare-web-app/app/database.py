@@ -1,9 +1,19 @@
 # app/database.py - CONFIGURAȚIE UNIFICATĂ (înlocuiește și database.py și db/session.py)
-from sqlalchemy import create_engine
+import asyncio
+import itertools
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql.dml import UpdateBase
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.DATABASE_URL,
@@ -17,6 +27,138 @@ engine = create_engine(
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# === READ REPLICAS ===
+# Lag-ul unei replici PostgreSQL; 0 dacă a aplicat tot WAL-ul primit (primarul inactiv nu e "lag")
+_PG_REPLICA_LAG = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaSet:
+    """
+    Replicile de citire cu verificare de lag. Lag-ul se măsoară într-un task de
+    fundal la fiecare REPLICA_LAG_CHECK_SECONDS (ca services.health.DatabaseProbe),
+    niciodată pe calea request-ului: choose() citește doar lista din memorie. O
+    replică inaccesibilă sau cu lag peste REPLICA_MAX_LAG_SECONDS e ocolită; dacă
+    nu rămâne niciuna, sau măsurătorile lipsesc ori sunt mai vechi de 3 intervale
+    (task-ul nu rulează / e blocat), citirile merg pe primar.
+    """
+
+    def __init__(self, primary: Engine, replicas: List[Engine], max_lag: float, check_interval: float):
+        self.primary = primary
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.lag: Dict[int, Optional[float]] = {}
+        self._healthy: List[Engine] = []
+        self._round_robin = itertools.count()
+        self._checked_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def measure_lag(self, replica: Engine) -> Optional[float]:
+        """Secunde de lag, sau None dacă replica nu răspunde"""
+        try:
+            with replica.connect() as connection:
+                if replica.dialect.name == "postgresql":
+                    return float(connection.execute(_PG_REPLICA_LAG).scalar() or 0)
+                connection.execute(text("SELECT 1"))
+                return 0.0
+        except Exception as e:
+            logger.warning(f"Replica {replica.url.render_as_string(hide_password=True)} unavailable: {e}")
+            return None
+
+    def refresh(self) -> None:
+        """Măsoară lag-ul tuturor replicilor (blocant) și înlocuiește lista celor sănătoase"""
+        healthy = []
+        for index, replica in enumerate(self.replicas):
+            lag = self.measure_lag(replica)
+            self.lag[index] = lag
+            if lag is not None and lag <= self.max_lag:
+                healthy.append(replica)
+        if self.replicas and not healthy:
+            logger.warning("No healthy read replica, routing reads to the primary")
+        self._healthy = healthy
+        self._checked_at = time.monotonic()
+
+    def choose(self) -> Engine:
+        """O replică sănătoasă (round-robin) sau primarul; fără I/O"""
+        checked_at, healthy = self._checked_at, self._healthy
+        if checked_at is None or time.monotonic() - checked_at > 3 * self.check_interval or not healthy:
+            return self.primary
+        return healthy[next(self._round_robin) % len(healthy)]
+
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception as e:  # măsurarea nu trebuie să oprească task-ul
+                logger.error(f"Replica lag check crashed: {e}")
+            await asyncio.sleep(self.check_interval)
+
+    def start(self) -> None:
+        if self.replicas and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+class RoutingSession(Session):
+    """
+    Sesiune pentru dependențele read-only: SELECT-urile merg pe o replică (aceeași
+    pe toată durata sesiunii), iar după prima scriere (flush sau INSERT/UPDATE/DELETE
+    explicit) sesiunea rămâne pe primar - citirile ulterioare își văd scrierile.
+    """
+
+    _PRIMARY_FLAG = "routing_use_primary"
+    _REPLICA_KEY = "routing_replica"
+
+    def __init__(self, replica_set: ReplicaSet, **kwargs):
+        super().__init__(**kwargs)
+        self.replica_set = replica_set
+
+    def use_primary(self) -> None:
+        self.info[self._PRIMARY_FLAG] = True
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.use_primary()
+        if self.info.get(self._PRIMARY_FLAG):
+            return self.replica_set.primary
+        if self._REPLICA_KEY not in self.info:
+            self.info[self._REPLICA_KEY] = self.replica_set.choose()
+        return self.info[self._REPLICA_KEY]
+
+
+def _replica_connect_args(url: str) -> Dict[str, Any]:
+    # psycopg2 nu are timeout de conectare implicit: o replică "blackholed" ar bloca măsurarea
+    if make_url(url).get_backend_name() == "postgresql":
+        return {"connect_timeout": settings.REPLICA_CONNECT_TIMEOUT_SECONDS}
+    return {}
+
+
+replica_engines = [
+    create_engine(
+        url, pool_pre_ping=True, pool_recycle=3600, pool_size=5, max_overflow=10,
+        connect_args=_replica_connect_args(url),
+    )
+    for url in settings.replica_urls
+]
+replica_set = ReplicaSet(
+    engine, replica_engines,
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.REPLICA_LAG_CHECK_SECONDS
+)
+ReadSessionLocal = sessionmaker(class_=RoutingSession, replica_set=replica_set, autocommit=False, autoflush=False)
+
 # Create Base class for models
 Base = declarative_base()
 
@@ -29,6 +171,18 @@ def get_db():
     finally:
         db.close()
 
+def get_read_db():
+    """
+    Sesiune pentru rutele read-only (căutare, listări, statistici): citește de pe o
+    replică dacă e configurată și la zi, altfel de pe primar. Scrierile și fluxurile
+    care trebuie să-și vadă imediat scrierile folosesc get_db.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
 # Alternative function for direct database access
 def get_db_session():
     """Get database session for direct access (not as dependency)"""
@@ -1,56 +1,81 @@
 # app/main.py - FASTAPI APP REPARAT
-from fastapi import FastAPI, HTTPException, status
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import text
 from app.core.config import settings
-from app.database import SessionLocal  # Import unificat
+from app.core.logging_config import setup_logging, shutdown_logging, RequestIdMiddleware
+from app.core.startup import run_warmup
+from app.database import replica_set
+from app.services.change_log import change_log
+from app.services.events import event_listener
+from app.services.health import database_probe
 
 # Import routes cu paths corecti
 from app.api import search
+from app.api.health import APP_VERSION, router as health_router
+from app.api.events import router as events_router
 from app.api.auth import router as auth_router
 from app.api.routes.users import router as users_router
 from app.api.routes.fonds import router as fonds_router
 from app.api.routes.client_fonds import router as client_fonds_router
 from app.api.routes.admin_fonds import router as admin_fonds_router
 
+setup_logging()
+logger = logging.getLogger(__name__)
+
+
+# === LIFESPAN (startup / shutdown) ===
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logger.info("Arhivare Web App starting...")
+    
+    report = {"import_ms": IMPORT_MS}
+    if settings.STARTUP_WARMUP_ENABLED:
+        # Pașii sunt blocanți (DB, bcrypt) - rulează în thread, înainte de primul request
+        report.update(await asyncio.to_thread(run_warmup, app))
+    app.state.startup_report = report
+    logger.info(f"Startup report: {report}")
+    
+    # Prima probă rulează imediat; apoi la fiecare HEALTH_PROBE_INTERVAL_SECONDS
+    database_probe.start()
+    # Lag-ul replicilor de citire se măsoară doar în fundal
+    replica_set.start()
+    change_log.start()
+    if settings.EVENTS_PG_NOTIFY:
+        # Fan-out al evenimentelor de dashboard între workeri (doar PostgreSQL)
+        await asyncio.to_thread(event_listener.start)
+    
+    logger.info("Startup complete")
+    yield
+    
+    logger.info("Arhivare Web App shutting down...")
+    await database_probe.stop()
+    await replica_set.stop()
+    await asyncio.to_thread(event_listener.stop)
+    # Rândurile de audit rămase în coadă se scriu înainte de ieșire
+    await asyncio.to_thread(change_log.stop)
+    logger.info("Shutdown complete")
+    shutdown_logging()
+
+
 # Create FastAPI instance
 app = FastAPI(
+    lifespan=lifespan,
     title=settings.PROJECT_NAME,
-    version="1.0.0",
+    version=APP_VERSION,
     openapi_url="/openapi.json",
     docs_url="/docs",
     redoc_url="/redoc",
     description="Arhivare Web App - Management fonduri arhivistice"
 )
 
-# === HEALTH CHECK ===
-@app.get("/health", tags=["Health"])
-def health_check():
-    """Health check endpoint"""
-    try:
-        # Test database connection
-        db = SessionLocal()
-        try:
-            result = db.execute(text("SELECT 1")).fetchone()
-            if result is None:
-                raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail="Database query returned no results"
-                )
-        finally:
-            db.close()
-        
-        return {
-            "status": "healthy",
-            "app": settings.PROJECT_NAME,
-            "database": "connected"
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"Health check failed: {str(e)}"
-        )
-
 # === CORS MIDDLEWARE ===
 app.add_middleware(
     CORSMiddleware,
@@ -64,10 +89,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# === REQUEST ID / ACCESS LOG MIDDLEWARE ===
+app.add_middleware(RequestIdMiddleware)
+
 # === ROUTE REGISTRATION ===
+# Health probes (/health, /health/live, /health/ready)
+app.include_router(health_router)
+
 # Public routes (no authentication)
 app.include_router(search.router, tags=["Public Search"])
 
+# Dashboard events (SSE)
+app.include_router(events_router)
+
 # Authentication routes
 app.include_router(auth_router, prefix="/auth", tags=["Authentication"])
 
@@ -77,25 +111,5 @@ app.include_router(fonds_router, prefix="/fonds", tags=["Fonds Management"])
 app.include_router(client_fonds_router, prefix="/fonds", tags=["Client Fonds"])
 app.include_router(admin_fonds_router, prefix="/admin", tags=["Admin Management"])
 
-# === STARTUP EVENT ===
-@app.on_event("startup")
-async def startup_event():
-    print("🚀 Arhivare Web App starting...")
-    
-    # Test database connection
-    try:
-        db = SessionLocal()
-        try:
-            db.execute(text("SELECT 1"))
-            print("✅ Database connection successful")
-        finally:
-            db.close()
-    except Exception as e:
-        print(f"❌ Database connection failed: {e}")
-    
-    print("✅ Startup complete!")
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    print("👋 Arhivare Web App shutting down...")
-    print("✅ Shutdown complete!")
+# Timpul de import al aplicației (module + routere), raportat la pornire
+IMPORT_MS = round((time.perf_counter() - _IMPORT_STARTED) * 1000, 2)
@@ -0,0 +1,139 @@
+# app/migration_helpers.py - Helpers for zero-downtime Alembic migrations
+"""
+Operații de migrare care nu blochează scrierile pe tabelele mari:
+
+  - create_index_online / drop_index_online: CREATE/DROP INDEX CONCURRENTLY în
+    afara tranzacției (PostgreSQL); un index INVALID rămas dintr-o rulare
+    întreruptă este șters și reconstruit
+  - add_column_if_missing: coloane nullable, idempotent la re-rulare
+  - backfill_in_batches: loturi mici, fiecare comis separat, cu pauză între loturi
+    și progres afișat; rândurile deja completate sunt sărite, deci o migrare
+    întreruptă se reia de unde a rămas
+
+Se folosesc doar din fișierele din alembic/versions (au nevoie de contextul `op`).
+"""
+import os
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "1000"))
+BATCH_PAUSE_SECONDS = float(os.getenv("MIGRATION_BATCH_PAUSE", "0.05"))
+
+
+def is_postgresql() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def _invalid_index_exists(name: str) -> bool:
+    """Un CREATE INDEX CONCURRENTLY eșuat lasă în urmă un index marcat INVALID"""
+    return op.get_bind().execute(
+        sa.text(
+            "SELECT 1 FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ),
+        {"name": name},
+    ).first() is not None
+
+
+def create_index_online(name: str, table: str, columns: Sequence, **kwargs) -> None:
+    """CREATE INDEX CONCURRENTLY IF NOT EXISTS pe PostgreSQL, create_index simplu în rest"""
+    if not is_postgresql():
+        kwargs = {key: value for key, value in kwargs.items() if not key.startswith("postgresql_")}
+        op.create_index(name, table, list(columns), if_not_exists=True, **kwargs)
+        print(f"  ✅ Index {name} ready")
+        return
+
+    # CONCURRENTLY nu poate rula într-o tranzacție
+    with op.get_context().autocommit_block():
+        if _invalid_index_exists(name):
+            print(f"  ♻️  Dropping INVALID leftover index {name}")
+            op.drop_index(name, table, postgresql_concurrently=True, if_exists=True)
+        op.create_index(
+            name, table, list(columns),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+            **kwargs
+        )
+    print(f"  ✅ Index {name} ready (concurrently)")
+
+
+def drop_index_online(name: str, table: str) -> None:
+    """DROP INDEX CONCURRENTLY IF EXISTS pe PostgreSQL"""
+    if not is_postgresql():
+        op.drop_index(name, table, if_exists=True)
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index(name, table, postgresql_concurrently=True, if_exists=True)
+
+
+def add_column_if_missing(table: str, column: sa.Column) -> bool:
+    """Adaugă coloana doar dacă lipsește - migrarea poate fi re-rulată după o întrerupere"""
+    existing = {col["name"] for col in sa.inspect(op.get_bind()).get_columns(table)}
+    if column.name in existing:
+        print(f"  ↪️  {table}.{column.name} already exists")
+        return False
+    op.add_column(table, column)
+    return True
+
+
+def backfill_in_batches(
+    table: str,
+    source_columns: List[str],
+    pending: str,
+    compute: Callable[[sa.engine.Row], Dict],
+    batch_size: Optional[int] = None,
+    pause_seconds: Optional[float] = None,
+) -> int:
+    """
+    Completează rândurile care satisfac `pending` (ex. "x_normalized IS NULL"), în
+    ordinea id-urilor. `compute(row)` întoarce valorile noi pentru rând; fiecare lot
+    este un UPDATE executemany comis separat pe PostgreSQL, urmat de o pauză, ca
+    replicarea și autovacuum-ul să țină pasul.
+    """
+    batch_size = batch_size or BATCH_SIZE
+    pause_seconds = BATCH_PAUSE_SECONDS if pause_seconds is None else pause_seconds
+    connection = op.get_bind()
+
+    total = connection.execute(sa.text(f"SELECT count(*) FROM {table} WHERE {pending}")).scalar() or 0
+    if not total:
+        print(f"  ↪️  {table}: nothing to backfill")
+        return 0
+
+    select_batch = sa.text(
+        f"SELECT id, {', '.join(source_columns)} FROM {table} "
+        f"WHERE id > :last_id AND {pending} ORDER BY id LIMIT :limit"
+    )
+
+    def run() -> int:
+        last_id = 0
+        done = 0
+        started = time.monotonic()
+        while True:
+            rows = connection.execute(select_batch, {"last_id": last_id, "limit": batch_size}).fetchall()
+            if not rows:
+                return done
+
+            params = []
+            for row in rows:
+                values = compute(row)
+                params.append({"_id": row.id, **values})
+            assignments = ", ".join(f"{column} = :{column}" for column in params[0] if column != "_id")
+            connection.execute(sa.text(f"UPDATE {table} SET {assignments} WHERE id = :_id"), params)
+
+            last_id = rows[-1].id
+            done += len(rows)
+            elapsed = time.monotonic() - started
+            rate = done / elapsed if elapsed else 0
+            print(f"  … {table}: {done}/{total} rows ({done * 100 // total}%, {rate:,.0f} rows/s)")
+            if pause_seconds:
+                time.sleep(pause_seconds)
+
+    if is_postgresql():
+        # Fiecare lot se comite imediat: progresul rămâne salvat dacă migrarea e întreruptă
+        with op.get_context().autocommit_block():
+            return run()
+    return run()
@@ -2,5 +2,7 @@
 from .base import Base
 from .user import User
 from .fond import Fond
+from .auth_token import RefreshToken, RevokedToken
+from .fond_change import FondChange
 
-__all__ = ["Base", "User", "Fond"]
+__all__ = ["Base", "User", "Fond", "RefreshToken", "RevokedToken", "FondChange"]
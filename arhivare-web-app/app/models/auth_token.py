@@ -0,0 +1,37 @@
+# app/models/auth_token.py - Refresh tokens and the persisted access-token revocation list
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from ..database import Base
+
+
+class RefreshToken(Base):
+    """
+    Refresh token rotativ. Se stochează doar hash-ul SHA-256 al valorii; fiecare
+    rotație revocă token-ul curent și emite altul în aceeași familie. Reutilizarea
+    unui token deja rotit revocă toată familia (token furat).
+    """
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    token_hash = Column(String(64), nullable=False, unique=True, index=True)
+    family_id = Column(String(32), nullable=False, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<RefreshToken(id={self.id}, user_id={self.user_id}, family='{self.family_id}')>"
+
+
+class RevokedToken(Base):
+    """`jti`-ul unui access token revocat înainte de expirare (logout); sursa listei din memorie"""
+    __tablename__ = "revoked_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    jti = Column(String(32), nullable=False, unique=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    revoked_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<RevokedToken(jti='{self.jti}')>"
@@ -1,8 +1,14 @@
 # app/models/fond.py - Enhanced with owner relationship
 from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from ..database import Base
+from ..services.company_names import stored_key, sync_key_on_update
+
+
+def _holder_name_key_default(context):
+    """Cheia normalizată la INSERT-uri bulk/Core, când @validates nu rulează"""
+    return stored_key(context.get_current_parameters().get("holder_name"))
 
 class Fond(Base):
     __tablename__ = "fonds"
@@ -10,6 +16,8 @@ class Fond(Base):
     id = Column(Integer, primary_key=True, index=True)
     company_name = Column(String(255), nullable=False, index=True)
     holder_name = Column(String(255), nullable=False, index=True)
+    # Menținut automat la scriere - folosit pentru lookup-uri după deținător (index B-tree + trigram)
+    holder_name_normalized = Column(String(255), nullable=True, index=True, default=_holder_name_key_default)
     address = Column(String(500), nullable=True)
     email = Column(String(100), nullable=True)
     phone = Column(String(20), nullable=True)
@@ -25,6 +33,11 @@ class Fond(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    @validates("holder_name")
+    def _sync_holder_name_normalized(self, key, value):
+        self.holder_name_normalized = stored_key(value)
+        return value
+
     def __repr__(self):
         return f"<Fond(id={self.id}, company_name='{self.company_name}', holder_name='{self.holder_name}', owner_id={self.owner_id})>"
 
@@ -82,3 +95,6 @@ class Fond(Base):
             
         return round((filled_fields / total_fields) * 100, 1)
 
+
+# UPDATE-urile bulk prin sesiune (ex. apply_fond_batch) ocolesc @validates
+sync_key_on_update(Fond, "holder_name", "holder_name_normalized")
@@ -0,0 +1,26 @@
+# app/models/fond_change.py - Append-only change log for fond mutations
+from sqlalchemy import Column, Integer, String, DateTime, JSON
+from sqlalchemy.sql import func
+from ..database import Base
+
+
+class FondChange(Base):
+    """
+    Cine (actor_id) a modificat ce fond, când și ce câmpuri: `changes` este
+    {câmp: [valoare veche, valoare nouă]}. Tabela e doar append; nu are FK, ca
+    istoricul să rămână și după ștergerea definitivă a fondului sau a utilizatorului.
+    Rândurile sunt scrise asincron, în loturi (services.change_log), deci
+    `changed_at` este momentul modificării, iar `recorded_at` cel al inserării.
+    """
+    __tablename__ = "fond_changes"
+
+    id = Column(Integer, primary_key=True, index=True)
+    fond_id = Column(Integer, nullable=False, index=True)
+    actor_id = Column(Integer, nullable=True, index=True)
+    action = Column(String(32), nullable=False)
+    changes = Column(JSON, nullable=False)
+    changed_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    recorded_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<FondChange(id={self.id}, fond_id={self.fond_id}, action='{self.action}', actor_id={self.actor_id})>"
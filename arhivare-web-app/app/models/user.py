@@ -1,8 +1,14 @@
 # app/models/user.py - MODEL USER REPARAT
 from sqlalchemy import Column, Integer, String, DateTime, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from app.database import Base  # Import unificat
+from app.services.company_names import stored_key, sync_key_on_update
+
+
+def _company_name_key_default(context):
+    """Cheia normalizată la INSERT-uri bulk/Core, când @validates nu rulează"""
+    return stored_key(context.get_current_parameters().get("company_name"))
 
 class User(Base):
     __tablename__ = "users"
@@ -11,9 +17,13 @@ class User(Base):
     username = Column(String(64), unique=True, index=True, nullable=False)
     password_hash = Column(String(128), nullable=False)  # CONSISTENT cu create_admin_user.py
     role = Column(String(20), nullable=False, default="client", index=True)
+    # Incrementat la schimbarea rolului - token-urile emise cu altă versiune sunt respinse
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Extended fields for client information
     company_name = Column(String(255), nullable=True)
+    # Menținut automat la scriere - folosit pentru matching-ul owner-ilor (index B-tree + trigram)
+    company_name_normalized = Column(String(255), nullable=True, index=True, default=_company_name_key_default)
     contact_email = Column(String(100), nullable=True)
     notes = Column(Text, nullable=True)
     
@@ -24,6 +34,11 @@ class User(Base):
     # Relationship with owned fonds
     owned_fonds = relationship("Fond", back_populates="owner", foreign_keys="Fond.owner_id")
 
+    @validates("company_name")
+    def _sync_company_name_normalized(self, key, value):
+        self.company_name_normalized = stored_key(value)
+        return value
+
     def __repr__(self):
         return f"<User(id={self.id}, username='{self.username}', role='{self.role}')>"
 
@@ -52,3 +67,7 @@ class User(Base):
     @property
     def is_client(self):
         return self.role == "client"
+
+
+# UPDATE-urile bulk prin sesiune ocolesc @validates
+sync_key_on_update(User, "company_name", "company_name_normalized")
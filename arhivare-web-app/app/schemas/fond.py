@@ -1,8 +1,10 @@
 # app/schemas/fond.py - FIXED VERSION with proper syntax
 from pydantic import BaseModel, Field, validator
-from typing import Optional
+from typing import Annotated, Dict, List, Literal, Optional, Union
 from datetime import datetime
 
+from app.core.config import settings
+
 # Base Fond schema
 class FondBase(BaseModel):
     company_name: str = Field(..., min_length=2, max_length=255, description="Company name")
@@ -118,3 +120,92 @@ class FondSearchResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+# Partial fond (sparse fieldsets, fields=): câmpurile FondResponse, toate opționale
+class FondPartialResponse(BaseModel):
+    id: int
+    company_name: Optional[str] = None
+    holder_name: Optional[str] = None
+    address: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    notes: Optional[str] = None
+    source_url: Optional[str] = None
+    active: Optional[bool] = None
+    owner_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    owner: Optional[FondOwner] = None
+
+    class Config:
+        from_attributes = True
+
+# Search hit with optional fields (fields= / snippet)
+class SearchSnippet(BaseModel):
+    field: str
+    text: str
+    highlights: List[List[int]] = Field(default_factory=list, description="Offset-uri [start, end) în text")
+
+class FondSearchHit(FondPartialResponse):
+    """Rezultat /search: câmpurile FondResponse, toate opționale, plus snippet"""
+    snippet: Optional[SearchSnippet] = None
+
+# Batch get
+class FondBatchGetRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=settings.FONDS_BATCH_MAX_ITEMS, description="ID-urile cerute")
+
+class FondBatchGetResponse(BaseModel):
+    fonds: List[FondPartialResponse]
+    missing: List[int] = Field(default_factory=list, description="ID-uri inexistente sau fără drept de vizualizare")
+
+# Batch write
+class FondBatchCreate(BaseModel):
+    op: Literal["create"]
+    data: FondCreate
+
+class FondBatchUpdate(BaseModel):
+    op: Literal["update"]
+    id: int
+    data: FondUpdate
+
+class FondBatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: int
+
+FondBatchOperation = Annotated[Union[FondBatchCreate, FondBatchUpdate, FondBatchDelete], Field(discriminator="op")]
+
+class FondBatchRequest(BaseModel):
+    operations: List[FondBatchOperation] = Field(..., min_length=1, max_length=settings.FONDS_BATCH_MAX_ITEMS)
+    atomic: bool = Field(True, description="Dacă o operație e invalidă, nu se aplică nimic")
+
+class FondBatchItemResult(BaseModel):
+    index: int
+    op: str
+    id: Optional[int] = None
+    status: str  # created / updated / deleted / error / skipped
+    error: Optional[str] = None
+
+class FondBatchResponse(BaseModel):
+    applied: bool
+    results: List[FondBatchItemResult]
+
+# Admin search with facets
+class FondOwnerFacet(BaseModel):
+    owner_id: int
+    username: Optional[str] = None
+    company_name: Optional[str] = None
+    count: int
+
+class FondSearchFacets(BaseModel):
+    assignment: Dict[str, int]
+    active: Dict[str, int]
+    owners: List[FondOwnerFacet]
+
+class FondAdminSearchResponse(BaseModel):
+    query: Optional[str] = None
+    total: int
+    skip: int
+    limit: int
+    results: List[FondResponse]
+    facets: Optional[FondSearchFacets] = None
@@ -4,16 +4,65 @@ from sqlalchemy import and_, or_, func
 from typing import List, Optional, Dict, Any
 from ..models.user import User
 from ..models.fond import Fond
+from .change_log import change_log, fond_change
+from .company_names import normalize_company_name, word_set
 import logging
-import re
 
 logger = logging.getLogger(__name__)
 
 class AssignmentService:
     """Service for managing fond ownership assignments"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, actor_id: Optional[int] = None):
         self.db = db
+        self.actor_id = actor_id  # cine face assignment-ul - ajunge în change log
+    
+    def _get_client(self, user_id: int) -> Optional[User]:
+        return self.db.query(User).filter(
+            User.id == user_id,
+            User.role == "client"
+        ).first()
+    
+    def _assignment_result(
+        self, fond: Fond, old_owner_id: Optional[int], user_id: Optional[int], new_owner: Optional[User]
+    ) -> Dict[str, Any]:
+        result = {
+            "success": True,
+            "fond_id": fond.id,
+            "old_owner_id": old_owner_id,
+            "new_owner_id": user_id,
+            "fond_name": fond.company_name
+        }
+        
+        if user_id and old_owner_id:
+            result["action"] = "reassigned"
+            result["message"] = f"Fond '{fond.company_name}' reassigned to {new_owner.username}"
+        elif user_id:
+            result["action"] = "assigned"
+            result["message"] = f"Fond '{fond.company_name}' assigned to {new_owner.username}"
+        elif old_owner_id:
+            result["action"] = "unassigned"
+            result["message"] = f"Fond '{fond.company_name}' unassigned"
+        else:
+            result["action"] = "no_change"
+            result["message"] = "No assignment change"
+        
+        if new_owner:
+            result["new_owner_username"] = new_owner.username
+            result["new_owner_company"] = new_owner.company_name
+        
+        return result
+    
+    def _change_rows(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Rândurile de change log pentru assignment-urile care chiar au schimbat owner-ul"""
+        return [
+            fond_change(
+                result["fond_id"], result["action"],
+                {"owner_id": (result["old_owner_id"], result["new_owner_id"])}, self.actor_id
+            )
+            for result in results
+            if result.get("success") and result["old_owner_id"] != result["new_owner_id"]
+        ]
     
     def assign_fond_to_user(self, fond_id: int, user_id: Optional[int]) -> Dict[str, Any]:
         """
@@ -41,10 +90,7 @@ class AssignmentService:
             # Validate new owner if provided
             new_owner = None
             if user_id:
-                new_owner = self.db.query(User).filter(
-                    User.id == user_id,
-                    User.role == "client"
-                ).first()
+                new_owner = self._get_client(user_id)
                 
                 if not new_owner:
                     return {
@@ -58,31 +104,8 @@ class AssignmentService:
             self.db.commit()
             self.db.refresh(fond)
             
-            # Prepare result
-            result = {
-                "success": True,
-                "fond_id": fond_id,
-                "old_owner_id": old_owner_id,
-                "new_owner_id": user_id,
-                "fond_name": fond.company_name
-            }
-            
-            if user_id and old_owner_id:
-                result["action"] = "reassigned"
-                result["message"] = f"Fond '{fond.company_name}' reassigned to {new_owner.username}"
-            elif user_id:
-                result["action"] = "assigned"
-                result["message"] = f"Fond '{fond.company_name}' assigned to {new_owner.username}"
-            elif old_owner_id:
-                result["action"] = "unassigned"
-                result["message"] = f"Fond '{fond.company_name}' unassigned"
-            else:
-                result["action"] = "no_change"
-                result["message"] = "No assignment change"
-            
-            if new_owner:
-                result["new_owner_username"] = new_owner.username
-                result["new_owner_company"] = new_owner.company_name
+            result = self._assignment_result(fond, old_owner_id, user_id, new_owner)
+            change_log.record(self._change_rows([result]))
             
             logger.info(f"Fond {fond_id} assignment: {result['action']}")
             return result
@@ -100,6 +123,9 @@ class AssignmentService:
         """
         Bulk assign multiple fonds to a user
         
+        Un singur SELECT pentru fonduri, un singur commit și un singur grup în
+        change log (un INSERT batch), în loc de câte unul per fond.
+        
         Args:
             fond_ids: List of fond IDs to assign
             user_id: User ID to assign to (None to unassign all)
@@ -108,22 +134,42 @@ class AssignmentService:
             Dict with bulk assignment results
         """
         results = []
-        successful = 0
-        failed = 0
-        
-        for fond_id in fond_ids:
-            result = self.assign_fond_to_user(fond_id, user_id)
-            results.append(result)
+        try:
+            fonds = {
+                fond.id: fond
+                for fond in self.db.query(Fond).filter(Fond.id.in_(set(fond_ids))).all()
+            } if fond_ids else {}
+            new_owner = self._get_client(user_id) if user_id else None
+            
+            for fond_id in fond_ids:
+                fond = fonds.get(fond_id)
+                if not fond:
+                    results.append({"success": False, "error": "Fond not found", "fond_id": fond_id})
+                elif user_id and not new_owner:
+                    results.append({
+                        "success": False,
+                        "error": "Invalid user ID or user is not a client",
+                        "fond_id": fond_id
+                    })
+                else:
+                    old_owner_id = fond.owner_id
+                    fond.owner_id = user_id
+                    results.append(self._assignment_result(fond, old_owner_id, user_id, new_owner))
             
-            if result["success"]:
-                successful += 1
-            else:
-                failed += 1
+            self.db.commit()
+        except Exception as e:
+            logger.error(f"Error in bulk assignment: {str(e)}")
+            self.db.rollback()
+            results = [{"success": False, "error": str(e), "fond_id": fond_id} for fond_id in fond_ids]
+        
+        change_log.record(self._change_rows(results))
+        successful = sum(1 for result in results if result["success"])
+        logger.info(f"Bulk assignment to {user_id}: {successful}/{len(fond_ids)} fonds")
         
         return {
             "total_fonds": len(fond_ids),
             "successful_assignments": successful,
-            "failed_assignments": failed,
+            "failed_assignments": len(fond_ids) - successful,
             "results": results
         }
     
@@ -316,23 +362,8 @@ class AssignmentService:
             }
     
     def _normalize_company_name(self, name: str) -> str:
-        """Normalize company name for comparison"""
-        if not name:
-            return ""
-        
-        normalized = name.lower().strip()
-        
-        # Remove common company suffixes/prefixes
-        normalized = re.sub(r'^(sc|sa|srl|sra|ltd|llc|inc|corp|corporation)\s+', '', normalized)
-        normalized = re.sub(r'\s+(sc|sa|srl|sra|ltd|llc|inc|corp|corporation), '', normalized)
-        
-        # Remove special characters
-        normalized = re.sub(r'[^\w\s]', '', normalized)
-        
-        # Replace multiple spaces with single space
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
-        
-        return normalized
+        """Normalize company name for comparison (memoized, see company_names)"""
+        return normalize_company_name(name)
     
     def _calculate_similarity(self, str1: str, str2: str) -> float:
         """Calculate similarity between two normalized strings"""
@@ -348,15 +379,15 @@ class AssignmentService:
             return 0.8
         
         # Word-based similarity
-        words1 = set(str1.split())
-        words2 = set(str2.split())
+        words1 = word_set(str1)
+        words2 = word_set(str2)
         
         if not words1 or not words2:
             return 0.0
         
         # Calculate Jaccard similarity
-        intersection = len(words1.intersection(words2))
-        union = len(words1.union(words2))
+        intersection = len(words1 & words2)
+        union = len(words1) + len(words2) - intersection
         
         return intersection / union if union > 0 else 0.0
     
@@ -388,18 +419,22 @@ class AssignmentService:
 
 
 # Helper functions for use in other modules
-def create_assignment_service(db: Session) -> AssignmentService:
+def create_assignment_service(db: Session, actor_id: Optional[int] = None) -> AssignmentService:
     """Factory function to create AssignmentService instance"""
-    return AssignmentService(db)
+    return AssignmentService(db, actor_id)
 
-def assign_fond_to_user(db: Session, fond_id: int, user_id: Optional[int]) -> Dict[str, Any]:
+def assign_fond_to_user(
+    db: Session, fond_id: int, user_id: Optional[int], actor_id: Optional[int] = None
+) -> Dict[str, Any]:
     """Convenience function for single fond assignment"""
-    service = AssignmentService(db)
+    service = AssignmentService(db, actor_id)
     return service.assign_fond_to_user(fond_id, user_id)
 
-def bulk_assign_fonds(db: Session, fond_ids: List[int], user_id: Optional[int]) -> Dict[str, Any]:
+def bulk_assign_fonds(
+    db: Session, fond_ids: List[int], user_id: Optional[int], actor_id: Optional[int] = None
+) -> Dict[str, Any]:
     """Convenience function for bulk fond assignment"""
-    service = AssignmentService(db)
+    service = AssignmentService(db, actor_id)
     return service.bulk_assign_fonds(fond_ids, user_id)
 
 def suggest_assignments_by_similarity(db: Session, fond_id: int, limit: int = 5) -> List[Dict[str, Any]]:
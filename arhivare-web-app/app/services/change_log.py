@@ -0,0 +1,218 @@
+# app/services/change_log.py - Write-behind writer for the fond change log
+"""
+Rândurile de audit (models.FondChange) nu se scriu în tranzacția request-ului:
+după commit, codul care a modificat fondul le pune într-o coadă în memorie, iar
+un thread de fundal le inserează în loturi - un singur INSERT executemany per
+lot de cel mult CHANGE_LOG_BATCH_SIZE rânduri, cel târziu la
+CHANGE_LOG_FLUSH_SECONDS după ce au intrat în coadă.
+
+  - Un grup de rânduri înregistrat împreună (ex. un bulk assignment) nu este
+    împărțit între loturi: ajunge într-un singur INSERT.
+  - Backpressure: coada are CHANGE_LOG_QUEUE_SIZE rânduri. Cu politica "block",
+    apelantul așteaptă loc cel mult CHANGE_LOG_BLOCK_SECONDS, apoi își scrie
+    singur rândurile (nu se pierde nimic, doar latența crește); cu "drop" rândurile
+    sunt aruncate și numărate.
+  - La shutdown (lifespan, apoi atexit) coada e golită sincron.
+"""
+import atexit
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.fond_change import FondChange
+
+logger = logging.getLogger(__name__)
+
+_JSON_TYPES = (str, int, float, bool, type(None))
+
+
+def _jsonable(value: Any) -> Any:
+    return value if isinstance(value, _JSON_TYPES) else str(value)
+
+
+def fond_change(
+    fond_id: int,
+    action: str,
+    changes: Dict[str, List[Any]],
+    actor_id: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Un rând pentru change log; `changes` = {câmp: [vechi, nou]}"""
+    return {
+        "fond_id": fond_id,
+        "actor_id": actor_id,
+        "action": action,
+        "changes": {field: [_jsonable(old), _jsonable(new)] for field, (old, new) in changes.items()},
+        "changed_at": datetime.now(timezone.utc),
+    }
+
+
+class ChangeLogWriter:
+    """Coadă mărginită de grupuri de rânduri + thread care le inserează în loturi"""
+
+    def __init__(
+        self,
+        max_queue: int,
+        batch_size: int,
+        flush_interval: float,
+        overflow_policy: str = "block",
+        block_seconds: float = 2.0,
+        session_factory: Callable = SessionLocal,
+    ):
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.block_seconds = block_seconds
+        self.session_factory = session_factory
+        self.written = 0
+        self.dropped = 0
+        self._queue: Deque[List[Dict[str, Any]]] = deque()
+        self._pending = 0
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def record(self, rows: List[Dict[str, Any]]) -> None:
+        """Pune rândurile în coadă (ca un singur grup); nu atinge baza de date decât la backpressure"""
+        if not rows or not settings.CHANGE_LOG_ENABLED:
+            return
+
+        with self._cond:
+            if len(rows) < self.max_queue and self._pending + len(rows) > self.max_queue:
+                if self.overflow_policy == "drop":
+                    self.dropped += len(rows)
+                    logger.warning(f"Change log queue full, dropped {len(rows)} rows ({self.dropped} total)")
+                    return
+                self._cond.notify_all()
+                self._cond.wait_for(lambda: self._pending + len(rows) <= self.max_queue, self.block_seconds)
+
+            if self._pending + len(rows) <= self.max_queue:
+                self._queue.append(rows)
+                self._pending += len(rows)
+                if self._pending >= self.batch_size:
+                    self._cond.notify_all()
+                return
+
+        # Coada e tot plină (sau grupul e mai mare decât ea): apelantul scrie singur
+        logger.warning(f"Change log queue full, writing {len(rows)} rows inline")
+        try:
+            self._write([rows])
+        except Exception:
+            # Modificarea e deja comisă - request-ul nu trebuie să eșueze din cauza auditului
+            logger.exception(f"Change log inline write failed, {len(rows)} rows lost: {rows}")
+
+    def flush(self) -> int:
+        """Scrie sincron tot ce e în coadă; întoarce numărul de rânduri scrise"""
+        written = 0
+        while True:
+            with self._cond:
+                batch = self._take_batch()
+            if not batch:
+                return written
+            try:
+                self._write(batch)
+            except Exception:
+                self._requeue(batch)
+                raise
+            written += sum(len(group) for group in batch)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="fond-change-log", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10) -> None:
+        """Oprește thread-ul și golește coada; idempotent"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        try:
+            self.flush()
+        except Exception:
+            logger.exception(f"Change log flush on shutdown failed, {self._pending} rows lost")
+
+    def reset(self) -> None:
+        with self._cond:
+            self._queue.clear()
+            self._pending = 0
+        self.written = 0
+        self.dropped = 0
+
+    def _take_batch(self) -> List[List[Dict[str, Any]]]:
+        # Grupuri întregi, până la batch_size rânduri (cel puțin un grup)
+        batch = []
+        count = 0
+        while self._queue and (not batch or count + len(self._queue[0]) <= self.batch_size):
+            group = self._queue.popleft()
+            batch.append(group)
+            count += len(group)
+        self._pending -= count
+        if batch:
+            self._cond.notify_all()  # producătorii blocați au loc acum
+        return batch
+
+    def _requeue(self, batch: List[List[Dict[str, Any]]]) -> None:
+        with self._cond:
+            self._queue.extendleft(reversed(batch))
+            self._pending += sum(len(group) for group in batch)
+
+    def _write(self, batch: List[List[Dict[str, Any]]]) -> None:
+        rows = [row for group in batch for row in group]
+        with self._write_lock:
+            db = self.session_factory()
+            try:
+                db.execute(insert(FondChange), rows)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+        self.written += len(rows)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._stopping and self._pending < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+                if self._stopping:
+                    return  # restul e scris de stop() prin flush()
+                batch = self._take_batch()
+            if not batch:
+                continue
+            try:
+                self._write(batch)
+            except Exception:
+                # Lotul rămâne în coadă și se reîncearcă la următorul interval
+                logger.exception(f"Change log write failed, retrying {sum(len(g) for g in batch)} rows")
+                self._requeue(batch)
+                with self._cond:
+                    self._cond.wait(self.flush_interval)
+
+
+change_log = ChangeLogWriter(
+    max_queue=settings.CHANGE_LOG_QUEUE_SIZE,
+    batch_size=settings.CHANGE_LOG_BATCH_SIZE,
+    flush_interval=settings.CHANGE_LOG_FLUSH_SECONDS,
+    overflow_policy=settings.CHANGE_LOG_OVERFLOW_POLICY,
+    block_seconds=settings.CHANGE_LOG_BLOCK_SECONDS,
+)
+
+# Procesele fără lifespan (scripturi, CLI) golesc coada la ieșire
+atexit.register(change_log.stop)
@@ -0,0 +1,140 @@
+# app/services/company_names.py - Shared company/holder name normalization
+"""
+Normalizarea numelor de firme folosită de auto-assignment și de matching-ul
+owner-ilor. Pattern-urile sunt precompilate, diacriticele sunt eliminate
+(ă, â, î, ș, ț -> a, a, i, s, t) și rezultatele sunt memorate într-un cache
+LRU limitat, cheia fiind numele brut - fiecare nume distinct se normalizează o singură dată.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Tuple
+
+from app.core.config import settings
+
+# Forme juridice eliminate la comparare
+LEGAL_FORMS = frozenset({"sc", "sa", "srl", "sra", "ltd", "llc", "inc", "corp", "corporation"})
+
+_LEGAL_FORMS_ALT = "|".join(sorted(LEGAL_FORMS, key=len, reverse=True))
+_LEADING_LEGAL_FORM_RE = re.compile(rf"^({_LEGAL_FORMS_ALT})\s+")
+_TRAILING_LEGAL_FORM_RE = re.compile(rf"\s+({_LEGAL_FORMS_ALT})$")
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Diacriticele românești (inclusiv variantele cu sedilă) - cazul frecvent, fără unicodedata
+_ROMANIAN_FOLD = str.maketrans({
+    "ă": "a", "â": "a", "î": "i", "ș": "s", "ş": "s", "ț": "t", "ţ": "t",
+    "Ă": "A", "Â": "A", "Î": "I", "Ș": "S", "Ş": "S", "Ț": "T", "Ţ": "T",
+})
+
+
+def fold_diacritics(text: str) -> str:
+    """Elimină diacriticele: întâi tabela românească, apoi NFKD pentru restul"""
+    folded = text.translate(_ROMANIAN_FOLD)
+    if folded.isascii():
+        return folded
+    decomposed = unicodedata.normalize("NFKD", folded)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+@lru_cache(maxsize=settings.COMPANY_NAME_CACHE_SIZE)
+def normalize_company_name(name: str) -> str:
+    """
+    Forma canonică pentru similaritate: lowercase, fără diacritice, fără forma
+    juridică de la început/sfârșit, fără punctuație, spații simple.
+    """
+    if not name:
+        return ""
+
+    normalized = fold_diacritics(name.lower().strip())
+    normalized = _LEADING_LEGAL_FORM_RE.sub("", normalized)
+    normalized = _TRAILING_LEGAL_FORM_RE.sub("", normalized)
+    normalized = _PUNCTUATION_RE.sub("", normalized)
+    return _WHITESPACE_RE.sub(" ", normalized).strip()
+
+
+@lru_cache(maxsize=settings.COMPANY_NAME_CACHE_SIZE)
+def match_key(name: str) -> str:
+    """Cheia pentru potrivire exactă/subșir: lowercase, fără diacritice, spații simple"""
+    if not name:
+        return ""
+    return _WHITESPACE_RE.sub(" ", fold_diacritics(name.lower())).strip()
+
+
+@lru_cache(maxsize=settings.COMPANY_NAME_CACHE_SIZE)
+def word_set(normalized: str) -> FrozenSet[str]:
+    """Mulțimea de cuvinte a unui nume deja normalizat"""
+    return frozenset(normalized.split())
+
+
+@lru_cache(maxsize=settings.COMPANY_NAME_CACHE_SIZE)
+def significant_words(name: str) -> FrozenSet[str]:
+    """
+    Cuvintele unui nume fără formele juridice nepunctate (oriunde apar).
+    Punctuația se păstrează intenționat: "S.R.L." rămâne un cuvânt, ca în matching-ul
+    istoric - altfel mulțimile devin prea mici și un singur cuvânt comun (orașul) ajunge potrivire.
+    """
+    if not name:
+        return frozenset()
+    return frozenset(word for word in match_key(name).split() if word not in LEGAL_FORMS)
+
+
+def stored_key(name: Any) -> Any:
+    """Valoarea coloanelor *_normalized: match_key sau NULL pentru nume gol"""
+    return match_key(name or "") or None
+
+
+# model -> [(coloana sursă, coloana *_normalized)], înregistrate de sync_key_on_update
+_SYNCED_KEYS: Dict[type, List[Tuple[str, str]]] = {}
+
+
+def _add_keys(model, values: Dict[str, Any]) -> None:
+    for source, target in _SYNCED_KEYS.get(model, ()):
+        if source in values and target not in values:
+            values[target] = stored_key(values[source])
+
+
+def with_stored_keys(model, values: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Valorile pentru update(Model).values(**...) completate cu cheile *_normalized.
+    Obligatoriu pentru UPDATE-urile cu .values() care schimbă un nume: hook-ul
+    de sesiune vede doar parametrii de execuție, nu clauza SET a statement-ului.
+    """
+    values = dict(values)
+    _add_keys(model, values)
+    return values
+
+
+def sync_key_on_update(model, source: str, target: str) -> None:
+    """
+    Menține `target` = stored_key(`source`) și la UPDATE-urile bulk executate prin
+    sesiune cu parametri (session.execute(update(Model), [{...}, ...]) - UPDATE după
+    primary key), pe care @validates nu le vede: fiecare rând primește cheia.
+    Pentru .values() apelantul folosește with_stored_keys; SQL-ul executat direct
+    pe conexiune rămâne tot responsabilitatea apelantului.
+    """
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    first = model not in _SYNCED_KEYS
+    _SYNCED_KEYS.setdefault(model, []).append((source, target))
+    if not first:
+        return
+
+    @event.listens_for(Session, "do_orm_execute")
+    def _sync_bulk_update(orm_execute_state):
+        mapper = orm_execute_state.bind_mapper
+        if not orm_execute_state.is_update or mapper is None or mapper.class_ is not model:
+            return
+
+        parameters = orm_execute_state.parameters
+        for row in parameters if isinstance(parameters, list) else [parameters or {}]:
+            _add_keys(model, row)
+
+
+def clear_caches() -> None:
+    """Golește cache-urile (teste / după reîncărcarea în masă a datelor)"""
+    normalize_company_name.cache_clear()
+    match_key.cache_clear()
+    word_set.cache_clear()
+    significant_words.cache_clear()
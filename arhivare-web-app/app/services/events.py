@@ -0,0 +1,372 @@
+# app/services/events.py - Fond change events pushed to dashboards over SSE
+"""
+Dashboard-urile primesc modificările prin GET /events/stream (Server-Sent
+Events) și reîncarcă doar când se schimbă ceva - un dashboard deschis, dar
+inactiv, nu mai generează query-uri.
+
+Surse de evenimente (evenimente SQLAlchemy, ca în services.name_suggestions):
+  - insert / update / delete pe Fond -> fond_created / fond_updated /
+    fond_assigned (owner_id schimbat) / fond_deleted;
+  - INSERT/UPDATE/DELETE bulk pe Fond -> doar stats_changed (rândurile nu se cunosc);
+  - fiecare commit cu modificări adaugă un stats_changed pentru aceiași destinatari.
+Evenimentele se adună în session.info și pleacă doar după commit; la rollback
+se aruncă.
+
+Destinatari: admin și audit primesc tot; un client primește doar evenimentele
+fondurilor pe care le deține (la reasignare: vechiul și noul owner).
+
+Mai mulți workeri: cu PostgreSQL (și EVENTS_PG_NOTIFY), evenimentele se trimit
+cu pg_notify în tranzacția care le produce, iar fiecare worker le primește
+printr-o conexiune LISTEN dedicată și le distribuie local. Fără PostgreSQL
+(sau fără psycopg2) distribuția rămâne în proces.
+"""
+import asyncio
+import itertools
+import json
+import logging
+import select
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional
+
+from sqlalchemy import event, func, inspect, select as sql_select
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.fond import Fond
+
+logger = logging.getLogger(__name__)
+
+_SESSION_KEY = "fond_events"
+_PG_PAYLOAD_LIMIT = 7900  # NOTIFY acceptă payload-uri sub 8000 de octeți
+
+FOND_CREATED = "fond_created"
+FOND_UPDATED = "fond_updated"
+FOND_ASSIGNED = "fond_assigned"
+FOND_DELETED = "fond_deleted"
+STATS_CHANGED = "stats_changed"
+RESYNC = "resync"
+
+
+@dataclass(frozen=True)
+class FondEvent:
+    """Un eveniment și clienții care îl pot vedea (`owners=None`: toți)"""
+    type: str
+    data: Dict[str, Any] = field(default_factory=dict)
+    owners: Optional[FrozenSet[int]] = frozenset()
+
+    def to_dict(self) -> Dict[str, Any]:
+        owners = None if self.owners is None else sorted(self.owners)
+        return {"type": self.type, "data": self.data, "owners": owners}
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "FondEvent":
+        owners = payload.get("owners")
+        return cls(payload["type"], payload.get("data") or {}, None if owners is None else frozenset(owners))
+
+
+def with_stats(events: List[FondEvent]) -> List[FondEvent]:
+    """Adaugă un singur stats_changed, adresat tuturor celor care văd cel puțin un eveniment"""
+    if not events or any(e.type == STATS_CHANGED and e.owners is None for e in events):
+        return events
+    owners = frozenset().union(*(e.owners for e in events))
+    return events + [FondEvent(STATS_CHANGED, {}, owners)]
+
+
+class Subscription:
+    """Coada unui stream SSE; trăiește pe event loop-ul care a creat-o"""
+
+    def __init__(self, role: str, user_id: int, loop: asyncio.AbstractEventLoop, max_queue: int):
+        self.role = role
+        self.user_id = user_id
+        self.loop = loop
+        self.max_queue = max_queue
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.stats_pending = False
+
+    def accepts(self, fond_event: FondEvent) -> bool:
+        if self.role in ("admin", "audit") or fond_event.owners is None:
+            return True
+        return self.role == "client" and self.user_id in fond_event.owners
+
+    def deliver(self, events: List[Any]) -> None:
+        # Rulează pe loop-ul abonatului (call_soon_threadsafe)
+        for item in events:
+            if item.type == STATS_CHANGED:
+                # Statisticile se recitesc oricum complet: unul singur în așteptare ajunge
+                if self.stats_pending:
+                    continue
+                self.stats_pending = True
+            if self.queue.qsize() >= self.max_queue:
+                # Clientul nu ține pasul: renunțăm la detalii, dashboard-ul reîncarcă tot
+                while not self.queue.empty():
+                    self.queue.get_nowait()
+                self.stats_pending = False
+                self.queue.put_nowait(FondEvent(RESYNC))
+                return
+            self.queue.put_nowait(item)
+
+    async def next_event(self, timeout: float) -> Optional[FondEvent]:
+        """Următorul eveniment, sau None după `timeout` secunde fără nimic"""
+        try:
+            item = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if item.type == STATS_CHANGED:
+            self.stats_pending = False
+        return item
+
+
+class EventBroadcaster:
+    """Abonații stream-urilor SSE din acest proces; publish() e thread-safe"""
+
+    def __init__(self, max_queue: int, max_subscribers: int):
+        self.max_queue = max_queue
+        self.max_subscribers = max_subscribers
+        self.published = 0
+        self.pg_fanout = False  # True cât timp un PostgresEventListener livrează evenimentele
+        self._subscribers: set = set()
+        self._lock = threading.Lock()
+        self._sequence = itertools.count(1)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, role: str, user_id: int) -> Optional[Subscription]:
+        """Abonament nou pe loop-ul curent; None dacă s-a atins EVENTS_MAX_SUBSCRIBERS"""
+        subscription = Subscription(role, user_id, asyncio.get_running_loop(), self.max_queue)
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                return None
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def next_id(self) -> int:
+        return next(self._sequence)
+
+    def publish(self, events: Iterable[FondEvent]) -> None:
+        events = list(events)
+        if not events:
+            return
+        self.published += len(events)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            selected = [e for e in events if subscription.accepts(e)]
+            if not selected:
+                continue
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, selected)
+            except RuntimeError:
+                # Loop-ul abonatului s-a închis (shutdown) fără unsubscribe
+                self.unsubscribe(subscription)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._subscribers.clear()
+        self.published = 0
+
+
+fond_events = EventBroadcaster(
+    max_queue=settings.EVENTS_QUEUE_SIZE,
+    max_subscribers=settings.EVENTS_MAX_SUBSCRIBERS,
+)
+
+
+# === PostgreSQL LISTEN/NOTIFY ===
+def _notify_batches(events: List[FondEvent]) -> List[str]:
+    """Payload-uri JSON sub limita NOTIFY; un eveniment prea mare devine stats_changed pentru toți"""
+    batches, current, size = [], [], 2
+    for fond_event in events:
+        item = json.dumps(fond_event.to_dict(), separators=(",", ":"))
+        if len(item) > _PG_PAYLOAD_LIMIT:
+            item = json.dumps(FondEvent(STATS_CHANGED, {}, None).to_dict(), separators=(",", ":"))
+        if current and size + len(item) + 1 > _PG_PAYLOAD_LIMIT:
+            batches.append("[" + ",".join(current) + "]")
+            current, size = [], 2
+        current.append(item)
+        size += len(item) + 1
+    if current:
+        batches.append("[" + ",".join(current) + "]")
+    return batches
+
+
+class PostgresEventListener:
+    """Conexiune LISTEN dedicată (psycopg2, autocommit) într-un thread; reconectare cu backoff"""
+
+    def __init__(self, database_url: str, channel: str, broadcaster: EventBroadcaster):
+        self.database_url = database_url
+        self.channel = channel
+        self.broadcaster = broadcaster
+        self.received = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._connected = threading.Event()
+
+    def start(self, timeout: float = 5) -> bool:
+        """Pornește ascultarea; False dacă PostgreSQL/psycopg2 nu sunt disponibile"""
+        if make_url(self.database_url).get_backend_name() != "postgresql":
+            return False
+        try:
+            import psycopg2  # noqa: F401
+        except ImportError:
+            logger.warning("psycopg2 not installed, dashboard events stay in-process")
+            return False
+        if not self.channel.isidentifier():
+            logger.warning(f"Invalid EVENTS_PG_CHANNEL {self.channel!r}, dashboard events stay in-process")
+            return False
+
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="fond-events-listener", daemon=True)
+        self._thread.start()
+        if not self._connected.wait(timeout):
+            logger.warning("Event listener not connected yet, notifications start once it is")
+        self.broadcaster.pg_fanout = True
+        return True
+
+    def stop(self, timeout: float = 5) -> None:
+        self.broadcaster.pg_fanout = False
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _dsn(self) -> str:
+        url = make_url(self.database_url).set(drivername="postgresql")
+        return url.render_as_string(hide_password=False)
+
+    def _run(self) -> None:
+        import psycopg2
+
+        delay = 0.5
+        while not self._stopping.is_set():
+            connection = None
+            try:
+                connection = psycopg2.connect(self._dsn())
+                connection.autocommit = True
+                with connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self.channel}")
+                self._connected.set()
+                delay = 0.5
+                logger.info(f"Listening for dashboard events on channel {self.channel}")
+                while not self._stopping.is_set():
+                    readable, _, _ = select.select([connection], [], [], 1.0)
+                    if not readable:
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        self._dispatch(connection.notifies.pop(0).payload)
+            except Exception as e:
+                logger.warning(f"Event listener connection lost: {e}, retrying in {delay:.1f}s")
+                if self._connected.is_set():
+                    # Evenimentele din timpul deconectării se pierd: toți reîncarcă
+                    self._connected.clear()
+                    self.broadcaster.publish([FondEvent(RESYNC, {}, None)])
+                self._stopping.wait(delay)
+                delay = min(delay * 2, 30)
+            finally:
+                if connection is not None:
+                    connection.close()
+
+    def _dispatch(self, payload: str) -> None:
+        try:
+            events = [FondEvent.from_dict(item) for item in json.loads(payload)]
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring malformed event notification: {e}")
+            return
+        self.received += len(events)
+        self.broadcaster.publish(events)
+
+
+event_listener = PostgresEventListener(settings.DATABASE_URL, settings.EVENTS_PG_CHANNEL, fond_events)
+
+
+# === Colectare la scriere ===
+def _owners(*owner_ids: Optional[int]) -> FrozenSet[int]:
+    return frozenset(owner_id for owner_id in owner_ids if owner_id is not None)
+
+
+def _queue(session: Optional[Session], fond_event: FondEvent) -> None:
+    if session is not None:
+        session.info.setdefault(_SESSION_KEY, []).append(fond_event)
+
+
+@event.listens_for(Fond, "after_insert")
+def _fond_inserted(mapper, connection, target):
+    data = {"fond_id": target.id, "owner_id": target.owner_id, "active": target.active}
+    _queue(inspect(target).session, FondEvent(FOND_CREATED, data, _owners(target.owner_id)))
+
+
+@event.listens_for(Fond, "after_delete")
+def _fond_deleted(mapper, connection, target):
+    data = {"fond_id": target.id, "owner_id": target.owner_id}
+    _queue(inspect(target).session, FondEvent(FOND_DELETED, data, _owners(target.owner_id)))
+
+
+@event.listens_for(Fond, "after_update")
+def _fond_updated(mapper, connection, target):
+    state = inspect(target)
+    owner_history = state.attrs.owner_id.history
+    if owner_history.has_changes():
+        old_owner = owner_history.deleted[0] if owner_history.deleted else None
+        data = {"fond_id": target.id, "owner_id": target.owner_id, "previous_owner_id": old_owner}
+        _queue(state.session, FondEvent(FOND_ASSIGNED, data, _owners(old_owner, target.owner_id)))
+        return
+
+    # after_update rulează și pentru obiecte "dirty" fără modificări reale
+    changed = [attr.key for attr in mapper.column_attrs if state.attrs[attr.key].history.has_changes()]
+    if changed:
+        data = {"fond_id": target.id, "owner_id": target.owner_id, "active": target.active, "fields": changed}
+        _queue(state.session, FondEvent(FOND_UPDATED, data, _owners(target.owner_id)))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _fond_bulk_statement(orm_execute_state):
+    is_write = orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete
+    mapper = orm_execute_state.bind_mapper
+    if is_write and mapper is not None and mapper.class_ is Fond:
+        _queue(orm_execute_state.session, FondEvent(STATS_CHANGED, {"bulk": True}, None))
+
+
+def _notify(session: Session) -> None:
+    # NOTIFY în aceeași tranzacție: livrat doar dacă tranzacția e comisă
+    events = session.info.pop(_SESSION_KEY, None)
+    if not events:
+        return
+    for payload in _notify_batches(with_stats(events)):
+        session.connection().execute(sql_select(func.pg_notify(settings.EVENTS_PG_CHANNEL, payload)))
+
+
+def _uses_notify(session: Session) -> bool:
+    return fond_events.pg_fanout and session.get_bind().dialect.name == "postgresql"
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _session_flushed(session, flush_context):
+    if session.info.get(_SESSION_KEY) and _uses_notify(session):
+        _notify(session)
+
+
+@event.listens_for(Session, "before_commit")
+def _session_committing(session):
+    # Ce a rămas după ultimul flush: statement-urile bulk (commit-ul nu mai face flush pentru ele)
+    if session.info.get(_SESSION_KEY) and _uses_notify(session):
+        _notify(session)
+
+
+@event.listens_for(Session, "after_commit")
+def _session_committed(session):
+    events = session.info.pop(_SESSION_KEY, None)
+    if events:
+        fond_events.publish(with_stats(events))
+
+
+@event.listens_for(Session, "after_rollback")
+def _session_rolled_back(session):
+    session.info.pop(_SESSION_KEY, None)
@@ -0,0 +1,144 @@
+# app/services/health.py - Background database probe for readiness checks
+"""
+Probele de health sunt apelate foarte des (Docker healthcheck, compose,
+orchestrator). Ele nu trebuie să deschidă o conexiune la fiecare request:
+
+  - un task de fundal rulează `SELECT 1` și citește revizia Alembic curentă la
+    fiecare HEALTH_PROBE_INTERVAL_SECONDS, într-un thread (fără a bloca event loop-ul);
+  - /health/ready întoarce ultimul rezultat; doar dacă acesta lipsește sau e mai
+    vechi de 3 intervale (task-ul nu rulează, ex. în teste) proba e rulată inline;
+  - statisticile pool-ului sunt citite din memorie la fiecare request.
+"""
+import asyncio
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.database import engine
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_DIR = Path(__file__).resolve().parents[2] / "alembic"
+
+
+def pool_status(engine: Engine) -> Dict[str, Any]:
+    """Conexiuni ocupate vs. capacitate (size + max_overflow); fără I/O"""
+    pool = engine.pool
+    status = {"class": type(pool).__name__}
+    if not hasattr(pool, "checkedout"):
+        return status
+
+    size = pool.size()
+    capacity = size + max(getattr(pool, "_max_overflow", 0), 0)
+    checked_out = pool.checkedout()
+    status.update({
+        "size": size,
+        "checked_out": checked_out,
+        "overflow": max(pool.overflow(), 0),
+        "capacity": capacity,
+        "saturation": round(checked_out / capacity, 3) if capacity else None,
+    })
+    return status
+
+
+def _script_heads() -> Optional[List[str]]:
+    try:
+        from alembic.script import ScriptDirectory
+        return sorted(ScriptDirectory(str(ALEMBIC_DIR)).get_heads())
+    except Exception as e:
+        logger.warning(f"Could not read Alembic heads: {e}")
+        return None
+
+
+class DatabaseProbe:
+    """Ultimul rezultat al probei de DB, reîmprospătat în fundal"""
+
+    def __init__(self, engine: Engine, interval: float):
+        self.engine = engine
+        self.interval = interval
+        self._result: Optional[Dict[str, Any]] = None
+        self._checked_at: Optional[float] = None
+        self._script_heads: Optional[List[str]] = None
+        self._heads_loaded = False
+        self._task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        self._result = None
+        self._checked_at = None
+
+    def run(self) -> Dict[str, Any]:
+        """Rulează proba (blocant) și memorează rezultatul"""
+        if not self._heads_loaded:
+            self._script_heads = _script_heads()
+            self._heads_loaded = True
+
+        started = time.perf_counter()
+        result: Dict[str, Any] = {"ok": True, "error": None}
+        current_heads = None
+        try:
+            with self.engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+                current_heads = self._current_heads(connection)
+        except Exception as e:
+            result = {"ok": False, "error": str(e)}
+            logger.warning(f"Database probe failed: {e}")
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        result["migrations"] = {
+            "current": current_heads,
+            "head": self._script_heads,
+            "up_to_date": current_heads is not None and current_heads == self._script_heads,
+        }
+
+        with self._lock:
+            self._result = result
+            self._checked_at = time.monotonic()
+        return result
+
+    @staticmethod
+    def _current_heads(connection) -> Optional[List[str]]:
+        try:
+            from alembic.runtime.migration import MigrationContext
+            return sorted(MigrationContext.configure(connection).get_current_heads())
+        except Exception as e:
+            logger.debug(f"Could not read current Alembic revision: {e}")
+            return None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Ultimul rezultat, cu vârsta lui; rulează proba inline doar dacă lipsește sau e expirat"""
+        with self._lock:
+            result, checked_at = self._result, self._checked_at
+        if result is None or time.monotonic() - checked_at > 3 * self.interval:
+            result = self.run()
+            checked_at = self._checked_at
+        return {**result, "age_seconds": round(time.monotonic() - checked_at, 3)}
+
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.run)
+            except Exception as e:  # proba nu trebuie să oprească task-ul
+                logger.error(f"Database probe crashed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+database_probe = DatabaseProbe(engine, interval=settings.HEALTH_PROBE_INTERVAL_SECONDS)
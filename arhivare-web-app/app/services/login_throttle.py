@@ -0,0 +1,221 @@
+# app/services/login_throttle.py - Token-bucket throttling for /auth/login
+"""
+Fiecare încercare de login costă un bcrypt verify (~100ms CPU). Înainte de orice
+lucru cu baza de date sau hashing, o încercare trebuie să treacă prin:
+
+  - un token bucket per IP (LOGIN_RATE_PER_IP / LOGIN_BURST_PER_IP);
+  - un token bucket per username (LOGIN_RATE_PER_USERNAME / LOGIN_BURST_PER_USERNAME);
+  - lockout-ul username-ului: după LOGIN_LOCKOUT_THRESHOLD eșecuri consecutive
+    contul e blocat LOGIN_LOCKOUT_BASE_SECONDS, dublat la fiecare eșec următor,
+    până la LOGIN_LOCKOUT_MAX_SECONDS. Un login reușit resetează contorul.
+
+Starea stă în memorie (per worker) sau, cu LOGIN_THROTTLE_BACKEND=redis, într-un
+Redis partajat de toți workerii (pachetul `redis` este opțional).
+"""
+import logging
+import math
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryThrottleBackend:
+    """Stare per proces: bucket-uri, contoare de eșecuri și lock-uri, în dict-uri limitate"""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        # key -> (tokens, updated, rate, burst): bucket-urile de IP și de username au parametri diferiți
+        self._buckets: Dict[str, Tuple[float, float, float, int]] = {}
+        self._failures: Dict[str, Tuple[int, float]] = {}
+        self._locks: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: float, burst: int, now: float) -> float:
+        """Consumă un token; întoarce 0 dacă a reușit, altfel secundele până la următorul token"""
+        with self._lock:
+            tokens, updated, _, _ = self._buckets.get(key, (float(burst), now, rate, burst))
+            tokens = min(float(burst), tokens + (now - updated) * rate)
+            retry_after = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                retry_after = (1 - tokens) / rate
+            if len(self._buckets) >= self.max_keys and key not in self._buckets:
+                self._evict_full_buckets(now)
+            self._buckets[key] = (tokens, now, rate, burst)
+            return retry_after
+
+    def _evict_full_buckets(self, now: float) -> None:
+        # Un bucket reumplut e echivalent cu lipsa lui - protecție la IP spraying
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items()
+            if bucket[0] + (now - bucket[1]) * bucket[2] < bucket[3]
+        }
+        if len(self._buckets) >= self.max_keys:
+            self._buckets.clear()
+
+    def add_failure(self, key: str, window: float, now: float) -> int:
+        with self._lock:
+            count, expires = self._failures.get(key, (0, 0.0))
+            count = count + 1 if expires > now else 1
+            if len(self._failures) >= self.max_keys and key not in self._failures:
+                self._failures = {k: v for k, v in self._failures.items() if v[1] > now}
+            self._failures[key] = (count, now + window)
+            return count
+
+    def lock(self, key: str, seconds: float, now: float) -> None:
+        with self._lock:
+            if len(self._locks) >= self.max_keys and key not in self._locks:
+                self._locks = {k: until for k, until in self._locks.items() if until > now}
+                if len(self._locks) >= self.max_keys:
+                    # Tot plin: renunțăm la lock-urile care expiră primele
+                    keep = sorted(self._locks.items(), key=lambda item: item[1])[len(self._locks) // 2:]
+                    self._locks = dict(keep)
+            self._locks[key] = now + seconds
+
+    def locked_for(self, key: str, now: float) -> float:
+        with self._lock:
+            until = self._locks.get(key)
+            if until is None:
+                return 0.0
+            if until <= now:
+                del self._locks[key]
+                return 0.0
+            return until - now
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            self._failures.pop(key, None)
+            self._locks.pop(key, None)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+            self._failures.clear()
+            self._locks.clear()
+
+
+_TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local retry = 0
+if tokens >= 1 then tokens = tokens - 1 else retry = (1 - tokens) / rate end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000))
+return tostring(retry)
+"""
+
+
+class RedisThrottleBackend:
+    """Aceeași interfață, cu starea în Redis (bucket-ul e actualizat atomic printr-un script Lua)"""
+
+    def __init__(self, url: str, prefix: str = "login-throttle:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("LOGIN_THROTTLE_BACKEND=redis requires the 'redis' package") from e
+        self.prefix = prefix
+        self._redis = redis.Redis.from_url(url)
+        self._take = self._redis.register_script(_TAKE_SCRIPT)
+
+    def take(self, key: str, rate: float, burst: int, now: float) -> float:
+        return float(self._take(keys=[f"{self.prefix}bucket:{key}"], args=[rate, burst, now]))
+
+    def add_failure(self, key: str, window: float, now: float) -> int:
+        failures_key = f"{self.prefix}failures:{key}"
+        pipeline = self._redis.pipeline()
+        pipeline.incr(failures_key)
+        pipeline.expire(failures_key, math.ceil(window))
+        count, _ = pipeline.execute()
+        return int(count)
+
+    def lock(self, key: str, seconds: float, now: float) -> None:
+        self._redis.set(f"{self.prefix}lock:{key}", 1, px=max(1, int(seconds * 1000)))
+
+    def locked_for(self, key: str, now: float) -> float:
+        remaining = self._redis.pttl(f"{self.prefix}lock:{key}")
+        return remaining / 1000 if remaining and remaining > 0 else 0.0
+
+    def clear(self, key: str) -> None:
+        self._redis.delete(f"{self.prefix}failures:{key}", f"{self.prefix}lock:{key}")
+
+    def reset(self) -> None:
+        keys = list(self._redis.scan_iter(f"{self.prefix}*"))
+        if keys:
+            self._redis.delete(*keys)
+
+
+class LoginThrottle:
+    """Politica de throttling; `check` rulează înainte de orice query sau bcrypt"""
+
+    def __init__(self, backend=None):
+        self._backend = backend
+
+    @property
+    def backend(self):
+        # Creat la prima utilizare - importul modulului nu deschide conexiuni
+        if self._backend is None:
+            if settings.LOGIN_THROTTLE_BACKEND == "redis":
+                self._backend = RedisThrottleBackend(settings.LOGIN_THROTTLE_REDIS_URL)
+            else:
+                self._backend = MemoryThrottleBackend()
+        return self._backend
+
+    @staticmethod
+    def _username_key(username: str) -> str:
+        return f"user:{username.strip().lower()}"
+
+    def check(self, username: str, ip: Optional[str]) -> float:
+        """0 dacă încercarea e permisă, altfel Retry-After în secunde"""
+        if not settings.LOGIN_THROTTLE_ENABLED:
+            return 0.0
+        now = time.time()
+        user_key = self._username_key(username)
+
+        locked = self.backend.locked_for(user_key, now)
+        if locked:
+            return locked
+
+        waits: List[float] = []
+        if ip:
+            waits.append(self.backend.take(
+                f"ip:{ip}", settings.LOGIN_RATE_PER_IP / 60, settings.LOGIN_BURST_PER_IP, now
+            ))
+        waits.append(self.backend.take(
+            user_key, settings.LOGIN_RATE_PER_USERNAME / 60, settings.LOGIN_BURST_PER_USERNAME, now
+        ))
+        return max(waits)
+
+    def record_failure(self, username: str) -> None:
+        if not settings.LOGIN_THROTTLE_ENABLED:
+            return
+        now = time.time()
+        user_key = self._username_key(username)
+        failures = self.backend.add_failure(user_key, settings.LOGIN_LOCKOUT_MAX_SECONDS, now)
+        if failures >= settings.LOGIN_LOCKOUT_THRESHOLD:
+            seconds = min(
+                settings.LOGIN_LOCKOUT_MAX_SECONDS,
+                settings.LOGIN_LOCKOUT_BASE_SECONDS * 2 ** (failures - settings.LOGIN_LOCKOUT_THRESHOLD)
+            )
+            self.backend.lock(user_key, seconds, now)
+            logger.warning(f"Login locked for '{username}' for {seconds}s after {failures} failures")
+
+    def record_success(self, username: str) -> None:
+        if settings.LOGIN_THROTTLE_ENABLED:
+            self.backend.clear(self._username_key(username))
+
+    def reset(self) -> None:
+        if self._backend is not None:
+            self._backend.reset()
+
+
+login_throttle = LoginThrottle()
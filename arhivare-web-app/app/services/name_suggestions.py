@@ -0,0 +1,199 @@
+# app/services/name_suggestions.py - In-memory prefix index for search typeahead
+"""
+Index sortat, în memorie, cu numele distincte de companii și deținători ale
+fondurilor active. Un prefix se caută cu bisect (O(log n + k)), fără să
+atingă baza de date.
+
+Reîmprospătare:
+  - orice commit care inserează/șterge un fond sau îi schimbă company_name,
+    holder_name ori active marchează indexul ca "dirty" (evenimente SQLAlchemy),
+    la fel orice INSERT/UPDATE/DELETE bulk pe Fond executat prin sesiune;
+  - prima căutare după ce indexul e dirty, sau mai vechi de
+    SEARCH_SUGGEST_TTL_SECONDS (limita de staleness pentru scrierile făcute de
+    alte procese/workeri sau prin SQL executat direct pe conexiune), pornește un
+    rebuild într-un thread de fundal, cu propria sesiune pe primar; până se termină,
+    request-urile sunt servite din indexul vechi, fără să aștepte. Doar prima
+    construcție (warmup la startup) e sincronă.
+"""
+import logging
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.fond import Fond
+from app.services.company_names import LEGAL_FORMS, match_key
+
+logger = logging.getLogger(__name__)
+
+_TRACKED_ATTRIBUTES = ("company_name", "holder_name", "active")
+_SESSION_FLAG = "name_suggestions_dirty"
+
+
+def _lookup_keys(name: str, key: Optional[str] = None) -> List[str]:
+    """Cheile sub care e găsit un nume: întregul nume și, dacă începe cu o formă juridică, restul"""
+    key = key or match_key(name)
+    if not key:
+        return []
+    keys = [key]
+    first, _, rest = key.partition(" ")
+    if rest and first.replace(".", "") in LEGAL_FORMS:
+        keys.append(rest)
+    return keys
+
+
+class NameSuggestionIndex:
+    """Lista sortată de (cheie, nume afișat, tip) cu lookup după prefix"""
+
+    def __init__(self, ttl_seconds: float, session_factory: Callable = SessionLocal):
+        self.ttl_seconds = ttl_seconds
+        self.session_factory = session_factory
+        self._keys: List[str] = []
+        self._entries: List[Tuple[str, str]] = []
+        self._built_at: Optional[float] = None
+        self._dirty = True
+        self._lock = threading.Lock()
+        self._rebuild_thread: Optional[threading.Thread] = None
+
+    def invalidate(self) -> None:
+        self._dirty = True
+
+    def reset(self) -> None:
+        """Golește indexul (teste): următoarea căutare îl construiește sincron"""
+        self.wait_for_rebuild()
+        self._keys, self._entries = [], []
+        self._built_at = None
+        self._dirty = True
+
+    def is_stale(self) -> bool:
+        return (
+            self._dirty
+            or self._built_at is None
+            or time.monotonic() - self._built_at > self.ttl_seconds
+        )
+
+    def rebuild(self, db: Session) -> None:
+        # Flag-ul se resetează înainte de citire: un commit concurent o marchează din nou
+        self._dirty = False
+        # Cheia deținătorului vine din coloana persistată (NULL doar pentru rânduri nemigrate)
+        rows = db.query(Fond.company_name, Fond.holder_name, Fond.holder_name_normalized).filter(
+            Fond.active == True
+        ).all()
+
+        seen = set()
+        pairs = []
+        for company_name, holder_name, holder_key in rows:
+            for name, kind, key in ((company_name, "company", None), (holder_name, "holder", holder_key)):
+                if not name or (name, kind) in seen:
+                    continue
+                seen.add((name, kind))
+                for key in _lookup_keys(name, key):
+                    pairs.append((key, name, kind))
+        pairs.sort()
+
+        self._keys = [key for key, _, _ in pairs]
+        self._entries = [(name, kind) for _, name, kind in pairs]
+        self._built_at = time.monotonic()
+        logger.debug(f"Name suggestion index rebuilt: {len(seen)} names, {len(pairs)} keys")
+
+    def ensure_fresh(self, db: Session) -> None:
+        """Nu blochează decât la prima construcție; un index vechi se reconstruiește în fundal"""
+        if not self.is_stale():
+            return
+        if self._built_at is not None:
+            self._start_background_rebuild()
+            return
+        with self._lock:
+            if self._built_at is None:
+                self.rebuild(db)
+
+    def _start_background_rebuild(self) -> None:
+        with self._lock:
+            if self._rebuild_thread is not None and self._rebuild_thread.is_alive():
+                return
+            self._rebuild_thread = threading.Thread(
+                target=self._rebuild_in_background, name="name-suggestions-rebuild", daemon=True
+            )
+            self._rebuild_thread.start()
+
+    def _rebuild_in_background(self) -> None:
+        try:
+            with self.session_factory() as db:
+                self.rebuild(db)
+        except Exception:
+            self._dirty = True  # se reîncearcă la următoarea căutare
+            logger.exception("Name suggestion index rebuild failed, serving the previous index")
+
+    def wait_for_rebuild(self, timeout: Optional[float] = None) -> None:
+        """Așteaptă rebuild-ul de fundal în curs, dacă există"""
+        thread = self._rebuild_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict[str, str]]:
+        """Primele `limit` nume distincte (ordine alfabetică a cheii) care încep cu prefixul"""
+        prefix_key = match_key(prefix)
+        if not prefix_key:
+            return []
+
+        keys, entries = self._keys, self._entries  # snapshot consistent față de un rebuild concurent
+        results = []
+        seen = set()
+        position = bisect_left(keys, prefix_key)
+        while position < len(keys) and keys[position].startswith(prefix_key):
+            entry = entries[position]
+            if entry not in seen:
+                seen.add(entry)
+                results.append({"name": entry[0], "type": entry[1]})
+                if len(results) >= limit:
+                    break
+            position += 1
+        return results
+
+
+suggestion_index = NameSuggestionIndex(ttl_seconds=settings.SEARCH_SUGGEST_TTL_SECONDS)
+
+
+# === Invalidare la scriere ===
+def _flag_session(target: Fond) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info[_SESSION_FLAG] = True
+
+
+@event.listens_for(Fond, "after_insert")
+@event.listens_for(Fond, "after_delete")
+def _fond_inserted_or_deleted(mapper, connection, target):
+    _flag_session(target)
+
+
+@event.listens_for(Fond, "after_update")
+def _fond_updated(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in _TRACKED_ATTRIBUTES):
+        _flag_session(target)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _fond_bulk_statement(orm_execute_state):
+    # INSERT/UPDATE/DELETE bulk (session.execute(insert(Fond), [...])) nu declanșează evenimentele de mapper
+    is_write = orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete
+    mapper = orm_execute_state.bind_mapper
+    if is_write and mapper is not None and mapper.class_ is Fond:
+        orm_execute_state.session.info[_SESSION_FLAG] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _session_committed(session):
+    if session.info.pop(_SESSION_FLAG, False):
+        suggestion_index.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _session_rolled_back(session):
+    session.info.pop(_SESSION_FLAG, None)
@@ -0,0 +1,32 @@
+# app/services/search_snippets.py - Highlighted snippets for search results
+"""
+Fragmentul din `notes` din jurul primei potriviri. Fereastra este tăiată în SQL
+(crud.fond.search_fonds_with_snippets), deci blob-ul întreg nu ajunge în
+aplicație; aici se adaugă doar elipsele și pozițiile de evidențiere.
+"""
+import re
+from typing import Any, Dict, Optional
+
+ELLIPSIS = "…"
+
+
+def make_snippet(fragment: Optional[str], start: int, full_length: int, query: str) -> Optional[Dict[str, Any]]:
+    """
+    `fragment` începe la poziția `start` (1-based, ca substr) într-un text de
+    `full_length` caractere. Întoarce textul cu elipse și offset-urile [start, end)
+    ale fiecărei apariții a termenului, relative la textul returnat.
+    """
+    if not fragment:
+        return None
+
+    prefix = ELLIPSIS if start > 1 else ""
+    suffix = ELLIPSIS if start - 1 + len(fragment) < full_length else ""
+    text = f"{prefix}{fragment}{suffix}"
+
+    highlights = []
+    if query:
+        offset = len(prefix)
+        for match in re.finditer(re.escape(query), fragment, re.IGNORECASE):
+            highlights.append([match.start() + offset, match.end() + offset])
+
+    return {"field": "notes", "text": text, "highlights": highlights}
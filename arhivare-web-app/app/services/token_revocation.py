@@ -0,0 +1,132 @@
+# app/services/token_revocation.py - In-memory jti revocation list (Bloom filter + set)
+"""
+Verificarea de revocare a unui access token se face la fiecare request, deci
+trebuie să nu atingă baza de date:
+
+  - un Bloom filter răspunde "sigur nerevocat" pentru aproape toate token-urile
+    (câțiva biți citiți, fără alocări);
+  - doar la un hit în filtru se consultă dicționarul jti -> expirare, care
+    elimină fals-pozitivele.
+
+Sursa de adevăr este tabela `revoked_tokens`. Fiecare worker preia rândurile noi
+cel mult o dată la TOKEN_REVOCATION_SYNC_SECONDS, după fereastra de timp
+`revoked_at > ultima sincronizare - TOKEN_REVOCATION_SYNC_MARGIN_SECONDS` (nu după
+id: un logout comis mai târziu poate avea un id mai mic decât unul deja văzut);
+jti-urile deja cunoscute sunt ignorate. Intrările expirate (token-ul oricum nu mai
+e valid) sunt eliminate, iar filtrul e reconstruit doar atunci.
+"""
+import hashlib
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.auth_token import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Filtru Bloom pe un bytearray; k poziții din double hashing pe un singur digest blake2b"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationList:
+    """jti-urile revocate și încă neexpirate, cu sincronizare incrementală din DB"""
+
+    def __init__(self, capacity: int, sync_interval: float, sync_margin: float):
+        self.capacity = capacity
+        self.sync_interval = sync_interval
+        self.sync_margin = sync_margin
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self._expiry: Dict[str, float] = {}
+        self._bloom = BloomFilter(self.capacity)
+        self._window_start: Optional[datetime] = None
+        self._synced_at: Optional[float] = None
+
+    def revoke(self, jti: str, expires_at: float) -> None:
+        with self._lock:
+            self._expiry[jti] = expires_at
+            self._bloom.add(jti)
+
+    def is_revoked(self, jti: str) -> bool:
+        if jti not in self._bloom:
+            return False
+        expires_at = self._expiry.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def prune(self) -> int:
+        """Scoate intrările expirate și reconstruiește filtrul (un Bloom filter nu suportă ștergeri)"""
+        now = time.time()
+        with self._lock:
+            live = {jti: expires_at for jti, expires_at in self._expiry.items() if expires_at > now}
+            removed = len(self._expiry) - len(live)
+            if not removed:
+                return 0
+            bloom = BloomFilter(max(self.capacity, 2 * len(live)))
+            for jti in live:
+                bloom.add(jti)
+            self._expiry, self._bloom = live, bloom
+        return removed
+
+    def sync_if_due(self, db: Session) -> None:
+        """Preia rândurile recente din revoked_tokens dacă a trecut intervalul de sincronizare"""
+        now = time.monotonic()
+        if self._synced_at is not None and now - self._synced_at < self.sync_interval:
+            return
+        self._synced_at = now
+
+        started = datetime.now(timezone.utc)
+        query = db.query(RevokedToken.jti, RevokedToken.expires_at).filter(RevokedToken.expires_at > started)
+        if self._window_start is not None:
+            # revoked_at e ora începutului tranzacției: marja acoperă tranzacțiile lungi și skew-ul de ceas
+            query = query.filter(RevokedToken.revoked_at > self._window_start)
+        added = 0
+        for jti, expires_at in query.all():
+            if jti not in self._expiry:
+                self.revoke(jti, _timestamp(expires_at))
+                added += 1
+        self._window_start = started - timedelta(seconds=self.sync_margin)
+
+        removed = self.prune()
+        if added or removed:
+            logger.debug(f"Revocation list synced: +{added} / -{removed}, {len(self._expiry)} live")
+
+
+def _timestamp(value: datetime) -> float:
+    # SQLite întoarce datetime naive (stocate în UTC)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+revocation_list = RevocationList(
+    capacity=settings.TOKEN_REVOCATION_BLOOM_CAPACITY,
+    sync_interval=settings.TOKEN_REVOCATION_SYNC_SECONDS,
+    sync_margin=settings.TOKEN_REVOCATION_SYNC_MARGIN_SECONDS,
+)
@@ -0,0 +1,93 @@
+# app/services/token_versions.py - Cached per-user token versions for stateless JWT checks
+"""
+Token-urile de acces poartă `uid`, `role` și `ver` (User.token_version). Rutele
+read-only au încredere în aceste claim-uri și verifică doar că versiunea și
+rolul corespund celor din cache, fără un SELECT pe users la fiecare request.
+
+Revocare:
+  - schimbarea rolului incrementează token_version (before_update), deci toate
+    token-urile emise anterior devin invalide;
+  - orice commit care modifică rolul/versiunea sau șterge un utilizator scoate
+    intrarea din cache în procesul curent;
+  - în alte procese/workeri intrarea expiră după TOKEN_VERSION_CACHE_TTL_SECONDS.
+"""
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import settings
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+_SESSION_KEY = "token_versions_changed"
+_MISSING = (None, None)
+
+
+class TokenVersionCache:
+    """user_id -> (token_version, role), cu expirare; utilizatorii inexistenți sunt memorați ca (None, None)"""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[int, Tuple[float, Tuple[Optional[int], Optional[str]]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, user_id: int) -> Tuple[Optional[int], Optional[str]]:
+        now = time.monotonic()
+        entry = self._entries.get(user_id)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        row = db.query(User.token_version, User.role).filter(User.id == user_id).first()
+        value = (row.token_version, row.role) if row else _MISSING
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+            self._entries[user_id] = (now + self.ttl_seconds, value)
+        return value
+
+    def invalidate(self, user_id: Optional[int] = None) -> None:
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+
+token_versions = TokenVersionCache(ttl_seconds=settings.TOKEN_VERSION_CACHE_TTL_SECONDS)
+
+
+# === Versionare și invalidare la scriere ===
+def _changed_users(target: User) -> None:
+    session = object_session(target)
+    if session is not None and target.id is not None:
+        session.info.setdefault(_SESSION_KEY, set()).add(target.id)
+
+
+@event.listens_for(User, "before_update")
+def _bump_version_on_role_change(mapper, connection, target):
+    if inspect(target).attrs.role.history.has_changes():
+        target.token_version = (target.token_version or 0) + 1
+        logger.info(f"Role changed for user {target.id}, token version bumped to {target.token_version}")
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target):
+    _changed_users(target)
+
+
+@event.listens_for(Session, "after_commit")
+def _session_committed(session):
+    for user_id in session.info.pop(_SESSION_KEY, ()):
+        token_versions.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _session_rolled_back(session):
+    session.info.pop(_SESSION_KEY, None)
@@ -0,0 +1,270 @@
+# benchmarks/bench_assignment.py - Micro-benchmarks for owner-matching hot spots
+"""
+Măsoară funcțiile CPU-intensive ale auto-assignment-ului:
+  - AssignmentService._normalize_company_name
+  - AssignmentService._calculate_similarity
+  - bucla din suggest_assignments_by_similarity (normalizare + similaritate per client)
+  - api/routes/fonds.find_client_by_company_name (pe o bază SQLite în memorie)
+
+pe distribuții realiste de nume de firme românești și 100 / 10k / 100k clienți.
+Fiecare implementare curentă este comparată cu copia de referință din
+benchmarks/reference_assignment.py: ops/sec, speedup, memorie de vârf și
+numărul de rezultate diferite (trebuie să fie 0). Referința pentru normalizare
+include eliminarea diacriticelor, singura schimbare semantică intenționată.
+
+Utilizare (din directorul arhivare-web-app):
+    python -m benchmarks.bench_assignment --sizes 100,10000,100000
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+CITIES = [
+    "Brașov", "Cluj-Napoca", "București", "Bacău", "Râmnicu Vâlcea", "Pitești", "Iași",
+    "Timișoara", "Constanța", "Sibiu", "Oradea", "Craiova", "Galați", "Ploiești",
+    "Suceava", "Arad", "Târgu Mureș", "Baia Mare", "Botoșani", "Focșani",
+]
+STEMS = [
+    "Tractorul", "Rulmentul", "Steagul Roșu", "Carbochim", "Tehnofrig", "Grivița Roșie",
+    "Faur", "Chimcomplex", "Oltchim", "Electroputere", "Semănătoarea", "Hidromecanica",
+    "Mobila", "Ceramica", "Sticla", "Metalurgica", "Textila", "Autobuzul", "Electromotor",
+    "Întreprinderea de Utilaj Greu", "Fabrica de Bere", "Uzina Mecanică", "Combinatul Chimic",
+]
+QUALIFIERS = ["", "", "", "Heritage", "Archive Solutions", "Patrimony", "Grup", "Industrial", "Holding"]
+LEGAL_PATTERNS = [
+    "{name} SA", "{name} SRL", "SC {name} SRL", "S.C. {name} S.R.L.", "{name} S.A.",
+    "{name}", "sc {lower} srl", "{upper} SA", "{name} - {city}", "SC {name} SA",
+]
+HOLDER_PATTERNS = [
+    "Arhiva Națională {city}", "Arhivele Naționale {city}", "Muzeul Județean {city}",
+    "Direcția Județeană {city} a Arhivelor Naționale",
+]
+
+
+def make_company_names(count: int, rng: random.Random) -> List[str]:
+    """Nume de firme cu diacritice, forme juridice și punctuație variate"""
+    names = []
+    for i in range(count):
+        base = " ".join(part for part in (rng.choice(STEMS), rng.choice(QUALIFIERS), rng.choice(CITIES)) if part)
+        if rng.random() < 0.5:
+            base = f"{base} {i}"  # asigură diversitatea la volume mari
+        pattern = rng.choice(LEGAL_PATTERNS)
+        names.append(pattern.format(name=base, lower=base.lower(), upper=base.upper(), city=rng.choice(CITIES)))
+    return names
+
+
+def make_workload(pool: Sequence[str], size: int, rng: random.Random) -> List[str]:
+    """Eșantion cu distribuție Zipf - câteva nume sunt foarte frecvente, ca în producție"""
+    weights = [1.0 / (rank + 1) for rank in range(len(pool))]
+    return rng.choices(pool, weights=weights, k=size)
+
+
+def make_lookup_names(client_names: Sequence[str], count: int, rng: random.Random) -> List[str]:
+    """Holder names pentru find_client: exact, subșir, cuvinte comune și fără potrivire"""
+    lookups = []
+    for _ in range(count):
+        kind = rng.random()
+        name = rng.choice(client_names)
+        if kind < 0.25:
+            lookups.append(name.upper())
+        elif kind < 0.5:
+            lookups.append(f"Arhiva {name}")
+        elif kind < 0.75:
+            words = name.split()
+            lookups.append(" ".join(words[: max(2, len(words) // 2)]) + " Grup SA")
+        else:
+            lookups.append(rng.choice(HOLDER_PATTERNS).format(city=rng.choice(CITIES)) + f" {rng.randint(1, 10**6)}")
+    return lookups
+
+
+def timed(fn: Callable, repeat: int = 3, setup: Optional[Callable] = None) -> (float, object):
+    """Cel mai bun timp din `repeat` rulări, plus rezultatul ultimei rulări"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        gc.collect()
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def peak_memory(fn: Callable, setup: Optional[Callable] = None) -> int:
+    if setup:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _clear_name_caches() -> None:
+    from app.services import company_names
+    company_names.clear_caches()
+
+
+def compare_impls(name: str, ops: int, current: Callable, reference: Callable, repeat: int) -> Dict:
+    # Cache-urile de normalizare se golesc înainte de fiecare rulare: memoizarea
+    # contează doar pentru repetițiile din cadrul aceluiași workload
+    setup = _clear_name_caches
+    current_time, current_result = timed(current, repeat, setup)
+    reference_time, reference_result = timed(reference, repeat)
+    mismatches = sum(1 for a, b in zip(current_result, reference_result) if a != b)
+    mismatches += abs(len(current_result) - len(reference_result))
+    row = {
+        "ops": ops,
+        "ops_per_sec": round(ops / current_time, 1) if current_time else None,
+        "reference_ops_per_sec": round(ops / reference_time, 1) if reference_time else None,
+        "speedup": round(reference_time / current_time, 2) if current_time else None,
+        "peak_memory_kb": round(peak_memory(current, setup) / 1024, 1),
+        "reference_peak_memory_kb": round(peak_memory(reference) / 1024, 1),
+        "mismatches": mismatches,
+    }
+    print(
+        f"  {name:<18} {row['ops_per_sec']:>13,.0f} ops/s  ref {row['reference_ops_per_sec']:>13,.0f} ops/s  "
+        f"x{row['speedup']:<6} mem {row['peak_memory_kb']:>9,.1f}KB  mismatches={mismatches}"
+    )
+    return row
+
+
+def bench_size(n_clients: int, args, rng: random.Random) -> Dict:
+    from sqlalchemy import create_engine, insert
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from app.api.routes.fonds import find_client_by_company_name
+    from app.database import Base
+    from app.models.user import User
+    from app.services.assignment_service import AssignmentService
+    from app.services.company_names import fold_diacritics
+    from benchmarks import reference_assignment as ref
+
+    # Singura diferență semantică intenționată față de referință: diacriticele sunt eliminate
+    def reference_normalize(name):
+        return fold_diacritics(ref.normalize_company_name(name))
+
+    service = AssignmentService(db=None)
+    client_names = make_company_names(n_clients, rng)
+    workload = make_workload(client_names, args.workload, rng)
+    pairs = [(service._normalize_company_name(a), service._normalize_company_name(b))
+             for a, b in zip(workload, make_workload(client_names, args.workload, rng))]
+    fond_names = make_workload(client_names, args.fonds, rng)
+
+    print(f"\n== {n_clients:,} clients ==")
+    results = {}
+
+    results["normalize"] = compare_impls(
+        "normalize", len(workload),
+        lambda: [service._normalize_company_name(n) for n in workload],
+        lambda: [reference_normalize(n) for n in workload],
+        args.repeat,
+    )
+
+    results["similarity"] = compare_impls(
+        "similarity", len(pairs),
+        lambda: [service._calculate_similarity(a, b) for a, b in pairs],
+        lambda: [ref.calculate_similarity(a, b) for a, b in pairs],
+        args.repeat,
+    )
+
+    def suggest_scan(normalize, similarity):
+        scores = []
+        for fond_name in fond_names:
+            fond_normalized = normalize(fond_name)
+            scores.append(tuple(
+                round(similarity(fond_normalized, normalize(client)), 6) for client in client_names
+            ))
+        return scores
+
+    results["suggest_scan"] = compare_impls(
+        "suggest_scan", len(fond_names) * n_clients,
+        lambda: suggest_scan(service._normalize_company_name, service._calculate_similarity),
+        lambda: suggest_scan(reference_normalize, ref.calculate_similarity),
+        1,
+    )
+
+    # find_client_by_company_name rulează pe o bază SQLite în memorie cu n_clients clienți
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    try:
+        db.execute(insert(User), [
+            {"username": f"client_{i}", "password_hash": "x", "role": "client", "company_name": name}
+            for i, name in enumerate(client_names)
+        ])
+        db.commit()
+
+        lookups = make_lookup_names(client_names, max(3, args.lookups * 100 // max(100, n_clients // 100)), rng)
+
+        def lookup_ids(find):
+            ids = []
+            for name in lookups:
+                client = find(db, name)
+                ids.append(client.id if client else None)
+                db.expunge_all()
+            return ids
+
+        results["find_client"] = compare_impls(
+            "find_client", len(lookups),
+            lambda: lookup_ids(find_client_by_company_name),
+            lambda: lookup_ids(ref.find_client_by_company_name),
+            1,
+        )
+    finally:
+        db.close()
+        engine.dispose()
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for AssignmentService name matching")
+    parser.add_argument("--sizes", default="100,10000,100000", help="Numerele de clienți testate")
+    parser.add_argument("--workload", type=int, default=20000, help="Apeluri normalize/similarity per dimensiune")
+    parser.add_argument("--fonds", type=int, default=3, help="Fonduri scanate în suggest_scan")
+    parser.add_argument("--lookups", type=int, default=20, help="Lookup-uri find_client (scalate invers cu dimensiunea)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", default=None, help="Fișierul JSON de rezultate")
+    args = parser.parse_args(argv)
+
+    # Engine-ul aplicației nu e folosit; find_client rulează pe o bază separată în memorie
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{Path(tempfile.gettempdir()) / 'arhivare_bench.db'}")
+    os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    rng = random.Random(args.seed)
+    report = {"sizes": {}}
+    mismatches = 0
+    for size in (int(s) for s in args.sizes.split(",")):
+        report["sizes"][str(size)] = bench_size(size, args, rng)
+        mismatches += sum(row["mismatches"] for row in report["sizes"][str(size)].values())
+
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2))
+        print(f"\nResults saved to {output}")
+
+    if mismatches:
+        print(f"\n{mismatches} results differ from the reference implementation")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
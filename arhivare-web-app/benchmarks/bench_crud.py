@@ -0,0 +1,168 @@
+# benchmarks/bench_crud.py - Before/after benchmark for the prebuilt crud statements
+"""
+Măsoară citirile fierbinți din crud la nivel de funcție (fără HTTP):
+  - crud.fond.search_fonds (GET /search)
+  - crud.fond.get_fonds (toate / nealocate / ale unui owner; cu owner - GET /admin/fonds/)
+  - crud.fond.get_my_fonds
+  - crud.fond.get_fonds_for_user / search_fonds_for_user (GET /fonds/, /fonds/my-fonds)
+  - crud.user.get_user_by_username (lookup-ul din get_current_user)
+
+Fiecare implementare curentă (statement construit o singură dată, valori ca
+bind parameters) este comparată cu copia Query-based din
+benchmarks/reference_crud.py: ops/sec, speedup și numărul de rezultate diferite
+(trebuie să fie 0). Pagini mici, ca în API, ca să conteze costul de
+construire/compilare al query-ului, nu transferul de rânduri.
+
+Utilizare (din directorul arhivare-web-app):
+    python -m benchmarks.bench_crud --fonds 20000 --clients 500 --calls 2000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, List
+
+TERMS = ["Brașov", "Tractorul", "SRL", "Arhiva", "Cluj 1", "Holding", "fond #12", "inexistent"]
+
+
+def compare_impls(name: str, ops: int, current: Callable, reference: Callable, repeat: int) -> Dict:
+    from benchmarks.bench_assignment import timed
+
+    reference_time, reference_result = timed(reference, repeat)
+    current_time, current_result = timed(current, repeat)
+    mismatches = sum(1 for a, b in zip(current_result, reference_result) if a != b)
+    mismatches += abs(len(current_result) - len(reference_result))
+    row = {
+        "ops": ops,
+        "ops_per_sec": round(ops / current_time, 1) if current_time else None,
+        "reference_ops_per_sec": round(ops / reference_time, 1) if reference_time else None,
+        "speedup": round(reference_time / current_time, 2) if current_time else None,
+        "mismatches": mismatches,
+    }
+    print(
+        f"  {name:<16} {row['ops_per_sec']:>10,.0f} ops/s  ref {row['reference_ops_per_sec']:>10,.0f} ops/s  "
+        f"x{row['speedup']:<6} mismatches={mismatches}"
+    )
+    return row
+
+
+def run(args) -> Dict:
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from app.api.auth import Principal
+    from app.crud import fond as crud_fond
+    from app.crud import user as crud_user
+    from app.database import Base
+    from app.models.user import User
+    from benchmarks import reference_crud as ref
+    from benchmarks.seed import seed_dataset
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        usernames = seed_dataset(db, args.fonds, args.clients, seed=args.seed)["clients"]
+        client_ids = [row.id for row in db.query(User.id).filter(User.role == "client")]
+        # Principal-ul din token, ca în rutele /fonds: admin, audit sau un client
+        principals = [Principal(id=0, username="admin", role="admin"), Principal(id=0, username="audit", role="audit")]
+        principals += [Principal(id=client_id, username=f"client{client_id}", role="client") for client_id in client_ids]
+
+        rng = random.Random(args.seed)
+        pages = [rng.randrange(0, 5) * args.page_size for _ in range(args.calls)]
+        searches = [(rng.choice(TERMS), page) for page in pages]
+        owners = [(rng.choice([None, 0] + client_ids), page) for page in pages]
+        my_fonds = [(rng.choice(client_ids), page) for page in pages]
+        admin_pages = [(rng.random() < 0.5, page) for page in pages]
+        user_pages = [(rng.choice(principals), page) for page in pages]
+        user_searches = [(rng.choice(principals), rng.choice(TERMS), page) for page in pages]
+        lookups = [rng.choice(usernames + ["missing_user"]) for _ in range(args.calls)]
+
+        def collect(calls, fn):
+            # Sesiune "curată" la fiecare apel, ca într-un request
+            results = []
+            for call in calls:
+                rows = fn(*call) if isinstance(call, tuple) else fn(call)
+                if isinstance(rows, list):
+                    results.append(tuple(row.id for row in rows))
+                else:
+                    results.append(rows.id if rows else None)
+                db.expunge_all()
+            return results
+
+        print(f"\n== {args.fonds:,} fonds, {args.clients:,} clients, {args.calls:,} calls ==")
+        results = {}
+        for name, calls, current, reference in (
+            ("search_fonds", searches,
+             lambda q, skip: crud_fond.search_fonds(db, q, skip=skip, limit=args.page_size),
+             lambda q, skip: ref.search_fonds(db, q, skip=skip, limit=args.page_size)),
+            ("get_fonds", owners,
+             lambda owner, skip: crud_fond.get_fonds(db, skip=skip, limit=args.page_size, owner_id=owner),
+             lambda owner, skip: ref.get_fonds(db, skip=skip, limit=args.page_size, owner_id=owner)),
+            ("admin_fonds", admin_pages,
+             lambda include_owner, skip: crud_fond.get_fonds(
+                 db, skip=skip, limit=args.page_size, include_owner=include_owner),
+             lambda include_owner, skip: ref.get_fonds(
+                 db, skip=skip, limit=args.page_size, include_owner=include_owner)),
+            ("fonds_for_user", user_pages,
+             lambda user, skip: crud_fond.get_fonds_for_user(db, user, skip=skip, limit=args.page_size),
+             lambda user, skip: ref.get_fonds_for_user(db, user, skip=skip, limit=args.page_size)),
+            ("search_for_user", user_searches,
+             lambda user, q, skip: crud_fond.search_fonds_for_user(db, user, q, skip=skip, limit=args.page_size),
+             lambda user, q, skip: ref.search_fonds_for_user(db, user, q, skip=skip, limit=args.page_size)),
+            ("get_my_fonds", my_fonds,
+             lambda owner, skip: crud_fond.get_my_fonds(db, owner, skip=skip, limit=args.page_size),
+             lambda owner, skip: ref.get_my_fonds(db, owner, skip=skip, limit=args.page_size)),
+            ("user_by_username", lookups,
+             lambda username: crud_user.get_user_by_username(db, username),
+             lambda username: ref.get_user_by_username(db, username)),
+        ):
+            results[name] = compare_impls(
+                name, len(calls),
+                lambda fn=current, calls=calls: collect(calls, fn),
+                lambda fn=reference, calls=calls: collect(calls, fn),
+                args.repeat,
+            )
+        return results
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prebuilt vs Query-based crud statements")
+    parser.add_argument("--fonds", type=int, default=20000)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--calls", type=int, default=2000, help="Apeluri per funcție")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", default=None, help="Fișierul JSON de rezultate")
+    args = parser.parse_args(argv)
+
+    # Engine-ul aplicației nu e folosit; benchmark-ul rulează pe o bază separată în memorie
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{Path(tempfile.gettempdir()) / 'arhivare_bench.db'}")
+    os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    report = run(args)
+
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2))
+        print(f"\nResults saved to {output}")
+
+    mismatches = sum(row["mismatches"] for row in report.values())
+    if mismatches:
+        print(f"\n{mismatches} results differ from the reference implementation")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+# benchmarks/compare.py - Compare two benchmark result files and flag regressions
+"""
+Utilizare:
+    python -m benchmarks.compare baseline.json current.json [--threshold 10]
+
+Iese cu cod 1 dacă p95 sau throughput-ul unui scenariu s-a degradat cu mai mult
+decât pragul dat (în procente).
+"""
+import argparse
+import json
+import sys
+
+
+def _change(old: float, new: float) -> float:
+    return (new - old) / old * 100 if old else 0.0
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> bool:
+    """Afișează diferențele per scenariu; întoarce True dacă există regresii"""
+    regressed = False
+    print(f"{'scenario':<16} {'p95 old':>10} {'p95 new':>10} {'Δp95':>8} {'rps old':>10} {'rps new':>10} {'Δrps':>8}")
+    for name, new in current["scenarios"].items():
+        old = baseline["scenarios"].get(name)
+        if old is None:
+            print(f"{name:<16} (new scenario)")
+            continue
+        p95_delta = _change(old["latency_ms"]["p95"], new["latency_ms"]["p95"])
+        rps_delta = _change(old["throughput_rps"], new["throughput_rps"])
+        flag = ""
+        if p95_delta > threshold or rps_delta < -threshold:
+            regressed = True
+            flag = "  REGRESSION"
+        print(
+            f"{name:<16} {old['latency_ms']['p95']:>10.2f} {new['latency_ms']['p95']:>10.2f} {p95_delta:>+7.1f}% "
+            f"{old['throughput_rps']:>10.1f} {new['throughput_rps']:>10.1f} {rps_delta:>+7.1f}%{flag}"
+        )
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark JSON result files")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Prag de regresie în procente")
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    return 1 if compare(baseline, current, args.threshold) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
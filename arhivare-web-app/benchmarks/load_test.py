@@ -0,0 +1,247 @@
+# benchmarks/load_test.py - API load test against a seeded dataset (in-process ASGI)
+"""
+Rulează scenarii de încărcare pe API prin httpx.ASGITransport (fără rețea),
+cu clienți concurenți, și raportează latențele p50/p95/p99 și throughput-ul.
+
+Utilizare (din directorul arhivare-web-app):
+    python -m benchmarks.load_test --fonds 20000 --clients 500 --concurrency 32
+    python -m benchmarks.compare benchmarks/results/A.json benchmarks/results/B.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+SEARCH_TERMS = ["brașov", "arhiva", "tractorul", "cluj", "sa", "fabrica", "rulmentul", "națională"]
+# Prefixele tastate în caseta de căutare (typeahead)
+SUGGEST_PREFIXES = ["ar", "arh", "tr", "tra", "st", "ste", "mu", "fa", "fab", "ru", "ca"]
+# Operații per request în scenariul batch_update
+BATCH_UPDATE_SIZE = 20
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Percentila nearest-rank dintr-o listă deja sortată"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: List[float], statuses: Dict[int, int], wall_time: float) -> Dict:
+    latencies = sorted(latencies)
+    total = len(latencies)
+    errors = sum(count for code, count in statuses.items() if code >= 400)
+    return {
+        "requests": total,
+        "errors": errors,
+        "status_codes": {str(code): count for code, count in sorted(statuses.items())},
+        "throughput_rps": round(total / wall_time, 2) if wall_time > 0 else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencies) / total * 1000, 3) if total else 0.0,
+            "p50": round(percentile(latencies, 50) * 1000, 3),
+            "p95": round(percentile(latencies, 95) * 1000, 3),
+            "p99": round(percentile(latencies, 99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if total else 0.0,
+        },
+    }
+
+
+async def run_scenario(client, make_request: Callable, n_requests: int, concurrency: int) -> Dict:
+    """Rulează n_requests cereri cu `concurrency` workeri care trag din același contor"""
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    remaining = n_requests
+
+    async def worker(worker_id: int):
+        nonlocal remaining
+        rng = random.Random(worker_id)
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            response = await make_request(client, rng)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return summarize(latencies, statuses, time.perf_counter() - started)
+
+
+async def login(client, username: str, password: str) -> Dict[str, str]:
+    response = await client.post("/auth/login", json={"username": username, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def build_scenarios(
+    admin_headers: Dict, client_headers: List[Dict], clients: List[str], password: str, fond_count: int
+) -> Dict:
+    """Scenariile de încărcare: nume -> funcție async (client, rng) -> response"""
+
+    async def search(client, rng):
+        return await client.get("/search", params={"query": rng.choice(SEARCH_TERMS), "limit": 20})
+
+    async def search_count(client, rng):
+        return await client.get("/search/count", params={"query": rng.choice(SEARCH_TERMS)})
+
+    async def suggest(client, rng):
+        return await client.get("/search/suggest", params={"prefix": rng.choice(SUGGEST_PREFIXES), "limit": 10})
+
+    async def fonds_list(client, rng):
+        return await client.get("/fonds/", params={"skip": rng.randint(0, 500), "limit": 50}, headers=admin_headers)
+
+    async def my_fonds(client, rng):
+        return await client.get("/fonds/my-fonds", params={"limit": 50}, headers=rng.choice(client_headers))
+
+    async def batch_update(client, rng):
+        operations = [
+            {"op": "update", "id": fond_id, "data": {"notes": f"bench {rng.random():.6f}"}}
+            for fond_id in rng.sample(range(1, fond_count + 1), BATCH_UPDATE_SIZE)
+        ]
+        return await client.post("/fonds/batch", json={"operations": operations}, headers=admin_headers)
+
+    async def auth_login(client, rng):
+        return await client.post("/auth/login", json={"username": rng.choice(clients), "password": password})
+
+    async def stats_count(client, rng):
+        return await client.get("/fonds/stats/count", headers=admin_headers)
+
+    async def stats_my_fonds(client, rng):
+        return await client.get("/fonds/my-fonds/stats", headers=rng.choice(client_headers))
+
+    async def stats_users(client, rng):
+        return await client.get("/users/stats", headers=admin_headers)
+
+    return {
+        "search": search,
+        "search_count": search_count,
+        "suggest": suggest,
+        "fonds_list": fonds_list,
+        "my_fonds": my_fonds,
+        "batch_update": batch_update,
+        "auth_login": auth_login,
+        "stats_count": stats_count,
+        "stats_my_fonds": stats_my_fonds,
+        "stats_users": stats_users,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+async def main_async(args) -> Dict:
+    # Importurile aplicației se fac după setarea DATABASE_URL (settings se citesc la import)
+    from httpx import AsyncClient, ASGITransport
+    from app.database import SessionLocal, create_tables, drop_tables
+    from app.main import app
+    from benchmarks.seed import seed_dataset, BENCH_PASSWORD
+
+    drop_tables()
+    create_tables()
+    db = SessionLocal()
+    try:
+        seed_started = time.perf_counter()
+        accounts = seed_dataset(db, args.fonds, args.clients, seed=args.seed)
+        seed_time = time.perf_counter() - seed_started
+    finally:
+        db.close()
+    print(f"Seeded {args.fonds} fonds / {args.clients} clients in {seed_time:.2f}s")
+
+    results = {}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench", timeout=60.0) as client:
+        admin_headers = await login(client, accounts["admin"][0], BENCH_PASSWORD)
+        sample_clients = accounts["clients"][:max(1, min(len(accounts["clients"]), args.client_sessions))]
+        client_headers = [await login(client, username, BENCH_PASSWORD) for username in sample_clients]
+
+        scenarios = build_scenarios(admin_headers, client_headers, sample_clients, BENCH_PASSWORD, args.fonds)
+        selected = args.scenarios.split(",") if args.scenarios else list(scenarios)
+
+        for name in selected:
+            if name not in scenarios:
+                raise SystemExit(f"Unknown scenario '{name}'. Available: {', '.join(scenarios)}")
+            # login-ul face bcrypt la fiecare cerere - rulăm mai puține cereri
+            n_requests = max(1, args.requests // 10) if name == "auth_login" else args.requests
+            if args.warmup:
+                await run_scenario(client, scenarios[name], min(args.warmup, n_requests), args.concurrency)
+            results[name] = await run_scenario(client, scenarios[name], n_requests, args.concurrency)
+            lat = results[name]["latency_ms"]
+            print(
+                f"{name:<16} {results[name]['throughput_rps']:>9.1f} req/s  "
+                f"p50={lat['p50']:>8.2f}ms  p95={lat['p95']:>8.2f}ms  p99={lat['p99']:>8.2f}ms  "
+                f"errors={results[name]['errors']}"
+            )
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "database": args.database_url.split("://")[0],
+            "fonds": args.fonds,
+            "clients": args.clients,
+            "concurrency": args.concurrency,
+            "requests_per_scenario": args.requests,
+            "seed_seconds": round(seed_time, 3),
+        },
+        "scenarios": results,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the Arhivare API against a seeded dataset")
+    parser.add_argument("--fonds", type=int, default=5000, help="Numărul de fonduri generate")
+    parser.add_argument("--clients", type=int, default=200, help="Numărul de clienți generați")
+    parser.add_argument("--concurrency", type=int, default=16, help="Clienți concurenți per scenariu")
+    parser.add_argument("--requests", type=int, default=500, help="Cereri per scenariu")
+    parser.add_argument("--warmup", type=int, default=20, help="Cereri de încălzire per scenariu (neraportate)")
+    parser.add_argument("--client-sessions", type=int, default=10, help="Câți clienți se autentifică pentru scenariile client")
+    parser.add_argument("--scenarios", default="", help="Listă separată prin virgulă (implicit toate)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--database-url",
+        default=os.getenv("BENCH_DATABASE_URL")
+        or f"sqlite:///{Path(tempfile.gettempdir()) / 'arhivare_bench.db'}",
+        help="Baza de date folosită (ATENȚIE: tabelele sunt recreate)",
+    )
+    parser.add_argument("--output", default=None, help="Fișierul JSON de rezultate")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    # Toate cererile vin de la același "IP": fără asta auth_login ar măsura răspunsurile 429
+    os.environ.setdefault("LOGIN_THROTTLE_ENABLED", "false")
+
+    report = asyncio.run(main_async(args))
+
+    output = Path(args.output) if args.output else RESULTS_DIR / (
+        f"load-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{report['meta']['git_commit'] or 'nogit'}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print(f"Results saved to {output}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+# benchmarks/reference_assignment.py - Frozen reference implementations for result validation
+"""
+Copii fidele ale implementărilor originale din AssignmentService și
+api/routes/fonds.find_client_by_company_name. NU se modifică: benchmark-ul
+compară implementarea curentă cu acestea, atât ca viteză cât și ca rezultate.
+"""
+import re
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.user import User as UserModel
+
+
+def normalize_company_name(name: str) -> str:
+    if not name:
+        return ""
+
+    normalized = name.lower().strip()
+    normalized = re.sub(r'^(sc|sa|srl|sra|ltd|llc|inc|corp|corporation)\s+', '', normalized)
+    normalized = re.sub(r'\s+(sc|sa|srl|sra|ltd|llc|inc|corp|corporation)$', '', normalized)
+    normalized = re.sub(r'[^\w\s]', '', normalized)
+    normalized = re.sub(r'\s+', ' ', normalized).strip()
+    return normalized
+
+
+def calculate_similarity(str1: str, str2: str) -> float:
+    if not str1 or not str2:
+        return 0.0
+    if str1 == str2:
+        return 1.0
+    if str1 in str2 or str2 in str1:
+        return 0.8
+
+    words1 = set(str1.split())
+    words2 = set(str2.split())
+    if not words1 or not words2:
+        return 0.0
+
+    intersection = len(words1.intersection(words2))
+    union = len(words1.union(words2))
+    return intersection / union if union > 0 else 0.0
+
+
+def find_client_by_company_name(db: Session, company_name: str) -> Optional[UserModel]:
+    if not company_name:
+        return None
+
+    normalized_name = company_name.lower().strip()
+
+    client = db.query(UserModel).filter(
+        UserModel.role == "client",
+        func.lower(UserModel.company_name) == normalized_name
+    ).first()
+    if client:
+        return client
+
+    clients = db.query(UserModel).filter(UserModel.role == "client").all()
+    for client in clients:
+        if client.company_name:
+            client_name_normalized = client.company_name.lower().strip()
+            if client_name_normalized in normalized_name or normalized_name in client_name_normalized:
+                return client
+
+    for prefix in ['srl', 'sa', 'sc', 'ltd', 'inc', 'corp']:
+        normalized_name = normalized_name.replace(f' {prefix}', '').replace(f'{prefix} ', '')
+
+    for client in clients:
+        if client.company_name:
+            client_name_clean = client.company_name.lower().strip()
+            for prefix in ['srl', 'sa', 'sc', 'ltd', 'inc', 'corp']:
+                client_name_clean = client_name_clean.replace(f' {prefix}', '').replace(f'{prefix} ', '')
+
+            holder_words = set(normalized_name.split())
+            client_words = set(client_name_clean.split())
+
+            if len(holder_words) >= 2 and len(client_words) >= 2:
+                common_words = holder_words.intersection(client_words)
+                if len(common_words) >= max(1, min(len(holder_words), len(client_words)) // 2):
+                    return client
+
+    return None
@@ -0,0 +1,148 @@
+# benchmarks/reference_crud.py - Frozen Query-based versions of the hot crud reads
+"""
+Copii fidele ale implementărilor originale (db.query(...) reconstruit la fiecare
+apel) pentru crud.fond.get_fonds / search_fonds / get_my_fonds /
+get_fonds_for_user / search_fonds_for_user și crud.user.get_user_by_username. NU se modifică: bench_crud compară implementarea
+curentă cu acestea, atât ca viteză cât și ca rezultate.
+"""
+from typing import Any, List, Optional
+
+from sqlalchemy import false, or_, true
+from sqlalchemy.orm import Session, joinedload
+
+from app.models.fond import Fond
+from app.models.user import User
+
+
+def get_fonds(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    active_only: bool = True,
+    include_owner: bool = False,
+    owner_id: Optional[int] = None,
+    options: Optional[List[Any]] = None
+) -> List[Fond]:
+    query = db.query(Fond)
+
+    if options:
+        query = query.options(*options)
+
+    if include_owner:
+        query = query.options(joinedload(Fond.owner))
+
+    if active_only:
+        query = query.filter(Fond.active == True)
+
+    if owner_id is not None:
+        if owner_id == 0:
+            query = query.filter(Fond.owner_id.is_(None))
+        else:
+            query = query.filter(Fond.owner_id == owner_id)
+
+    return query.offset(skip).limit(limit).all()
+
+
+def search_fonds(
+    db: Session,
+    query: str,
+    skip: int = 0,
+    limit: int = 20,
+    active_only: bool = True,
+    options: Optional[List[Any]] = None
+) -> List[Fond]:
+    search_query = db.query(Fond)
+
+    if options:
+        search_query = search_query.options(*options)
+
+    if active_only:
+        search_query = search_query.filter(Fond.active == True)
+
+    search_term = f"%{query}%"
+    return search_query.filter(or_(
+        Fond.company_name.ilike(search_term),
+        Fond.holder_name.ilike(search_term),
+        Fond.address.ilike(search_term),
+        Fond.notes.ilike(search_term)
+    )).offset(skip).limit(limit).all()
+
+
+def get_my_fonds(
+    db: Session,
+    owner_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    active_only: bool = True,
+    options: Optional[List[Any]] = None
+) -> List[Fond]:
+    query = db.query(Fond).filter(Fond.owner_id == owner_id)
+
+    if options:
+        query = query.options(*options)
+
+    if active_only:
+        query = query.filter(Fond.active == True)
+
+    return query.offset(skip).limit(limit).all()
+
+
+def _visible_to(user):
+    if user.role in ("admin", "audit"):
+        return true()
+    if user.role == "client":
+        return Fond.owner_id == user.id
+    return false()
+
+
+def get_fonds_for_user(
+    db: Session,
+    user,
+    skip: int = 0,
+    limit: int = 100,
+    active_only: bool = True,
+    include_owner: bool = False,
+    options: Optional[List[Any]] = None
+) -> List[Fond]:
+    query = db.query(Fond).filter(_visible_to(user))
+
+    if options:
+        query = query.options(*options)
+
+    if include_owner:
+        query = query.options(joinedload(Fond.owner))
+
+    if active_only:
+        query = query.filter(Fond.active == True)
+
+    return query.offset(skip).limit(limit).all()
+
+
+def search_fonds_for_user(
+    db: Session,
+    user,
+    query: str,
+    skip: int = 0,
+    limit: int = 20,
+    active_only: bool = True,
+    options: Optional[List[Any]] = None
+) -> List[Fond]:
+    search_query = db.query(Fond)
+
+    if options:
+        search_query = search_query.options(*options)
+
+    if active_only:
+        search_query = search_query.filter(Fond.active == True)
+
+    search_term = f"%{query}%"
+    return search_query.filter(or_(
+        Fond.company_name.ilike(search_term),
+        Fond.holder_name.ilike(search_term),
+        Fond.address.ilike(search_term),
+        Fond.notes.ilike(search_term)
+    )).filter(_visible_to(user)).offset(skip).limit(limit).all()
+
+
+def get_user_by_username(db: Session, username: str) -> Optional[User]:
+    return db.query(User).filter(User.username == username).first()
@@ -0,0 +1,92 @@
+# benchmarks/seed.py - Fast synthetic dataset generator for benchmarks
+"""
+Generează N fonduri și M clienți pornind de la datele demo din
+create_admin_user.sample_fonds_data, cu insert-uri bulk (executemany).
+"""
+import random
+from typing import Dict, List
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.models.fond import Fond
+from app.models.user import User
+from create_admin_user import sample_fonds_data
+
+BENCH_PASSWORD = "Bench1234"
+
+CITIES = [
+    "Brașov", "Cluj", "București", "Bacău", "Vâlcea", "Argeș", "Iași", "Timișoara",
+    "Constanța", "Sibiu", "Oradea", "Craiova", "Galați", "Ploiești", "Suceava", "Arad",
+]
+INDUSTRIES = [
+    "Tractorul", "Rulmentul", "Carbochim", "Tehnofrig", "Electroputere", "Textila",
+    "Metalurgica", "Mobila", "Chimica", "Ceramica", "Sticla", "Hidromecanica",
+    "Autobuzul", "Semănătoarea", "Electromotor", "Fabrica de Bere",
+]
+LEGAL_FORMS = ["SA", "SRL", "SC", "Heritage SRL", "Holding SA"]
+
+
+def _company_name(rng: random.Random, index: int) -> str:
+    return f"{rng.choice(INDUSTRIES)} {rng.choice(CITIES)} {index} {rng.choice(LEGAL_FORMS)}"
+
+
+def seed_dataset(db: Session, n_fonds: int, n_clients: int, seed: int = 42) -> Dict[str, List]:
+    """
+    Populează baza de date cu un admin, un utilizator audit, n_clients clienți și
+    n_fonds fonduri. ~70% din fonduri sunt assignate, ~5% sunt inactive.
+    Returnează username-urile create, pentru autentificare în benchmark.
+    """
+    rng = random.Random(seed)
+    templates = sample_fonds_data({})
+    password_hash = get_password_hash(BENCH_PASSWORD)  # un singur bcrypt pentru toți
+
+    users = [
+        {"username": "bench_admin", "password_hash": password_hash, "role": "admin"},
+        {"username": "bench_audit", "password_hash": password_hash, "role": "audit"},
+    ]
+    client_names = []
+    for i in range(n_clients):
+        client_names.append(f"bench_client_{i}")
+        users.append({
+            "username": f"bench_client_{i}",
+            "password_hash": password_hash,
+            "role": "client",
+            "company_name": _company_name(rng, i),
+            "contact_email": f"client{i}@bench.ro",
+        })
+    db.execute(insert(User), users)
+    db.flush()
+
+    client_ids = [
+        row.id for row in db.query(User.id).filter(User.role == "client").order_by(User.id)
+    ]
+
+    fonds = []
+    for i in range(n_fonds):
+        template = templates[i % len(templates)]
+        city = rng.choice(CITIES)
+        owner_id = rng.choice(client_ids) if client_ids and rng.random() < 0.7 else None
+        fonds.append({
+            "company_name": _company_name(rng, i),
+            "holder_name": f"Arhiva Națională {city}",
+            "address": template["address"],
+            "email": template["email"],
+            "phone": template["phone"],
+            "notes": f"{template['notes']} (fond #{i}, {city})",
+            "source_url": template["source_url"],
+            "active": rng.random() >= 0.05,
+            "owner_id": owner_id,
+        })
+
+    batch_size = 5000
+    for start in range(0, len(fonds), batch_size):
+        db.execute(insert(Fond), fonds[start:start + batch_size])
+    db.commit()
+
+    return {
+        "admin": ["bench_admin"],
+        "audit": ["bench_audit"],
+        "clients": client_names,
+    }
@@ -117,16 +117,14 @@ def create_users(session):
     
     return created_users
 
-def create_sample_fonds(session, users):
-    """Create sample fonds with proper ownership"""
-    print("📁 Creating sample fonds...")
-    
+def sample_fonds_data(users):
+    """Return the demo fond records, with owner_id resolved from the given users"""
     # Get client users for ownership assignment
     client_brasov = users.get("client_brasov")
     client_cluj = users.get("client_cluj") 
     client_bucuresti = users.get("client_bucuresti")
     
-    fonds_data = [
+    return [
         # Brașov area fonds - assigned to client_brasov
         {
             "company_name": "Tractorul Brașov SA",
@@ -247,6 +245,12 @@ def create_sample_fonds(session, users):
             "owner_id": None
         }
     ]
+
+def create_sample_fonds(session, users):
+    """Create sample fonds with proper ownership"""
+    print("📁 Creating sample fonds...")
+    
+    fonds_data = sample_fonds_data(users)
     
     created_count = 0
     
@@ -12,6 +12,7 @@ import FondForm from './forms/FondForm';
 import ReassignmentModal from './ReassignmentModal';
 import { DarkModeToggle, useDarkMode } from './common/DarkModeSystem';
 import { LanguageToggle, useLanguage } from './common/LanguageSystem';
+import { useDashboardEvents } from '../services/dashboardEvents';
 
 // Types (same as before)
 interface Fond {
@@ -210,6 +211,11 @@ const AdminDashboard: React.FC = () => {
     loadUsers();
   }, [loadFonds, loadUsers]);
 
+  // Reîncărcare doar când serverul anunță o modificare (SSE), fără polling
+  useDashboardEvents(() => {
+    loadFonds();
+  });
+
   // All existing CRUD functions remain the same but with translated messages...
   const handleCreateFond = async (fondData: FondFormData) => {
     if (!canEdit) {
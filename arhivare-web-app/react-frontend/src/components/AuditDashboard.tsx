@@ -10,6 +10,7 @@ import {
 import { useAuth } from './AuthSystem';
 import { DarkModeToggle, useDarkMode } from './common/DarkModeSystem';
 import { LanguageToggle, useLanguage } from './common/LanguageSystem';
+import { useDashboardEvents } from '../services/dashboardEvents';
 
 // Types
 interface Fond {
@@ -147,6 +148,11 @@ const AuditDashboard: React.FC = () => {
     loadAllData();
   }, [loadAllData]);
 
+  // Reîncărcare doar când serverul anunță o modificare (SSE), fără polling
+  useDashboardEvents(() => {
+    loadAllData();
+  });
+
   // Refresh data
   const handleRefresh = async () => {
     setRefreshing(true);
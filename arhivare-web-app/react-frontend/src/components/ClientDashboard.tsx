@@ -10,6 +10,7 @@ import { useAuth } from './AuthSystem';
 import FondForm from './forms/FondForm';
 import { DarkModeToggle, useDarkMode } from './common/DarkModeSystem';
 import { LanguageToggle, useLanguage } from './common/LanguageSystem';
+import { useDashboardEvents } from '../services/dashboardEvents';
 
 // Types
 interface Fond {
@@ -147,6 +148,11 @@ const ClientDashboard: React.FC = () => {
     loadMyData();
   }, [loadMyData]);
 
+  // Reîncărcare doar când se schimbă fondurile clientului (SSE), fără polling
+  useDashboardEvents(() => {
+    loadMyData();
+  });
+
   // CREATE fond function
   const handleCreateFond = async (fondData: FondFormData) => {
     setFormLoading(true);
@@ -0,0 +1,122 @@
+// src/services/dashboardEvents.ts
+import { useEffect, useRef } from 'react';
+import { useAuth } from '../components/AuthSystem';
+
+const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000';
+
+export type DashboardEventType =
+  | 'fond_created'
+  | 'fond_updated'
+  | 'fond_assigned'
+  | 'fond_deleted'
+  | 'stats_changed'
+  | 'resync';
+
+const EVENT_TYPES: DashboardEventType[] = [
+  'fond_created', 'fond_updated', 'fond_assigned', 'fond_deleted', 'stats_changed', 'resync'
+];
+
+// Mai multe evenimente într-o rafală (ex. bulk assign) => o singură reîncărcare
+const RELOAD_DEBOUNCE_MS = 500;
+
+// Redeschiderea după o eroare: 3s, 6s, 12s ... cel mult 60s
+const RECONNECT_BASE_MS = 3000;
+const RECONNECT_MAX_MS = 60000;
+
+/**
+ * Un ticket de scurtă durată pentru GET /events/stream. EventSource nu poate trimite
+ * header-ul Authorization, iar access token-ul nu trebuie să ajungă în URL (și în loguri).
+ * Întoarce null dacă token-ul nu mai e valid - se așteaptă o nouă autentificare.
+ */
+async function fetchStreamTicket(token: string): Promise<string | null> {
+  const response = await fetch(`${API_BASE_URL}/auth/stream-ticket`, {
+    method: 'POST',
+    headers: { Authorization: `Bearer ${token}` },
+  });
+  if (response.status === 401) return null;
+  if (!response.ok) throw new Error(`Stream ticket failed: ${response.status}`);
+  const data: { ticket: string } = await response.json();
+  return data.ticket;
+}
+
+/**
+ * Ascultă GET /events/stream (SSE) și apelează `onChange` când serverul anunță
+ * o modificare vizibilă utilizatorului curent. Înlocuiește polling-ul: un
+ * dashboard deschis, dar fără modificări, nu mai face request-uri.
+ * Ticket-ul din URL expiră repede, deci reconectarea automată a EventSource ar
+ * eșua: la orice eroare sursa se închide și se redeschide cu un ticket nou, iar
+ * un token nou (login / refresh) redeschide stream-ul cu identitatea nouă.
+ */
+export function useDashboardEvents(onChange: (types: DashboardEventType[]) => void, enabled = true) {
+  const { token } = useAuth();
+  const onChangeRef = useRef(onChange);
+  onChangeRef.current = onChange;
+  // Păstrat între redeschideri: după orice reconectare am putut pierde evenimente
+  const connectedOnceRef = useRef(false);
+
+  useEffect(() => {
+    if (!enabled || !token || typeof EventSource === 'undefined') return;
+
+    let source: EventSource | null = null;
+    let closed = false;
+    let attempt = 0;
+    let reconnectTimer: ReturnType<typeof setTimeout> | null = null;
+    let pending = new Set<DashboardEventType>();
+    let timer: ReturnType<typeof setTimeout> | null = null;
+
+    const schedule = (type: DashboardEventType) => {
+      pending.add(type);
+      if (timer) return;
+      timer = setTimeout(() => {
+        const types = Array.from(pending);
+        pending = new Set();
+        timer = null;
+        onChangeRef.current(types);
+      }, RELOAD_DEBOUNCE_MS);
+    };
+
+    const reconnect = () => {
+      if (closed || reconnectTimer) return;
+      const delay = Math.min(RECONNECT_MAX_MS, RECONNECT_BASE_MS * 2 ** attempt);
+      attempt += 1;
+      reconnectTimer = setTimeout(() => {
+        reconnectTimer = null;
+        open();
+      }, delay);
+    };
+
+    const open = async () => {
+      let ticket: string | null;
+      try {
+        ticket = await fetchStreamTicket(token);
+      } catch {
+        reconnect();
+        return;
+      }
+      // Token expirat sau revocat: efectul rulează din nou când AuthProvider are un token nou
+      if (closed || !ticket) return;
+
+      source = new EventSource(`${API_BASE_URL}/events/stream?ticket=${encodeURIComponent(ticket)}`);
+      EVENT_TYPES.forEach(type => source!.addEventListener(type, () => schedule(type)));
+      source.addEventListener('ready', () => {
+        attempt = 0;
+        if (connectedOnceRef.current) schedule('resync');
+        connectedOnceRef.current = true;
+      });
+      source.onerror = () => {
+        source?.close();
+        source = null;
+        reconnect();
+      };
+    };
+
+    open();
+
+    return () => {
+      closed = true;
+      if (timer) clearTimeout(timer);
+      if (reconnectTimer) clearTimeout(reconnectTimer);
+      source?.close();
+    };
+  }, [enabled, token]);
+}
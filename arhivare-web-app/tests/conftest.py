@@ -10,10 +10,16 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.main import app
-from app.database import get_db, Base
+from app.database import get_db, get_read_db, Base
 from app.models.user import User
 from app.models.fond import Fond
 from app.core.security import get_password_hash
+from app.services.change_log import change_log
+from app.services.events import fond_events
+from app.services.name_suggestions import suggestion_index
+from app.services.login_throttle import login_throttle
+from app.services.token_revocation import revocation_list
+from app.services.token_versions import token_versions
 
 # Test database setup
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -41,6 +47,12 @@ def override_get_db():
         db.close()
 
 app.dependency_overrides[get_db] = override_get_db
+# O singură bază in-memory în teste: get_read_db folosește aceeași sesiune
+app.dependency_overrides[get_read_db] = override_get_db
+# Change log-ul scrie cu propria sesiune, tot în baza de test
+change_log.session_factory = TestingSessionLocal
+# La fel rebuild-ul de fundal al indexului de typeahead
+suggestion_index.session_factory = TestingSessionLocal
 
 # Event loop fixture
 @pytest.fixture(scope="session")
@@ -59,6 +71,13 @@ def setup_test_db():
     """Setup fresh database for each test."""
     # Create all tables
     Base.metadata.create_all(bind=engine)
+    # Cache-urile in-process nu trebuie să supraviețuiască între teste
+    suggestion_index.reset()
+    token_versions.invalidate()
+    revocation_list.reset()
+    login_throttle.reset()
+    change_log.reset()
+    fond_events.reset()
     yield
     # Clean up after each test
     Base.metadata.drop_all(bind=engine)
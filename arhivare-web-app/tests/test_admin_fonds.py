@@ -0,0 +1,62 @@
+# tests/test_admin_fonds.py - Admin fond endpoints
+import pytest
+from httpx import AsyncClient
+
+
+class TestAdminFondsSearch:
+    """Test suite pentru /admin/fonds/search cu fațete."""
+
+    @pytest.mark.asyncio
+    async def test_search_returns_facets_from_text_match(
+        self, client: AsyncClient, auth_headers, sample_fonds, regular_user, db_session
+    ):
+        """Test fațetele: asignat/neasignat, activ/inactiv și top owneri."""
+        sample_fonds[0].owner_id = regular_user.id
+        sample_fonds[1].owner_id = regular_user.id
+        db_session.commit()
+
+        response = await client.get(
+            "/admin/fonds/search", params={"query": "arhiva", "facets": True}, headers=auth_headers
+        )
+        assert response.status_code == 200
+        data = response.json()
+
+        # "arhiva" se potrivește cu holder_name-ul fondurilor 0, 2 și 3 (3 e inactiv)
+        assert data["total"] == 3
+        assert data["facets"]["assignment"] == {"assigned": 1, "unassigned": 2}
+        assert data["facets"]["active"] == {"active": 2, "inactive": 1}
+        assert data["facets"]["owners"] == [{
+            "owner_id": regular_user.id,
+            "username": regular_user.username,
+            "company_name": None,
+            "count": 1
+        }]
+
+    @pytest.mark.asyncio
+    async def test_filters_apply_to_results_not_facets(
+        self, client: AsyncClient, auth_headers, sample_fonds, regular_user, db_session
+    ):
+        """Test că filtrele restrâng rezultatele și totalul, dar nu fațetele."""
+        sample_fonds[0].owner_id = regular_user.id
+        db_session.commit()
+
+        response = await client.get(
+            "/admin/fonds/search",
+            params={"assigned": False, "active": True, "facets": True},
+            headers=auth_headers
+        )
+        data = response.json()
+
+        assert data["total"] == 2
+        assert [fond["id"] for fond in data["results"]] == [sample_fonds[1].id, sample_fonds[2].id]
+        assert data["facets"]["assignment"] == {"assigned": 1, "unassigned": 3}
+
+    @pytest.mark.asyncio
+    async def test_facets_are_optional_and_admin_only(self, client: AsyncClient, auth_headers, user_headers, sample_fonds):
+        """Test că fațetele lipsesc implicit și clienții primesc 403."""
+        response = await client.get("/admin/fonds/search", headers=auth_headers)
+        assert response.status_code == 200
+        assert "facets" not in response.json()
+
+        response = await client.get("/admin/fonds/search", headers=user_headers)
+        assert response.status_code == 403
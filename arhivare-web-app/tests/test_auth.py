@@ -1,6 +1,7 @@
 # tests/test_auth.py - FIXED VERSION
 import pytest
 from httpx import AsyncClient
+from sqlalchemy.orm import Session
 from app.models.user import User
 from app.core.security import get_password_hash
 
@@ -142,6 +143,310 @@ class TestProtectedEndpoints:
         except Exception as e:
             pytest.fail(f"Token should be valid: {e}")
 
+class TestTokenClaims:
+    """Test suite pentru token-urile îmbogățite (uid/role/ver) și get_current_principal."""
+    
+    @pytest.mark.asyncio
+    async def test_login_token_carries_uid_role_and_version(self, client: AsyncClient, admin_user: User):
+        """Test că token-ul emis la login conține uid, role și ver."""
+        from app.core.security import decode_token
+        
+        response = await client.post("/auth/login", json={"username": admin_user.username, "password": "testpassword"})
+        payload = decode_token(response.json()["access_token"])
+        assert payload["sub"] == admin_user.username
+        assert payload["uid"] == admin_user.id
+        assert payload["role"] == "admin"
+        assert payload["ver"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_read_only_route_skips_user_lookup_when_cached(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        """Test că după primul request, /auth/me nu mai face SELECT pe users."""
+        from sqlalchemy import event
+        from tests.conftest import engine
+        
+        statements = []
+        
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if "FROM users" in statement:
+                statements.append(statement)
+        
+        await client.get("/auth/me", headers=auth_headers)
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            response = await client.get("/auth/me", headers=auth_headers)
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+        
+        assert response.status_code == 200
+        assert response.json()["role"] == "admin"
+        assert statements == []
+    
+    @pytest.mark.asyncio
+    async def test_role_change_revokes_existing_tokens(
+        self, client: AsyncClient, user_headers: dict, regular_user: User, db_session
+    ):
+        """Test că schimbarea rolului invalidează token-urile emise anterior."""
+        response = await client.get("/auth/me", headers=user_headers)
+        assert response.status_code == 200
+        
+        regular_user.role = "audit"
+        db_session.commit()
+        assert regular_user.token_version == 1
+        
+        response = await client.get("/auth/me", headers=user_headers)
+        assert response.status_code == 401
+        response = await client.get("/auth/protected", headers=user_headers)
+        assert response.status_code == 401
+    
+    @pytest.mark.asyncio
+    async def test_deleted_user_token_is_rejected(
+        self, client: AsyncClient, user_headers: dict, regular_user: User, db_session
+    ):
+        """Test că token-ul unui utilizator șters nu mai este acceptat."""
+        assert (await client.get("/fonds/", headers=user_headers)).status_code == 200
+        
+        db_session.delete(regular_user)
+        db_session.commit()
+        
+        response = await client.get("/fonds/", headers=user_headers)
+        assert response.status_code == 401
+    
+    @pytest.mark.asyncio
+    async def test_legacy_token_without_claims_still_works(self, client: AsyncClient, admin_user: User):
+        """Test că token-urile vechi (doar `sub`) sunt acceptate prin lookup complet."""
+        from app.core.security import create_access_token
+        
+        headers = {"Authorization": f"Bearer {create_access_token(subject=admin_user.username)}"}
+        response = await client.get("/auth/me", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["id"] == admin_user.id
+
+class TestRefreshAndLogout:
+    """Test suite pentru refresh token-uri rotative și revocarea după jti."""
+    
+    @staticmethod
+    async def _login(client: AsyncClient, user: User) -> dict:
+        response = await client.post("/auth/login", json={"username": user.username, "password": "testpassword"})
+        assert response.status_code == 200
+        return response.json()
+    
+    @pytest.mark.asyncio
+    async def test_refresh_rotates_and_rejects_old_token(self, client: AsyncClient, admin_user: User, db_session):
+        """Test că refresh emite o pereche nouă și token-ul vechi nu mai poate fi folosit."""
+        from app.models.auth_token import RefreshToken
+        
+        tokens = await self._login(client, admin_user)
+        stored = db_session.query(RefreshToken).one()
+        assert stored.token_hash != tokens["refresh_token"]
+        
+        response = await client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+        assert response.status_code == 200
+        rotated = response.json()
+        assert rotated["refresh_token"] != tokens["refresh_token"]
+        assert rotated["user"]["id"] == admin_user.id
+        
+        response = await client.get("/auth/me", headers={"Authorization": f"Bearer {rotated['access_token']}"})
+        assert response.status_code == 200
+        
+        response = await client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+        assert response.status_code == 401
+    
+    @pytest.mark.asyncio
+    async def test_refresh_token_reuse_revokes_family(self, client: AsyncClient, admin_user: User):
+        """Test că reutilizarea unui refresh token rotit invalidează și token-ul emis după el."""
+        tokens = await self._login(client, admin_user)
+        rotated = (await client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})).json()
+        
+        await client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+        
+        response = await client.post("/auth/refresh", json={"refresh_token": rotated["refresh_token"]})
+        assert response.status_code == 401
+    
+    @pytest.mark.asyncio
+    async def test_logout_revokes_access_and_refresh_tokens(self, client: AsyncClient, admin_user: User):
+        """Test că după logout nici access token-ul, nici refresh token-ul nu mai sunt acceptate."""
+        tokens = await self._login(client, admin_user)
+        headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+        
+        response = await client.post("/auth/logout", json={"refresh_token": tokens["refresh_token"]}, headers=headers)
+        assert response.status_code == 204
+        
+        assert (await client.get("/auth/me", headers=headers)).status_code == 401
+        assert (await client.get("/fonds/", headers=headers)).status_code == 401
+        response = await client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+        assert response.status_code == 401
+        
+        # O sesiune nouă nu este afectată
+        fresh = await self._login(client, admin_user)
+        response = await client.get("/auth/me", headers={"Authorization": f"Bearer {fresh['access_token']}"})
+        assert response.status_code == 200
+    
+    @pytest.mark.asyncio
+    async def test_revocation_check_does_not_query_database(self, client: AsyncClient, auth_headers: dict):
+        """Test că, între sincronizări, verificarea jti nu citește revoked_tokens."""
+        from sqlalchemy import event
+        from tests.conftest import engine
+        
+        statements = []
+        
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if "revoked_tokens" in statement:
+                statements.append(statement)
+        
+        await client.get("/auth/me", headers=auth_headers)
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            for _ in range(3):
+                assert (await client.get("/auth/me", headers=auth_headers)).status_code == 200
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+        
+        assert statements == []
+    
+    def test_revocation_list_prunes_expired_entries(self):
+        """Test că intrările expirate dispar din listă la prune."""
+        import time
+        from app.services.token_revocation import RevocationList
+        
+        revoked = RevocationList(capacity=100, sync_interval=60, sync_margin=60)
+        revoked.revoke("live", time.time() + 60)
+        revoked.revoke("expired", time.time() - 1)
+        
+        assert revoked.is_revoked("live")
+        assert not revoked.is_revoked("expired")
+        assert not revoked.is_revoked("never-revoked")
+        assert revoked.prune() == 1
+        assert revoked.is_revoked("live")
+        
+        # Fără intrări expirate filtrul nu e realocat
+        bloom = revoked._bloom
+        assert revoked.prune() == 0
+        assert revoked._bloom is bloom
+    
+    def test_revocation_sync_sees_late_commits_with_lower_ids(self, db_session: Session):
+        """Test că un logout comis după o sincronizare, cu id mai mic, nu e ratat."""
+        from datetime import datetime, timedelta, timezone
+        from app.models.auth_token import RevokedToken
+        from app.services.token_revocation import RevocationList
+        
+        revoked = RevocationList(capacity=100, sync_interval=60, sync_margin=60)
+        now = datetime.now(timezone.utc)
+        expires = now + timedelta(minutes=10)
+        db_session.add(RevokedToken(id=2, jti="second", expires_at=expires, revoked_at=now))
+        db_session.commit()
+        revoked.sync_if_due(db_session)
+        assert revoked.is_revoked("second")
+        
+        # Tranzacția cu id=1 a început înainte de sync, dar e comisă abia acum
+        db_session.add(RevokedToken(id=1, jti="first", expires_at=expires, revoked_at=now - timedelta(seconds=5)))
+        db_session.commit()
+        revoked._synced_at = None
+        revoked.sync_if_due(db_session)
+        assert revoked.is_revoked("first")
+        assert revoked.is_revoked("second")
+
+class TestLoginThrottling:
+    """Test suite pentru throttling-ul /auth/login (token buckets + lockout)."""
+    
+    @pytest.mark.asyncio
+    async def test_excess_attempts_rejected_before_bcrypt(
+        self, client: AsyncClient, admin_user: User, monkeypatch
+    ):
+        """Test că încercările peste burst primesc 429 fără verify_password."""
+        from app.api import auth
+        from app.core.config import settings
+        
+        monkeypatch.setattr(settings, "LOGIN_BURST_PER_USERNAME", 3)
+        monkeypatch.setattr(settings, "LOGIN_LOCKOUT_THRESHOLD", 100)
+        verifications = []
+        original_verify = auth.verify_password
+        monkeypatch.setattr(auth, "verify_password", lambda *args: verifications.append(1) or original_verify(*args))
+        
+        statuses = []
+        for _ in range(5):
+            response = await client.post("/auth/login", json={"username": admin_user.username, "password": "wrong"})
+            statuses.append(response.status_code)
+        
+        assert statuses == [401, 401, 401, 429, 429]
+        assert len(verifications) == 3
+        assert int(response.headers["Retry-After"]) >= 1
+    
+    @pytest.mark.asyncio
+    async def test_lockout_blocks_correct_password_until_expiry(
+        self, client: AsyncClient, admin_user: User, monkeypatch
+    ):
+        """Test că după pragul de eșecuri contul e blocat chiar și cu parola corectă."""
+        from app.core.config import settings
+        
+        monkeypatch.setattr(settings, "LOGIN_LOCKOUT_THRESHOLD", 2)
+        for _ in range(2):
+            await client.post("/auth/login", json={"username": admin_user.username, "password": "wrong"})
+        
+        response = await client.post("/auth/login", json={"username": admin_user.username, "password": "testpassword"})
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) <= settings.LOGIN_LOCKOUT_BASE_SECONDS
+    
+    @pytest.mark.asyncio
+    async def test_success_resets_failure_count(self, client: AsyncClient, admin_user: User, monkeypatch):
+        """Test că un login reușit resetează contorul de eșecuri."""
+        from app.core.config import settings
+        
+        monkeypatch.setattr(settings, "LOGIN_LOCKOUT_THRESHOLD", 2)
+        await client.post("/auth/login", json={"username": admin_user.username, "password": "wrong"})
+        response = await client.post("/auth/login", json={"username": admin_user.username, "password": "testpassword"})
+        assert response.status_code == 200
+        
+        await client.post("/auth/login", json={"username": admin_user.username, "password": "wrong"})
+        response = await client.post("/auth/login", json={"username": admin_user.username, "password": "testpassword"})
+        assert response.status_code == 200
+    
+    @pytest.mark.asyncio
+    async def test_ip_bucket_spans_usernames(self, client: AsyncClient, monkeypatch):
+        """Test că bucket-ul per IP limitează și încercările pe username-uri diferite."""
+        from app.core.config import settings
+        
+        monkeypatch.setattr(settings, "LOGIN_BURST_PER_IP", 2)
+        statuses = []
+        for index in range(3):
+            response = await client.post("/auth/login", json={"username": f"spray_{index}", "password": "x"})
+            statuses.append(response.status_code)
+        assert statuses == [401, 401, 429]
+    
+    def test_bucket_refills_over_time(self):
+        """Test că bucket-ul din memorie se reumple cu rata configurată."""
+        from app.services.login_throttle import MemoryThrottleBackend
+        
+        backend = MemoryThrottleBackend()
+        assert backend.take("k", rate=1.0, burst=2, now=100.0) == 0
+        assert backend.take("k", rate=1.0, burst=2, now=100.0) == 0
+        assert backend.take("k", rate=1.0, burst=2, now=100.0) == pytest.approx(1.0)
+        assert backend.take("k", rate=1.0, burst=2, now=101.5) == 0
+    
+    def test_eviction_uses_each_bucket_parameters(self):
+        """Test că evicția decide "plin" cu rate/burst-ul fiecărui bucket, nu al cheii noi."""
+        from app.services.login_throttle import MemoryThrottleBackend
+        
+        backend = MemoryThrottleBackend(max_keys=2)
+        backend.take("user:alice", rate=0.1, burst=5, now=100.0)  # 4/5 - încă util
+        backend.take("ip:1.1.1.1", rate=10.0, burst=2, now=100.0)  # reumplut după 0.1s
+        backend.take("ip:2.2.2.2", rate=10.0, burst=2, now=101.0)
+        
+        assert set(backend._buckets) == {"user:alice", "ip:2.2.2.2"}
+    
+    def test_locks_are_bounded(self):
+        """Test că lock-urile expirate dispar și dict-ul nu crește peste max_keys."""
+        from app.services.login_throttle import MemoryThrottleBackend
+        
+        backend = MemoryThrottleBackend(max_keys=4)
+        for index in range(4):
+            backend.lock(f"user:{index}", seconds=10 + index, now=0.0)
+        backend.lock("user:new", seconds=60, now=5.0)
+        assert len(backend._locks) <= 4
+        assert backend.locked_for("user:new", now=5.0) == pytest.approx(60)
+        assert backend.locked_for("user:3", now=100.0) == 0.0
+
 class TestUserManagement:
     """Test suite pentru management user - compatibil cu modelul real."""
     
@@ -0,0 +1,211 @@
+# tests/test_change_log.py - Write-behind fond change log
+import time
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.crud.fond import create_fond, permanently_delete_fond, soft_delete_fond, update_fond
+from app.models.fond import Fond
+from app.models.fond_change import FondChange
+from app.models.user import User
+from app.schemas.fond import FondCreate, FondUpdate
+from app.services.assignment_service import AssignmentService
+from app.services.change_log import ChangeLogWriter, change_log, fond_change
+from tests.conftest import TestingSessionLocal, engine
+
+
+def logged_changes(db_session: Session):
+    db_session.expire_all()
+    return db_session.query(FondChange).order_by(FondChange.id).all()
+
+
+def flush_counting_inserts() -> list:
+    """change_log.flush(), întorcând (executemany, rânduri) pentru fiecare INSERT în fond_changes"""
+    inserts = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO fond_changes"):
+            inserts.append((executemany, len(parameters)))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        change_log.flush()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return inserts
+
+
+def make_writer(**kwargs) -> ChangeLogWriter:
+    options = dict(max_queue=10, batch_size=5, flush_interval=0.05, session_factory=TestingSessionLocal)
+    options.update(kwargs)
+    return ChangeLogWriter(**options)
+
+
+class TestChangeLogHooks:
+    """Fond mutations are queued after commit and written on flush."""
+
+    def test_update_fond_records_changed_fields(self, db_session: Session, sample_fonds: list[Fond], admin_user: User):
+        """Only fields whose value changed are logged, with the actor."""
+        fond = sample_fonds[0]
+        update_fond(
+            db_session, fond.id,
+            FondUpdate(holder_name="Arhiva Nouă", phone=fond.phone),
+            actor_id=admin_user.id,
+        )
+
+        assert logged_changes(db_session) == []  # write-behind: nimic înainte de flush
+        assert change_log.flush() == 1
+
+        [entry] = logged_changes(db_session)
+        assert entry.fond_id == fond.id
+        assert entry.actor_id == admin_user.id
+        assert entry.action == "updated"
+        assert entry.changes == {"holder_name": ["Arhiva Națională Brașov", "Arhiva Nouă"]}
+        assert entry.changed_at is not None
+
+    def test_assign_fond_records_owner_change(self, db_session: Session, sample_fonds: list[Fond],
+                                              regular_user: User, admin_user: User):
+        """Assignment logs owner_id old/new; a no-op assignment logs nothing."""
+        service = AssignmentService(db_session, actor_id=admin_user.id)
+        assert service.assign_fond_to_user(sample_fonds[0].id, regular_user.id)["success"]
+        assert service.assign_fond_to_user(sample_fonds[1].id, None)["action"] == "no_change"
+        change_log.flush()
+
+        [entry] = logged_changes(db_session)
+        assert entry.action == "assigned"
+        assert entry.changes == {"owner_id": [None, regular_user.id]}
+        assert entry.actor_id == admin_user.id
+
+    def test_bulk_assignment_is_one_batched_insert(self, db_session: Session, sample_fonds: list[Fond],
+                                                   regular_user: User):
+        """Bulk assignment writes all its rows with a single executemany."""
+        fond_ids = [fond.id for fond in sample_fonds[:3]]
+        result = AssignmentService(db_session).bulk_assign_fonds(fond_ids + [99999], regular_user.id)
+        assert result["successful_assignments"] == 3
+        assert result["failed_assignments"] == 1
+
+        assert flush_counting_inserts() == [(True, 3)]
+        assert sorted(entry.fond_id for entry in logged_changes(db_session)) == sorted(fond_ids)
+
+    def test_create_and_soft_delete_record_actor(self, db_session: Session, admin_user: User):
+        """create_fond logs the filled fields, soft_delete_fond the active flip; both with the actor."""
+        fond = create_fond(
+            db_session, FondCreate(company_name="Faur SA", holder_name="Arhiva București"), actor_id=admin_user.id
+        )
+        assert soft_delete_fond(db_session, fond.id, actor_id=admin_user.id)
+        assert soft_delete_fond(db_session, fond.id, actor_id=admin_user.id)  # deja inactiv: nimic nou
+        change_log.flush()
+
+        created, deleted = logged_changes(db_session)
+        assert (created.action, created.actor_id) == ("created", admin_user.id)
+        assert created.changes["company_name"] == [None, "Faur SA"]
+        assert created.changes["active"] == [None, True]
+        assert "owner_id" not in created.changes
+        assert (deleted.action, deleted.actor_id) == ("deleted", admin_user.id)
+        assert deleted.changes == {"active": [True, False]}
+
+    @pytest.mark.asyncio
+    async def test_permanent_delete_records_old_values(self, client: AsyncClient, auth_headers: dict,
+                                                       db_session: Session, sample_fonds: list[Fond],
+                                                       admin_user: User):
+        """DELETE ?permanent=true logs a 'purged' row with every old value and the admin as actor."""
+        fond_id = sample_fonds[0].id
+        response = await client.delete(f"/fonds/{fond_id}", params={"permanent": "true"}, headers=auth_headers)
+        assert response.status_code == 204
+        assert not permanently_delete_fond(db_session, fond_id, actor_id=admin_user.id)  # deja șters: nimic nou
+        change_log.flush()
+
+        [entry] = logged_changes(db_session)
+        assert (entry.fond_id, entry.action, entry.actor_id) == (fond_id, "purged", admin_user.id)
+        assert entry.changes["company_name"] == ["Tractorul Brașov SA", None]
+        assert entry.changes["holder_name"] == ["Arhiva Națională Brașov", None]
+        assert entry.changes["active"] == [True, None]
+        assert "id" not in entry.changes
+
+    @pytest.mark.asyncio
+    async def test_batch_endpoint_is_one_grouped_insert(self, client: AsyncClient, auth_headers: dict,
+                                                        db_session: Session, sample_fonds: list[Fond],
+                                                        admin_user: User, regular_user: User):
+        """POST /fonds/batch logs every created/updated/deleted fond with old/new values in one executemany."""
+        response = await client.post("/fonds/batch", json={"operations": [
+            {"op": "create", "data": {"company_name": "Faur SA", "holder_name": "Arhiva București"}},
+            {"op": "update", "id": sample_fonds[0].id, "data": {"holder_name": "Arhivele Naționale Brașov"}},
+            {"op": "update", "id": sample_fonds[1].id, "data": {"owner_id": regular_user.id}},
+            {"op": "delete", "id": sample_fonds[2].id},
+            {"op": "delete", "id": sample_fonds[3].id},
+        ]}, headers=auth_headers)
+        assert response.status_code == 200
+        new_id = response.json()["results"][0]["id"]
+
+        # sample_fonds[3] era deja inactiv: ștergerea lui nu schimbă nimic, deci nu e logată
+        assert flush_counting_inserts() == [(True, 4)]
+
+        entries = {entry.fond_id: entry for entry in logged_changes(db_session)}
+        assert set(entries) == {new_id, sample_fonds[0].id, sample_fonds[1].id, sample_fonds[2].id}
+        assert all(entry.actor_id == admin_user.id for entry in entries.values())
+        assert entries[new_id].action == "created"
+        assert entries[sample_fonds[0].id].changes == {
+            "holder_name": ["Arhiva Națională Brașov", "Arhivele Naționale Brașov"]
+        }
+        assert entries[sample_fonds[1].id].action == "owner_changed"
+        assert entries[sample_fonds[1].id].changes == {"owner_id": [None, regular_user.id]}
+        assert entries[sample_fonds[2].id].action == "deleted"
+        assert entries[sample_fonds[2].id].changes == {"active": [True, False]}
+
+    @pytest.mark.asyncio
+    async def test_assign_owner_endpoint_records_admin(self, client: AsyncClient, auth_headers: dict,
+                                                       db_session: Session, sample_fonds: list[Fond],
+                                                       admin_user: User, regular_user: User):
+        """The admin assign-owner route logs the admin as actor."""
+        response = await client.post(
+            f"/admin/fonds/{sample_fonds[0].id}/assign-owner",
+            json={"owner_id": regular_user.id}, headers=auth_headers,
+        )
+        assert response.status_code == 200
+        change_log.flush()
+
+        [entry] = logged_changes(db_session)
+        assert entry.actor_id == admin_user.id
+        assert entry.action == "assigned"
+
+
+class TestChangeLogWriter:
+    """Batching, backpressure and shutdown flush."""
+
+    def test_background_thread_flushes_within_interval(self, db_session: Session):
+        writer = make_writer()
+        writer.start()
+        try:
+            writer.record([fond_change(1, "updated", {"notes": ("a", "b")})])
+            deadline = time.monotonic() + 2
+            while writer.written == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            writer.stop()
+        assert writer.written == 1
+        assert len(logged_changes(db_session)) == 1
+
+    def test_stop_flushes_pending_rows(self, db_session: Session):
+        writer = make_writer(flush_interval=60)
+        writer.start()
+        writer.record([fond_change(fond_id, "updated", {"notes": (None, "x")}) for fond_id in range(3)])
+        writer.stop()
+        assert writer.pending == 0
+        assert len(logged_changes(db_session)) == 3
+
+    def test_drop_policy_discards_when_full(self, db_session: Session):
+        writer = make_writer(max_queue=4, overflow_policy="drop")
+        writer.record([fond_change(1, "updated", {"notes": (None, "x")})] * 3)
+        writer.record([fond_change(2, "updated", {"notes": (None, "y")})] * 2)
+        assert writer.pending == 3
+        assert writer.dropped == 2
+
+    def test_block_policy_writes_inline_after_timeout(self, db_session: Session):
+        """No writer thread frees room, so the caller ends up writing its own rows."""
+        writer = make_writer(max_queue=4, overflow_policy="block", block_seconds=0.05)
+        writer.record([fond_change(1, "updated", {"notes": (None, "x")})] * 3)
+        writer.record([fond_change(2, "updated", {"notes": (None, "y")})] * 2)
+        assert writer.pending == 3
+        assert [entry.fond_id for entry in logged_changes(db_session)] == [2, 2]
@@ -0,0 +1,146 @@
+# tests/test_company_names.py - Shared company name normalization
+from sqlalchemy import event, insert, update
+
+from app.services.company_names import (
+    fold_diacritics, normalize_company_name, match_key, significant_words, clear_caches, with_stored_keys
+)
+from app.services.assignment_service import AssignmentService
+from app.api.routes.fonds import find_client_by_company_name
+from app.models.user import User
+from app.models.fond import Fond
+
+
+class TestCompanyNameNormalization:
+    """Test suite for the shared normalization helpers."""
+
+    def test_fold_diacritics_handles_both_romanian_variants(self):
+        """Test comma-below and cedilla variants fold to ASCII."""
+        assert fold_diacritics("Brașov Brasşov Ţara Țării") == "Brasov Brassov Tara Tarii"
+        assert fold_diacritics("Café") == "Cafe"
+
+    def test_normalize_strips_legal_forms_and_punctuation(self):
+        """Test that leading/trailing legal forms and punctuation are removed."""
+        assert normalize_company_name("SC Tractorul Brașov SRL") == "tractorul brasov"
+        assert normalize_company_name("  Steagul   Roșu, Brașov SA ") == "steagul rosu brasov"
+        assert normalize_company_name("") == ""
+
+    def test_normalize_is_memoized(self):
+        """Test that repeated names hit the cache."""
+        clear_caches()
+        normalize_company_name("Rulmentul Brașov SA")
+        normalize_company_name("Rulmentul Brașov SA")
+        info = normalize_company_name.cache_info()
+        assert info.hits == 1
+        assert info.misses == 1
+
+    def test_match_key_ignores_case_and_diacritics(self):
+        """Test that match keys compare equal across diacritic spellings."""
+        assert match_key("Arhiva Națională Brașov") == match_key("ARHIVA NATIONALA  BRASOV")
+
+    def test_significant_words_drop_legal_forms(self):
+        """Test that legal forms are dropped anywhere in the name."""
+        assert significant_words("SC Carbochim Cluj SA") == frozenset({"carbochim", "cluj"})
+
+    def test_service_uses_shared_normalization(self):
+        """Test that AssignmentService delegates to the shared helpers."""
+        service = AssignmentService(db=None)
+        a = service._normalize_company_name("Tractorul Brașov SA")
+        b = service._normalize_company_name("TRACTORUL BRASOV")
+        assert service._calculate_similarity(a, b) == 1.0
+
+
+class TestNormalizedOwnerColumns:
+    """Test suite for the persisted normalized-name columns."""
+
+    def test_columns_are_maintained_on_write(self, db_session):
+        """Test that ORM writes keep the normalized columns in sync."""
+        user = User(username="norm_client", password_hash="x", role="client", company_name="Tractorul  BRAȘOV SA")
+        fond = Fond(company_name="Fond", holder_name="Arhiva Națională Brașov")
+        db_session.add_all([user, fond])
+        db_session.commit()
+        assert user.company_name_normalized == "tractorul brasov sa"
+        assert fond.holder_name_normalized == "arhiva nationala brasov"
+
+        user.company_name = None
+        db_session.commit()
+        assert user.company_name_normalized is None
+
+    def test_bulk_insert_fills_normalized_column(self, db_session):
+        """Test that Core/bulk inserts get the column default."""
+        db_session.execute(insert(User), [
+            {"username": "bulk_client", "password_hash": "x", "role": "client", "company_name": "Oltchim Râmnicu Vâlcea"},
+        ])
+        db_session.commit()
+        user = db_session.query(User).filter(User.username == "bulk_client").one()
+        assert user.company_name_normalized == "oltchim ramnicu valcea"
+
+    def test_bulk_update_keeps_normalized_column_in_sync(self, db_session):
+        """Test that session-executed bulk UPDATEs maintain the normalized columns."""
+        fonds = [Fond(company_name="F1", holder_name="Vechi"), Fond(company_name="F2", holder_name="Vechi")]
+        db_session.add_all(fonds)
+        db_session.commit()
+
+        db_session.execute(update(Fond), [{"id": fonds[0].id, "holder_name": "Arhiva Brașov"}])
+        db_session.execute(
+            update(Fond).where(Fond.id == fonds[1].id).values(**with_stored_keys(Fond, {"holder_name": "Muzeul Țării"}))
+        )
+        db_session.execute(update(User).where(User.id == -1).values(**with_stored_keys(User, {"company_name": "Oricare"})))
+        db_session.commit()
+
+        keys = dict(db_session.query(Fond.id, Fond.holder_name_normalized).all())
+        assert keys == {fonds[0].id: "arhiva brasov", fonds[1].id: "muzeul tarii"}
+
+    def test_suggestion_index_reads_stored_holder_key(self, db_session):
+        """Test that typeahead uses the persisted holder key instead of recomputing it."""
+        from app.services.name_suggestions import suggestion_index
+
+        db_session.add(Fond(company_name="Firma", holder_name="Arhiva Sibiu"))
+        db_session.commit()
+        db_session.execute(update(Fond).values(holder_name_normalized="cheie stocata"))
+        db_session.commit()
+
+        suggestion_index.rebuild(db_session)
+        assert suggestion_index.suggest("cheie") == [{"name": "Arhiva Sibiu", "type": "holder"}]
+
+    def test_find_client_uses_normalized_column(self, db_session):
+        """Test exact, substring and word-overlap strategies on the stored keys."""
+        first = User(username="c1", password_hash="x", role="client", company_name="Rulmentul Brașov SA")
+        second = User(username="c2", password_hash="x", role="client", company_name="Carbochim Cluj SRL")
+        db_session.add_all([first, second])
+        db_session.commit()
+
+        assert find_client_by_company_name(db_session, "RULMENTUL BRASOV SA").id == first.id
+        assert find_client_by_company_name(db_session, "Arhiva Carbochim Cluj SRL").id == second.id
+        assert find_client_by_company_name(db_session, "Carbochim Cluj Grup SA").id == second.id
+        assert find_client_by_company_name(db_session, "Muzeul Județean 100%") is None
+
+    def test_substring_prefilter_treats_stored_names_literally(self, db_session):
+        """Test that `_` in a stored client name is not a LIKE wildcard when matching the holder against it."""
+        client = User(username="c4", password_hash="x", role="client", company_name="A_C")
+        db_session.add(client)
+        db_session.commit()
+        assert client.company_name_normalized == "a_c"
+        db_session.expunge_all()
+
+        loaded = []
+        listener = lambda target, context: loaded.append(target.username)
+        event.listen(User, "load", listener)
+        try:
+            assert find_client_by_company_name(db_session, "Xabcx") is None
+            assert find_client_by_company_name(db_session, "Xa_cx").username == "c4"
+        finally:
+            event.remove(User, "load", listener)
+        assert loaded == ["c4"]  # "a_c" nu mai e candidat pentru "xabcx"
+
+    def test_word_overlap_removes_legal_forms_as_whole_words(self, db_session):
+        """
+        Test the strategy-3 behavior change: legal forms are removed as whole words.
+        The old substring replace turned "casa verde srl" into "caverde" (one word),
+        so this holder matched no client; now it matches on {"casa", "verde"}.
+        """
+        client = User(username="c3", password_hash="x", role="client", company_name="Casa Verde Grup")
+        db_session.add(client)
+        db_session.commit()
+
+        assert significant_words("Casa Sănătății SRL") == frozenset({"casa", "sanatatii"})
+        assert find_client_by_company_name(db_session, "Casa Verde SRL").id == client.id
@@ -1,5 +1,6 @@
 # tests/test_crud.py
 import pytest
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 from app.models.fond import Fond
@@ -7,8 +8,9 @@ from app.models.user import User
 from app.schemas.fond import FondCreate, FondUpdate
 from app.schemas.user import UserCreate, UserUpdate
 from app.crud.fond import (
-    create_fond, get_fond, get_fonds, search_fonds,
-    update_fond, soft_delete_fond, get_fonds_count
+    create_fond, get_fond, get_fonds, search_fonds, get_my_fonds,
+    update_fond, soft_delete_fond, get_fonds_count,
+    get_fonds_for_user, search_fonds_for_user, count_search_results, search_fonds_with_snippets
 )
 from app.crud.user import (
     create_user, get_user_by_id, get_user_by_username,
@@ -158,6 +160,70 @@ class TestFondCRUD:
         expected_active = sum(1 for f in sample_fonds if f.active)
         assert active_count == expected_active
 
+    def test_hot_queries_reuse_statements(self, db_session: Session, sample_fonds: list[Fond], admin_user: User):
+        """List/search/lookup calls with new values execute the same prebuilt statement object."""
+        calls = [
+            lambda query, page: search_fonds(db_session, query, skip=page, limit=10),
+            lambda query, page: get_fonds(db_session, skip=page, limit=10, owner_id=admin_user.id),
+            lambda query, page: get_my_fonds(db_session, owner_id=admin_user.id + page, skip=page),
+            lambda query, page: get_user_by_username(db_session, query),
+            lambda query, page: get_fonds_for_user(db_session, admin_user, skip=page, limit=10),
+            lambda query, page: search_fonds_for_user(db_session, admin_user, query, skip=page),
+        ]
+        for call in calls:
+            statements = []
+
+            def record(orm_execute_state):
+                statements.append(orm_execute_state.statement)
+
+            event.listen(db_session, "do_orm_execute", record)
+            try:
+                call("Brașov", 0)
+                call("Company", 1)
+            finally:
+                event.remove(db_session, "do_orm_execute", record)
+
+            assert len(statements) == 2
+            assert statements[0] is statements[1]
+
+    def test_search_paths_share_one_predicate(self, db_session: Session, sample_fonds: list[Fond]):
+        """The prebuilt search, the count and the snippet query match the same rows."""
+        for query in ("Brașov", "SA", "arhiva", "inexistent"):
+            ids = [f.id for f in search_fonds(db_session, query, limit=100)]
+            snippet_ids = [row[0].id for row in search_fonds_with_snippets(db_session, query, 20, limit=100)]
+            assert sorted(ids) == sorted(snippet_ids)
+            assert count_search_results(db_session, query) == len(ids)
+
+    def test_get_fonds_owner_filters(self, db_session: Session, sample_fonds: list[Fond], regular_user: User):
+        """owner_id=0 selects unassigned fonds, any other id that owner's fonds."""
+        sample_fonds[0].owner_id = regular_user.id
+        db_session.commit()
+
+        owned = get_fonds(db_session, owner_id=regular_user.id, active_only=False)
+        unassigned = get_fonds(db_session, owner_id=0, active_only=False)
+
+        assert [f.id for f in owned] == [sample_fonds[0].id]
+        assert [f.id for f in owned] == [f.id for f in get_my_fonds(db_session, regular_user.id, active_only=False)]
+        assert len(unassigned) == len(sample_fonds) - 1
+
+    def test_user_scoped_listings(self, db_session: Session, sample_fonds: list[Fond],
+                                  admin_user: User, regular_user: User):
+        """Clients list and search only their own fonds, admins everything, unknown roles nothing."""
+        sample_fonds[0].owner_id = regular_user.id
+        db_session.commit()
+        other_client = User(id=regular_user.id + 100, username="alt_client", password_hash="x", role="client")
+        unknown = User(id=regular_user.id + 101, username="ghost", password_hash="x", role="ghost")
+        query = sample_fonds[0].company_name
+
+        assert [f.id for f in get_fonds_for_user(db_session, regular_user)] == [sample_fonds[0].id]
+        assert [f.id for f in search_fonds_for_user(db_session, regular_user, query)] == [sample_fonds[0].id]
+        assert len(get_fonds_for_user(db_session, admin_user, active_only=False)) == len(sample_fonds)
+        assert [f.id for f in search_fonds_for_user(db_session, admin_user, query)] == [sample_fonds[0].id]
+        for user in (other_client, unknown):
+            assert get_fonds_for_user(db_session, user) == []
+            assert search_fonds_for_user(db_session, user, query) == []
+    
+
 class TestUserCRUD:
     """Test suite for User CRUD operations."""
     
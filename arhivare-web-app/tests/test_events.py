@@ -0,0 +1,269 @@
+# tests/test_events.py - SSE dashboard events
+import asyncio
+import json
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.security import create_stream_ticket
+from app.crud.fond import update_fond
+from app.main import app
+from app.models.fond import Fond
+from app.models.user import User
+from app.schemas.fond import FondUpdate
+from app.services.assignment_service import AssignmentService
+from app.services.events import (
+    FondEvent, EventBroadcaster, PostgresEventListener, _notify_batches, fond_events,
+)
+
+
+async def drain(subscription, timeout: float = 0.05) -> list:
+    """Tipurile evenimentelor ajunse în coadă (după ce loop-ul rulează deliver)"""
+    received = []
+    while True:
+        item = await subscription.next_event(timeout)
+        if item is None:
+            return received
+        received.append((item.type, item.data))
+
+
+class TestEventBroadcaster:
+    """Scoping per rol/owner, coalescing și overflow"""
+
+    @pytest.mark.asyncio
+    async def test_client_sees_only_own_fonds(self):
+        broadcaster = EventBroadcaster(max_queue=10, max_subscribers=10)
+        admin = broadcaster.subscribe("admin", 1)
+        audit = broadcaster.subscribe("audit", 2)
+        owner = broadcaster.subscribe("client", 3)
+        other = broadcaster.subscribe("client", 4)
+
+        broadcaster.publish([FondEvent("fond_updated", {"fond_id": 7}, frozenset({3}))])
+        broadcaster.publish([FondEvent("stats_changed", {"bulk": True}, None)])
+
+        expected = [("fond_updated", {"fond_id": 7}), ("stats_changed", {"bulk": True})]
+        assert await drain(admin) == expected
+        assert await drain(audit) == expected
+        assert await drain(owner) == expected
+        assert await drain(other) == [("stats_changed", {"bulk": True})]
+
+    @pytest.mark.asyncio
+    async def test_stats_changed_is_coalesced_until_sent(self):
+        broadcaster = EventBroadcaster(max_queue=10, max_subscribers=10)
+        subscription = broadcaster.subscribe("admin", 1)
+        for _ in range(5):
+            broadcaster.publish([FondEvent("stats_changed", {}, None)])
+        assert await drain(subscription) == [("stats_changed", {})]
+
+        broadcaster.publish([FondEvent("stats_changed", {}, None)])
+        assert await drain(subscription) == [("stats_changed", {})]
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_gets_resync(self):
+        broadcaster = EventBroadcaster(max_queue=3, max_subscribers=10)
+        subscription = broadcaster.subscribe("admin", 1)
+        broadcaster.publish([FondEvent("fond_updated", {"fond_id": i}) for i in range(5)])
+        assert await drain(subscription) == [("resync", {})]
+
+    @pytest.mark.asyncio
+    async def test_subscriber_limit(self):
+        broadcaster = EventBroadcaster(max_queue=3, max_subscribers=1)
+        first = broadcaster.subscribe("admin", 1)
+        assert broadcaster.subscribe("admin", 1) is None
+        broadcaster.unsubscribe(first)
+        assert broadcaster.subscribe("admin", 1) is not None
+
+    def test_notify_payloads_stay_under_limit(self):
+        events = [FondEvent("fond_updated", {"fond_id": i, "fields": ["x" * 100]}, frozenset({i})) for i in range(200)]
+        events.append(FondEvent("fond_updated", {"notes": "y" * 9000}, frozenset({1})))
+        batches = _notify_batches(events)
+
+        assert len(batches) > 1
+        assert all(len(batch) < 8000 for batch in batches)
+        decoded = [item for batch in batches for item in json.loads(batch)]
+        assert len(decoded) == 201
+        assert decoded[-1] == {"type": "stats_changed", "data": {}, "owners": None}
+
+    @pytest.mark.asyncio
+    async def test_listener_dispatches_notifications(self):
+        """Payload-urile NOTIFY ajung la abonații locali cu același scoping"""
+        broadcaster = EventBroadcaster(max_queue=10, max_subscribers=10)
+        listener = PostgresEventListener("postgresql://arhivare@db/arhivare", "fond_events", broadcaster)
+        subscription = broadcaster.subscribe("client", 3)
+
+        [payload] = _notify_batches([
+            FondEvent("fond_created", {"fond_id": 1}, frozenset({3})),
+            FondEvent("fond_created", {"fond_id": 2}, frozenset({4})),
+        ])
+        listener._dispatch(payload)
+        listener._dispatch("not json")
+
+        assert await drain(subscription) == [("fond_created", {"fond_id": 1})]
+        assert listener.received == 2
+
+    def test_listener_needs_postgresql(self):
+        listener = PostgresEventListener("sqlite:///./arhivare.db", "fond_events", EventBroadcaster(10, 10))
+        assert listener.start() is False
+
+
+class TestCommitEvents:
+    """Evenimentele pleacă doar după commit"""
+
+    @pytest.mark.asyncio
+    async def test_update_publishes_after_commit(self, db_session: Session, sample_fonds: list[Fond]):
+        subscription = fond_events.subscribe("admin", 1)
+        update_fond(db_session, sample_fonds[0].id, FondUpdate(notes="Note noi"))
+
+        [(kind, data), (stats, _)] = await drain(subscription)
+        assert kind == "fond_updated"
+        assert data["fond_id"] == sample_fonds[0].id
+        assert data["fields"] == ["notes"]
+        assert stats == "stats_changed"
+
+    @pytest.mark.asyncio
+    async def test_rollback_publishes_nothing(self, db_session: Session, sample_fonds: list[Fond]):
+        subscription = fond_events.subscribe("admin", 1)
+        sample_fonds[0].notes = "nesalvat"
+        db_session.flush()
+        db_session.rollback()
+        assert await drain(subscription) == []
+
+    @pytest.mark.asyncio
+    async def test_assignment_reaches_old_and_new_owner(self, db_session: Session, sample_fonds: list[Fond],
+                                                        regular_user: User):
+        other_client = User(username="alt_client", password_hash="x", role="client")
+        db_session.add(other_client)
+        db_session.commit()
+        service = AssignmentService(db_session)
+        service.assign_fond_to_user(sample_fonds[0].id, regular_user.id)
+
+        old_owner = fond_events.subscribe("client", regular_user.id)
+        new_owner = fond_events.subscribe("client", other_client.id)
+        bystander = fond_events.subscribe("client", 9999)
+        service.assign_fond_to_user(sample_fonds[0].id, other_client.id)
+
+        for subscription in (old_owner, new_owner):
+            [(kind, data), (stats, _)] = await drain(subscription)
+            assert kind == "fond_assigned"
+            assert (data["previous_owner_id"], data["owner_id"]) == (regular_user.id, other_client.id)
+            assert stats == "stats_changed"
+        assert await drain(bystander) == []
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_broadcasts_stats(self, db_session: Session, sample_fonds: list[Fond]):
+        subscription = fond_events.subscribe("client", 9999)
+        db_session.execute(update(Fond).where(Fond.active == False).values(active=True))
+        db_session.commit()
+        assert await drain(subscription) == [("stats_changed", {"bulk": True})]
+
+
+class SSEConnection:
+    """Rulează aplicația ASGI direct, ca să putem citi un stream care nu se termină"""
+
+    def __init__(self, path: str, query: str = "", headers: dict = None):
+        self.scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+            "query_string": query.encode(), "server": ("testserver", 80), "client": ("127.0.0.1", 1234),
+            "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+        }
+        self.status = None
+        self.chunks: asyncio.Queue = asyncio.Queue()
+        self._disconnected = asyncio.Event()
+        self._request_sent = False
+
+    async def _receive(self):
+        if not self._request_sent:
+            self._request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self._disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def _send(self, message):
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+        elif message["type"] == "http.response.body":
+            await self.chunks.put(message.get("body", b"").decode())
+
+    async def __aenter__(self):
+        self.task = asyncio.create_task(app(self.scope, self._receive, self._send))
+        return self
+
+    async def __aexit__(self, *exc):
+        self._disconnected.set()
+        await asyncio.wait_for(self.task, 5)
+
+    async def next_frame(self, timeout: float = 2) -> str:
+        frame = ""
+        while not frame.strip():
+            frame = await asyncio.wait_for(self.chunks.get(), timeout)
+        return frame
+
+
+class TestEventStreamEndpoint:
+    """GET /events/stream"""
+
+    @pytest.mark.asyncio
+    async def test_requires_authentication(self, client: AsyncClient, user_headers: dict):
+        response = await client.get("/events/stream")
+        assert response.status_code == 401
+        response = await client.get("/events/stream", params={"ticket": "invalid"})
+        assert response.status_code == 401
+        # Access token-ul nu mai e acceptat în URL
+        token = user_headers["Authorization"].split(" ", 1)[1]
+        response = await client.get("/events/stream", params={"ticket": token})
+        assert response.status_code == 401
+        response = await client.get("/events/stream", params={"access_token": token})
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_ticket_is_single_purpose(self, client: AsyncClient, user_headers: dict, regular_user: User,
+                                            monkeypatch):
+        response = await client.post("/auth/stream-ticket")
+        assert response.status_code == 401
+
+        response = await client.post("/auth/stream-ticket", headers=user_headers)
+        assert response.status_code == 200
+        assert response.json()["expires_in"] == settings.EVENTS_TICKET_SECONDS
+        ticket = response.json()["ticket"]
+
+        response = await client.get("/auth/me", headers={"Authorization": f"Bearer {ticket}"})
+        assert response.status_code == 401
+
+        monkeypatch.setattr(settings, "EVENTS_TICKET_SECONDS", -5)
+        expired = create_stream_ticket({"sub": regular_user.username, "uid": regular_user.id,
+                                        "role": "client", "ver": regular_user.token_version or 0})
+        response = await client.get("/events/stream", params={"ticket": expired})
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_logout_revokes_ticket(self, client: AsyncClient, user_headers: dict):
+        ticket = (await client.post("/auth/stream-ticket", headers=user_headers)).json()["ticket"]
+        assert (await client.post("/auth/logout", headers=user_headers)).status_code == 204
+        response = await client.get("/events/stream", params={"ticket": ticket})
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_streams_scoped_events(self, client: AsyncClient, db_session: Session, sample_fonds: list[Fond],
+                                         regular_user: User, user_headers: dict):
+        ticket = (await client.post("/auth/stream-ticket", headers=user_headers)).json()["ticket"]
+        async with SSEConnection("/events/stream", f"ticket={ticket}") as stream:
+            assert await stream.next_frame() == "retry: 3000\n\n"
+            assert "event: ready" in await stream.next_frame()
+            assert stream.status == 200
+            assert fond_events.subscriber_count == 1
+
+            # Fond al altcuiva: nu ajunge la client; apoi fondul e asignat clientului
+            update_fond(db_session, sample_fonds[1].id, FondUpdate(notes="alt owner"))
+            AssignmentService(db_session).assign_fond_to_user(sample_fonds[0].id, regular_user.id)
+
+            frame = await stream.next_frame()
+            assert "event: fond_assigned" in frame
+            payload = json.loads(frame.split("data: ", 1)[1])
+            assert payload["fond_id"] == sample_fonds[0].id
+            assert "event: stats_changed" in await stream.next_frame()
+
+        assert fond_events.subscriber_count == 0
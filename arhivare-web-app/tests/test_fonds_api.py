@@ -1,7 +1,9 @@
 # tests/test_fonds_api.py - FIXED VERSION
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event, text
 from app.models.fond import Fond
+from tests.conftest import engine
 
 class TestFondsListEndpoint:
     """Test suite for fonds listing endpoint."""
@@ -76,6 +78,344 @@ class TestFondsListEndpoint:
         for fond in active_data:
             assert fond.get("active", True) is True
 
+class TestFondsSparseFieldsets:
+    """Test suite for fields= on fond listings."""
+    
+    @pytest.mark.asyncio
+    async def test_list_fonds_fields_trim_select_and_response(
+        self, client: AsyncClient, auth_headers: dict, sample_fonds: list[Fond]
+    ):
+        """Test that fields= narrows both the SQL SELECT and the JSON."""
+        statements = []
+        
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if "FROM fonds" in statement:
+                statements.append(statement)
+        
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            response = await client.get(
+                "/fonds/", params={"fields": "company_name,holder_name"}, headers=auth_headers
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+        
+        assert response.status_code == 200
+        assert all(set(item) == {"id", "company_name", "holder_name"} for item in response.json())
+        assert statements and all("fonds.notes" not in statement for statement in statements)
+    
+    @pytest.mark.asyncio
+    async def test_my_fonds_fields(self, client: AsyncClient, user_headers: dict, regular_user, sample_fonds, db_session):
+        """Test fields= on /fonds/my-fonds for a client."""
+        sample_fonds[0].owner_id = regular_user.id
+        db_session.commit()
+        
+        response = await client.get("/fonds/my-fonds", params={"fields": "holder_name"}, headers=user_headers)
+        assert response.status_code == 200
+        assert response.json() == [{"id": sample_fonds[0].id, "holder_name": "Arhiva Națională Brașov"}]
+    
+    @pytest.mark.asyncio
+    async def test_admin_fonds_fields_with_owner(
+        self, client: AsyncClient, auth_headers: dict, regular_user, sample_fonds, db_session
+    ):
+        """Test fields= on /admin/fonds/ including owner details."""
+        sample_fonds[0].owner_id = regular_user.id
+        db_session.commit()
+        
+        response = await client.get("/admin/fonds/", params={"fields": "company_name,owner"}, headers=auth_headers)
+        assert response.status_code == 200
+        first = response.json()[0]
+        assert set(first) == {"id", "company_name", "owner"}
+        assert first["owner"]["username"] == regular_user.username
+    
+    @pytest.mark.asyncio
+    async def test_default_admin_listing_keeps_full_shape(self, client: AsyncClient, auth_headers: dict, sample_fonds):
+        """Test that without fields= the admin listing still returns every field."""
+        response = await client.get("/admin/fonds/", headers=auth_headers)
+        first = response.json()[0]
+        assert {"notes", "source_url", "owner_id", "owner", "created_at"} <= set(first)
+    
+    @pytest.mark.asyncio
+    async def test_unknown_field_is_rejected(self, client: AsyncClient, auth_headers: dict):
+        """Test that unknown fields return 400."""
+        response = await client.get("/fonds/", params={"fields": "id,secret"}, headers=auth_headers)
+        assert response.status_code == 400
+
+class TestFondsVisibility:
+    """Test suite for the role visibility predicates (crud.fond.visible_to / editable_by)."""
+    
+    @staticmethod
+    async def _audit_headers(client: AsyncClient, db_session) -> dict:
+        from app.core.security import get_password_hash
+        from app.models.user import User
+        
+        db_session.add(User(username="audit_visibility", password_hash=get_password_hash("testpassword"), role="audit"))
+        db_session.commit()
+        response = await client.post("/auth/login", json={"username": "audit_visibility", "password": "testpassword"})
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    
+    @pytest.mark.asyncio
+    async def test_audit_lists_and_searches_all_fonds(self, client: AsyncClient, db_session, sample_fonds: list[Fond]):
+        """Test that audit users see every active fond, read-only."""
+        headers = await self._audit_headers(client, db_session)
+        
+        response = await client.get("/fonds/", headers=headers)
+        assert response.status_code == 200
+        assert len(response.json()) == 3
+        
+        response = await client.get("/fonds/my-fonds", params={"search": "Brașov"}, headers=headers)
+        assert {fond["company_name"] for fond in response.json()} == {"Tractorul Brașov SA", "Steagul Roșu Brașov SA"}
+        
+        response = await client.delete(f"/fonds/{sample_fonds[0].id}", headers=headers)
+        assert response.status_code == 403
+    
+    @pytest.mark.asyncio
+    async def test_client_search_is_scoped_to_own_fonds(
+        self, client: AsyncClient, user_headers: dict, regular_user, sample_fonds: list[Fond], db_session
+    ):
+        """Test that a client's search never returns other owners' fonds."""
+        sample_fonds[1].owner_id = regular_user.id
+        db_session.commit()
+        
+        response = await client.get("/fonds/my-fonds", params={"search": "Brașov"}, headers=user_headers)
+        assert response.status_code == 200
+        assert [fond["id"] for fond in response.json()] == [sample_fonds[1].id]
+    
+    @pytest.mark.asyncio
+    async def test_get_fond_checks_visibility_in_same_query(
+        self, client: AsyncClient, user_headers: dict, regular_user, sample_fonds: list[Fond], db_session
+    ):
+        """Test that GET /fonds/{id} loads the fond and its permission with one SELECT."""
+        sample_fonds[1].owner_id = regular_user.id
+        db_session.commit()
+        own_id, other_id = sample_fonds[1].id, sample_fonds[0].id
+        statements = []
+        
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if "FROM fonds" in statement:
+                statements.append(statement)
+        
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            own = await client.get(f"/fonds/{own_id}", headers=user_headers)
+            other = await client.get(f"/fonds/{other_id}", headers=user_headers)
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+        
+        assert own.status_code == 200
+        assert other.status_code == 403
+        assert len(statements) == 2
+    
+    @pytest.mark.asyncio
+    async def test_client_cannot_edit_unowned_fond(
+        self, client: AsyncClient, user_headers: dict, sample_fonds: list[Fond]
+    ):
+        """Test that the edit predicate hides fonds owned by someone else (or nobody)."""
+        response = await client.delete(f"/fonds/{sample_fonds[0].id}", headers=user_headers)
+        assert response.status_code == 404
+        
+        response = await client.put(f"/fonds/{sample_fonds[0].id}", headers=user_headers, json={"notes": "test"})
+        assert response.status_code == 404
+    
+    @pytest.mark.asyncio
+    async def test_delete_loads_fond_with_edit_permission_in_one_query(
+        self, client: AsyncClient, user_headers: dict, regular_user, sample_fonds: list[Fond], db_session
+    ):
+        """Test that DELETE /fonds/{id} checks the permission and loads the fond with one SELECT."""
+        sample_fonds[1].owner_id = regular_user.id
+        db_session.commit()
+        own_id = sample_fonds[1].id
+        statements = []
+        
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("SELECT") and "FROM fonds" in statement:
+                statements.append(statement)
+        
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            response = await client.delete(f"/fonds/{own_id}", headers=user_headers)
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+        
+        assert response.status_code == 204
+        assert len(statements) == 1
+
+class TestFondsBatchGetEndpoint:
+    """Test suite for POST /fonds/batch-get."""
+    
+    @pytest.mark.asyncio
+    async def test_batch_get_preserves_order_and_reports_missing(
+        self, client: AsyncClient, auth_headers: dict, sample_fonds: list[Fond]
+    ):
+        """Test that fonds come back in request order, with unknown ids in missing."""
+        ids = [sample_fonds[2].id, 99999, sample_fonds[0].id, sample_fonds[2].id]
+        response = await client.post("/fonds/batch-get", json={"ids": ids}, headers=auth_headers)
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert [fond["id"] for fond in data["fonds"]] == [sample_fonds[2].id, sample_fonds[0].id]
+        assert data["missing"] == [99999]
+    
+    @pytest.mark.asyncio
+    async def test_batch_get_filters_by_owner_for_clients(
+        self, client: AsyncClient, user_headers: dict, regular_user, sample_fonds, db_session
+    ):
+        """Test that clients only get their own fonds; the rest are reported missing."""
+        sample_fonds[1].owner_id = regular_user.id
+        db_session.commit()
+        
+        ids = [sample_fonds[0].id, sample_fonds[1].id]
+        response = await client.post(
+            "/fonds/batch-get", params={"fields": "company_name"}, json={"ids": ids}, headers=user_headers
+        )
+        data = response.json()
+        assert data["fonds"] == [{"id": sample_fonds[1].id, "company_name": "Steagul Roșu Brașov SA"}]
+        assert data["missing"] == [sample_fonds[0].id]
+    
+    @pytest.mark.asyncio
+    async def test_batch_get_validates_size(self, client: AsyncClient, auth_headers: dict):
+        """Test that empty and oversized id lists are rejected."""
+        response = await client.post("/fonds/batch-get", json={"ids": []}, headers=auth_headers)
+        assert response.status_code == 422
+        
+        response = await client.post("/fonds/batch-get", json={"ids": list(range(1, 10000))}, headers=auth_headers)
+        assert response.status_code == 422
+
+class TestFondsBatchWriteEndpoint:
+    """Test suite for POST /fonds/batch."""
+    
+    @pytest.mark.asyncio
+    async def test_batch_applies_mixed_operations(
+        self, client: AsyncClient, auth_headers: dict, sample_fonds: list[Fond], db_session
+    ):
+        """Test create, update and soft delete applied together with per-item results."""
+        payload = {"operations": [
+            {"op": "create", "data": {"company_name": "Faur SA", "holder_name": "Arhiva București"}},
+            {"op": "create", "data": {"company_name": "Grivița SA", "holder_name": "Arhiva București"}},
+            {"op": "update", "id": sample_fonds[0].id, "data": {"holder_name": "Arhivele Naționale Brașov"}},
+            {"op": "delete", "id": sample_fonds[1].id},
+        ]}
+        response = await client.post("/fonds/batch", json=payload, headers=auth_headers)
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert data["applied"] is True
+        assert [item["status"] for item in data["results"]] == ["created", "created", "updated", "deleted"]
+        created_ids = [item["id"] for item in data["results"][:2]]
+        
+        db_session.expire_all()
+        created = db_session.query(Fond).filter(Fond.id.in_(created_ids)).order_by(Fond.id).all()
+        assert [fond.company_name for fond in created] == ["Faur SA", "Grivița SA"]
+        assert created[0].holder_name_normalized == "arhiva bucuresti"
+        
+        updated = db_session.get(Fond, sample_fonds[0].id)
+        assert updated.holder_name == "Arhivele Naționale Brașov"
+        assert updated.holder_name_normalized == "arhivele nationale brasov"
+        assert db_session.get(Fond, sample_fonds[1].id).active is False
+    
+    @pytest.mark.asyncio
+    async def test_atomic_batch_rejects_everything_on_error(
+        self, client: AsyncClient, auth_headers: dict, sample_fonds: list[Fond], db_session
+    ):
+        """Test that one invalid item leaves the database untouched in atomic mode."""
+        payload = {"operations": [
+            {"op": "update", "id": sample_fonds[0].id, "data": {"company_name": "Renamed SA"}},
+            {"op": "delete", "id": 99999},
+        ]}
+        response = await client.post("/fonds/batch", json=payload, headers=auth_headers)
+        assert response.status_code == 422
+        
+        data = response.json()
+        assert data["applied"] is False
+        assert [item["status"] for item in data["results"]] == ["skipped", "error"]
+        
+        db_session.expire_all()
+        assert db_session.get(Fond, sample_fonds[0].id).company_name == "Tractorul Brașov SA"
+    
+    @pytest.mark.asyncio
+    async def test_client_batch_is_limited_to_own_fonds(
+        self, client: AsyncClient, user_headers: dict, regular_user, sample_fonds, db_session
+    ):
+        """Test that clients create fonds for themselves and cannot touch others' fonds."""
+        sample_fonds[0].owner_id = regular_user.id
+        db_session.commit()
+        
+        payload = {"atomic": False, "operations": [
+            {"op": "create", "data": {"company_name": "Client Nou SRL", "holder_name": "Arhiva Proprie"}},
+            {"op": "update", "id": sample_fonds[0].id, "data": {"notes": "actualizat"}},
+            {"op": "update", "id": sample_fonds[1].id, "data": {"notes": "nu e al meu"}},
+        ]}
+        response = await client.post("/fonds/batch", json=payload, headers=user_headers)
+        assert response.status_code == 200
+        
+        results = response.json()["results"]
+        assert [item["status"] for item in results] == ["created", "updated", "error"]
+        
+        db_session.expire_all()
+        assert db_session.get(Fond, results[0]["id"]).owner_id == regular_user.id
+        assert db_session.get(Fond, sample_fonds[1].id).notes is None
+
+    @pytest.mark.asyncio
+    async def test_batch_rejects_null_required_fields_and_empty_updates(
+        self, client: AsyncClient, auth_headers: dict, sample_fonds: list[Fond], db_session
+    ):
+        """Test that null NOT NULL fields and empty updates are per-item errors, not a 500."""
+        payload = {"atomic": False, "operations": [
+            {"op": "update", "id": sample_fonds[0].id, "data": {"company_name": None}},
+            {"op": "update", "id": sample_fonds[1].id, "data": {"holder_name": None, "active": None}},
+            {"op": "update", "id": sample_fonds[2].id, "data": {}},
+            {"op": "update", "id": sample_fonds[3].id, "data": {"notes": "valid"}},
+        ]}
+        response = await client.post("/fonds/batch", json=payload, headers=auth_headers)
+        assert response.status_code == 200
+        
+        results = response.json()["results"]
+        assert [item["status"] for item in results] == ["error", "error", "error", "updated"]
+        assert results[0]["error"] == "Field cannot be null: company_name"
+        assert results[1]["error"] == "Field cannot be null: holder_name, active"
+        assert results[2]["error"] == "No fields to update"
+        
+        db_session.expire_all()
+        assert db_session.get(Fond, sample_fonds[0].id).company_name == "Tractorul Brașov SA"
+        assert db_session.get(Fond, sample_fonds[3].id).notes == "valid"
+        
+        payload["atomic"] = True
+        response = await client.post("/fonds/batch", json=payload, headers=auth_headers)
+        assert response.status_code == 422
+    
+    @pytest.mark.asyncio
+    async def test_batch_isolates_database_errors_per_item(
+        self, client: AsyncClient, auth_headers: dict, sample_fonds: list[Fond], db_session
+    ):
+        """Test that a row the database rejects fails alone in non-atomic mode and fails the batch in atomic mode."""
+        db_session.execute(text(
+            "CREATE TRIGGER reject_fond BEFORE UPDATE ON fonds WHEN NEW.company_name = 'Respins SA' "
+            "BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+        ))
+        db_session.commit()
+        operations = [
+            {"op": "create", "data": {"company_name": "Faur SA", "holder_name": "Arhiva București"}},
+            {"op": "update", "id": sample_fonds[0].id, "data": {"company_name": "Respins SA"}},
+            {"op": "update", "id": sample_fonds[1].id, "data": {"notes": "acceptat"}},
+        ]
+        
+        response = await client.post("/fonds/batch", json={"atomic": True, "operations": operations}, headers=auth_headers)
+        assert response.status_code == 422
+        assert [item["status"] for item in response.json()["results"]] == ["skipped", "error", "skipped"]
+        db_session.expire_all()
+        assert db_session.query(Fond).filter(Fond.company_name == "Faur SA").count() == 0
+        
+        response = await client.post("/fonds/batch", json={"atomic": False, "operations": operations}, headers=auth_headers)
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [item["status"] for item in results] == ["created", "error", "updated"]
+        assert "rejected" in results[1]["error"]
+        
+        db_session.expire_all()
+        assert db_session.get(Fond, results[0]["id"]).company_name == "Faur SA"
+        assert db_session.get(Fond, sample_fonds[0].id).company_name == "Tractorul Brașov SA"
+        assert db_session.get(Fond, sample_fonds[1].id).notes == "acceptat"
+
 class TestFondsCreateEndpoint:
     """Test suite for fond creation endpoint."""
     
@@ -37,3 +37,55 @@ async def test_health_endpoint_no_auth_required(client: AsyncClient):
     
     # Should not return 401 Unauthorized
     assert response.status_code != 401
+
+class TestHealthProbes:
+    """Test suite for /health/live and /health/ready."""
+    
+    @pytest.mark.asyncio
+    async def test_liveness_does_no_io(self, client: AsyncClient):
+        """Test that /health/live answers without touching the database."""
+        from app.services.health import database_probe
+        
+        database_probe.invalidate()
+        response = await client.get("/health/live")
+        assert response.status_code == 200
+        assert response.json() == {"status": "alive"}
+        assert database_probe._result is None
+    
+    @pytest.mark.asyncio
+    async def test_readiness_reuses_cached_probe(self, client: AsyncClient, monkeypatch):
+        """Test that /health/ready reports DB, pool and migrations and reuses the last probe."""
+        from app.services.health import database_probe
+        
+        database_probe.invalidate()
+        runs = []
+        original_run = database_probe.run
+        monkeypatch.setattr(database_probe, "run", lambda: runs.append(1) or original_run())
+        
+        for _ in range(3):
+            response = await client.get("/health/ready")
+            assert response.status_code == 200
+        
+        data = response.json()
+        assert data["status"] == "ready"
+        assert data["database"]["ok"] is True
+        assert "class" in data["pool"]
+        assert "head" in data["migrations"] and "current" in data["migrations"]
+        assert len(runs) == 1
+    
+    @pytest.mark.asyncio
+    async def test_readiness_fails_when_database_is_down(self, client: AsyncClient, monkeypatch):
+        """Test that an unreachable database makes /health/ready (and /health) return 503."""
+        from sqlalchemy import create_engine
+        from app.services.health import database_probe
+        
+        monkeypatch.setattr(database_probe, "engine", create_engine("sqlite:////nonexistent-dir/health.db"))
+        database_probe.invalidate()
+        try:
+            response = await client.get("/health/ready")
+            assert response.status_code == 503
+            assert response.json()["database"]["error"]
+            assert (await client.get("/health")).status_code == 503
+            assert (await client.get("/health/live")).status_code == 200
+        finally:
+            database_probe.invalidate()
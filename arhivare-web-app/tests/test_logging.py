@@ -0,0 +1,100 @@
+# tests/test_logging.py - Structured logging and request-id middleware
+import json
+import logging
+import queue
+import sys
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.logging_config import (
+    JsonFormatter, SamplingFilter, NonBlockingQueueHandler, request_id_var
+)
+
+
+def _record(level=logging.INFO, **extra):
+    record = logging.LogRecord("app.test", level, __file__, 1, "hello %s", ("world",), None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+class TestJsonFormatter:
+    """Test suite for the JSON log formatter."""
+
+    def test_format_includes_message_and_extra_fields(self):
+        """Test that extra fields end up as top-level JSON keys."""
+        line = JsonFormatter().format(_record(request_id="abc123", fond_id=7))
+        data = json.loads(line)
+
+        assert data["message"] == "hello world"
+        assert data["level"] == "INFO"
+        assert data["request_id"] == "abc123"
+        assert data["fond_id"] == 7
+        assert "sampled" not in data
+
+
+    def test_exception_survives_the_queue(self):
+        """Test that a traceback logged through the queue is a separate exc_info field."""
+        handler = NonBlockingQueueHandler(queue.Queue())
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = logging.LogRecord("app.test", logging.ERROR, __file__, 1, "failed %s", ("x",), sys.exc_info())
+        handler.handle(record)
+
+        data = json.loads(JsonFormatter().format(handler.queue.get_nowait()))
+        assert data["message"] == "failed x"
+        assert "Traceback" in data["exc_info"]
+        assert "ValueError: boom" in data["exc_info"]
+
+
+class TestSamplingFilter:
+    """Test suite for high-volume log sampling."""
+
+    def test_unmarked_records_always_pass(self):
+        """Test that records not marked as sampled are never dropped."""
+        sampling = SamplingFilter(0.0)
+        assert sampling.filter(_record())
+
+    def test_marked_info_records_are_dropped_at_zero_rate(self):
+        """Test that sampled INFO records are dropped when the rate is 0."""
+        sampling = SamplingFilter(0.0)
+        assert not sampling.filter(_record(sampled=True))
+
+    def test_warnings_bypass_sampling(self):
+        """Test that WARNING and above always pass."""
+        sampling = SamplingFilter(0.0)
+        assert sampling.filter(_record(level=logging.WARNING, sampled=True))
+
+
+class TestNonBlockingQueueHandler:
+    """Test suite for the queue handler."""
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        """Test that a full queue increments the drop counter."""
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+        handler.handle(_record())
+        handler.handle(_record())
+
+        assert handler.queue.qsize() == 1
+        assert handler.dropped == 1
+
+
+class TestRequestIdMiddleware:
+    """Test suite for request-id correlation."""
+
+    @pytest.mark.asyncio
+    async def test_request_id_is_generated(self, client: AsyncClient):
+        """Test that a request id is returned when the client sends none."""
+        response = await client.get("/search", params={"query": "test"})
+        assert response.headers.get("x-request-id")
+
+    @pytest.mark.asyncio
+    async def test_request_id_is_propagated(self, client: AsyncClient):
+        """Test that an incoming X-Request-ID is echoed back."""
+        response = await client.get(
+            "/search", params={"query": "test"}, headers={"X-Request-ID": "req-42"}
+        )
+        assert response.headers["x-request-id"] == "req-42"
+        assert request_id_var.get() is None
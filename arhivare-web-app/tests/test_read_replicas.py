@@ -0,0 +1,171 @@
+# tests/test_read_replicas.py - Read-replica routing with two local SQLite databases
+import asyncio
+import time
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, ReplicaSet, RoutingSession, get_db, get_read_db
+from app.main import app
+from app.models.fond import Fond
+from app.services.name_suggestions import suggestion_index
+
+
+@pytest.fixture
+def databases(tmp_path):
+    """Un primar și o "replică" SQLite cu conținut diferit, ca să se vadă de unde se citește."""
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for engine, name in ((primary, "Primary Copy SRL"), (replica, "Replica Copy SRL")):
+        Base.metadata.create_all(bind=engine)
+        with sessionmaker(bind=engine)() as db:
+            db.add(Fond(company_name=name, holder_name="Arhiva Test"))
+            db.commit()
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+def routing_sessionmaker(primary, replicas, max_lag=5):
+    replica_set = ReplicaSet(primary, replicas, max_lag=max_lag, check_interval=60)
+    replica_set.refresh()  # în aplicație o face task-ul de fundal pornit în lifespan
+    return sessionmaker(class_=RoutingSession, replica_set=replica_set, autoflush=False), replica_set
+
+
+def company_names(db):
+    return [name for (name,) in db.query(Fond.company_name).order_by(Fond.id)]
+
+
+class TestRoutingSession:
+    """Test suite for RoutingSession / ReplicaSet."""
+    
+    def test_reads_go_to_replica(self, databases):
+        """Test that plain SELECTs are served by the replica."""
+        primary, replica = databases
+        ReadSession, _ = routing_sessionmaker(primary, [replica])
+        
+        with ReadSession() as db:
+            assert company_names(db) == ["Replica Copy SRL"]
+    
+    def test_session_sticks_to_primary_after_write(self, databases):
+        """Test that writes go to the primary and later reads in the session see them."""
+        primary, replica = databases
+        ReadSession, _ = routing_sessionmaker(primary, [replica])
+        
+        with ReadSession() as db:
+            db.add(Fond(company_name="New Fond SRL", holder_name="Arhiva Test"))
+            db.flush()
+            assert company_names(db) == ["Primary Copy SRL", "New Fond SRL"]
+            db.commit()
+        
+        with sessionmaker(bind=replica)() as db:
+            assert company_names(db) == ["Replica Copy SRL"]
+    
+    def test_lagging_replica_falls_back_to_primary(self, databases, monkeypatch):
+        """Test that a replica over REPLICA_MAX_LAG_SECONDS is skipped."""
+        primary, replica = databases
+        ReadSession, replica_set = routing_sessionmaker(primary, [replica], max_lag=5)
+        monkeypatch.setattr(replica_set, "measure_lag", lambda engine: 30.0)
+        replica_set.refresh()
+        
+        with ReadSession() as db:
+            assert company_names(db) == ["Primary Copy SRL"]
+        assert replica_set.lag == {0: 30.0}
+    
+    def test_unreachable_replica_falls_back_to_primary(self, databases):
+        """Test that an unavailable replica is skipped and the healthy one is used."""
+        primary, replica = databases
+        broken = create_engine("sqlite:////nonexistent-dir/replica.db")
+        ReadSession, replica_set = routing_sessionmaker(primary, [broken, replica])
+        
+        for _ in range(3):
+            with ReadSession() as db:
+                assert company_names(db) == ["Replica Copy SRL"]
+        assert replica_set.lag[0] is None
+    
+    def test_choose_never_measures_on_the_request_path(self, databases, monkeypatch):
+        """Test that choose() uses only cached state and falls back to the primary when it is missing or stale."""
+        primary, replica = databases
+        replica_set = ReplicaSet(primary, [replica], max_lag=5, check_interval=60)
+        monkeypatch.setattr(replica_set, "measure_lag", lambda engine: pytest.fail("lag measured inline"))
+        
+        assert replica_set.choose() is primary  # încă nemăsurat
+        replica_set._healthy, replica_set._checked_at = [replica], time.monotonic()
+        assert replica_set.choose() is replica
+        replica_set._checked_at = time.monotonic() - 181  # task-ul de fundal s-a oprit
+        assert replica_set.choose() is primary
+    
+    @pytest.mark.asyncio
+    async def test_background_task_refreshes_lag(self, databases):
+        """Test that start() measures lag in the background."""
+        primary, replica = databases
+        replica_set = ReplicaSet(primary, [replica], max_lag=5, check_interval=60)
+        replica_set.start()
+        try:
+            for _ in range(100):
+                if replica_set.lag:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await replica_set.stop()
+        assert replica_set.lag == {0: 0.0}
+        assert replica_set.choose() is replica
+    
+    @pytest.mark.asyncio
+    async def test_search_route_reads_from_replica(self, client: AsyncClient, databases):
+        """Test that /search uses get_read_db end to end."""
+        primary, replica = databases
+        ReadSession, _ = routing_sessionmaker(primary, [replica])
+        
+        def override_get_read_db():
+            with ReadSession() as db:
+                yield db
+        
+        previous = app.dependency_overrides[get_read_db]
+        app.dependency_overrides[get_read_db] = override_get_read_db
+        try:
+            response = await client.get("/search", params={"query": "Copy"})
+        finally:
+            app.dependency_overrides[get_read_db] = previous
+        
+        assert [hit["company_name"] for hit in response.json()] == ["Replica Copy SRL"]
+    
+    @pytest.mark.asyncio
+    async def test_suggest_rebuilds_from_primary_when_replica_lags(self, client: AsyncClient, databases, monkeypatch):
+        """Test that a commit on the primary shows up in /search/suggest even if the replica has not caught up."""
+        primary, replica = databases
+        ReadSession, _ = routing_sessionmaker(primary, [replica])
+        PrimarySession = sessionmaker(bind=primary)
+        
+        def override_get_db():
+            with PrimarySession() as db:
+                yield db
+        
+        def override_get_read_db():
+            with ReadSession() as db:
+                yield db
+        
+        previous = app.dependency_overrides[get_db], app.dependency_overrides[get_read_db]
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_read_db] = override_get_read_db
+        # Rebuild-ul de fundal își deschide singur sesiunea, tot pe primar
+        monkeypatch.setattr(suggestion_index, "session_factory", PrimarySession)
+        try:
+            response = await client.get("/search/suggest", params={"prefix": "Primary"})
+            assert response.json()["suggestions"] == [{"name": "Primary Copy SRL", "type": "company"}]
+            
+            # Commit doar pe primar: replica nu are încă fondul nou
+            with PrimarySession() as db:
+                db.add(Fond(company_name="Proaspat SRL", holder_name="Arhiva Test"))
+                db.commit()
+            assert suggestion_index.is_stale()
+            
+            await client.get("/search/suggest", params={"prefix": "Proaspat"})
+            suggestion_index.wait_for_rebuild(5)
+            response = await client.get("/search/suggest", params={"prefix": "Proaspat"})
+        finally:
+            app.dependency_overrides[get_db], app.dependency_overrides[get_read_db] = previous
+        
+        assert response.json()["suggestions"] == [{"name": "Proaspat SRL", "type": "company"}]
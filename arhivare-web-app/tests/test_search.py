@@ -2,6 +2,7 @@
 import pytest
 from httpx import AsyncClient
 from app.models.fond import Fond
+from app.services.name_suggestions import suggestion_index
 
 class TestSearchEndpoints:
     """Test suite pentru search functionality - fixed version."""
@@ -211,3 +212,148 @@ class TestSearchCountEndpoint:
         # Ar trebui să numere doar fondurile active
         # Din sample_fonds avem 3 active și 1 inactiv
         assert data["total_results"] <= 3  # Maximum 3 active companies
+
+
+class TestSearchSuggest:
+    """Test suite pentru /search/suggest (typeahead)."""
+
+    @pytest.mark.asyncio
+    async def test_suggest_returns_company_and_holder_names(self, client: AsyncClient, sample_fonds):
+        """Test că prefixul găsește nume de companii și deținători, fără diacritice."""
+        response = await client.get("/search/suggest", params={"prefix": "arhiva na"})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["suggestions"] == [{"name": "Arhiva Națională Brașov", "type": "holder"}]
+
+    @pytest.mark.asyncio
+    async def test_suggest_excludes_inactive_and_respects_limit(self, client: AsyncClient, sample_fonds):
+        """Test că fondurile inactive nu apar și limita e respectată."""
+        response = await client.get("/search/suggest", params={"prefix": "arhiva", "limit": 2})
+        names = [s["name"] for s in response.json()["suggestions"]]
+        assert len(names) == 2
+        assert "Arhiva Inactivă" not in names
+
+    @pytest.mark.asyncio
+    async def test_suggest_skips_leading_legal_form(self, client: AsyncClient, db_session):
+        """Test că "SC Carbochim" e găsit și după "carb"."""
+        db_session.add(Fond(company_name="SC Carbochim SA", holder_name="Arhiva Cluj"))
+        db_session.commit()
+        response = await client.get("/search/suggest", params={"prefix": "carb"})
+        assert response.json()["suggestions"] == [{"name": "SC Carbochim SA", "type": "company"}]
+
+    @pytest.mark.asyncio
+    async def test_suggest_refreshes_after_write(self, client: AsyncClient, sample_fonds, db_session):
+        """Test că indexul vede fondurile create/redenumite după primul lookup."""
+        response = await client.get("/search/suggest", params={"prefix": "electro"})
+        assert response.json()["suggestions"] == []
+
+        sample_fonds[0].company_name = "Electroputere Craiova SA"
+        db_session.commit()
+
+        # Primul request după commit pornește rebuild-ul în fundal
+        await client.get("/search/suggest", params={"prefix": "electro"})
+        suggestion_index.wait_for_rebuild(5)
+
+        response = await client.get("/search/suggest", params={"prefix": "electro"})
+        assert response.json()["suggestions"] == [{"name": "Electroputere Craiova SA", "type": "company"}]
+
+        response = await client.get("/search/suggest", params={"prefix": "tractorul"})
+        assert response.json()["suggestions"] == []
+
+
+    @pytest.mark.asyncio
+    async def test_suggest_refreshes_after_bulk_insert(self, client: AsyncClient, db_session):
+        """Test că și INSERT-urile bulk (batch API) invalidează indexul."""
+        from sqlalchemy import insert
+
+        response = await client.get("/search/suggest", params={"prefix": "hidro"})
+        assert response.json()["suggestions"] == []
+
+        db_session.execute(insert(Fond), [{"company_name": "Hidromecanica SA", "holder_name": "Arhiva Brașov"}])
+        db_session.commit()
+
+        await client.get("/search/suggest", params={"prefix": "hidro"})
+        suggestion_index.wait_for_rebuild(5)
+        response = await client.get("/search/suggest", params={"prefix": "hidro"})
+        assert response.json()["suggestions"] == [{"name": "Hidromecanica SA", "type": "company"}]
+
+    @pytest.mark.asyncio
+    async def test_stale_index_is_rebuilt_off_the_request_path(self, client: AsyncClient, sample_fonds, db_session, monkeypatch):
+        """Test că un index vechi e servit imediat, iar rebuild-ul rulează în thread-ul de fundal."""
+        import threading
+
+        await client.get("/search/suggest", params={"prefix": "tractorul"})
+
+        rebuild_threads = []
+        release = threading.Event()
+        original_rebuild = suggestion_index.rebuild
+
+        def blocked_rebuild(db):
+            rebuild_threads.append(threading.current_thread().name)
+            release.wait(5)
+            original_rebuild(db)
+
+        monkeypatch.setattr(suggestion_index, "rebuild", blocked_rebuild)
+        sample_fonds[0].company_name = "Electroputere Craiova SA"
+        db_session.commit()
+
+        response = await client.get("/search/suggest", params={"prefix": "tractorul"})
+        assert response.json()["suggestions"] == [{"name": "Tractorul Brașov SA", "type": "company"}]
+        release.set()
+        suggestion_index.wait_for_rebuild(5)
+
+        assert rebuild_threads == ["name-suggestions-rebuild"]
+        response = await client.get("/search/suggest", params={"prefix": "tractorul"})
+        assert response.json()["suggestions"] == []
+
+
+class TestSearchSnippets:
+    """Test suite pentru fields= și snippet-uri pe /search."""
+
+    @pytest.mark.asyncio
+    async def test_default_response_is_unchanged(self, client: AsyncClient, sample_fonds):
+        """Test că fără fields răspunsul are toate câmpurile și niciun snippet."""
+        response = await client.get("/search", params={"query": "tractorul"})
+        first = response.json()[0]
+        assert {"id", "company_name", "holder_name", "address", "notes", "owner_id", "created_at"} <= set(first)
+        assert "snippet" not in first
+
+    @pytest.mark.asyncio
+    async def test_fields_trim_response(self, client: AsyncClient, sample_fonds):
+        """Test că fields restrânge răspunsul, cu id inclus mereu."""
+        response = await client.get("/search", params={"query": "tractorul", "fields": "company_name"})
+        assert response.json() == [{"id": sample_fonds[0].id, "company_name": "Tractorul Brașov SA"}]
+
+    @pytest.mark.asyncio
+    async def test_unknown_field_returns_400(self, client: AsyncClient, sample_fonds):
+        """Test că un câmp necunoscut e respins."""
+        response = await client.get("/search", params={"query": "tractorul", "fields": "password_hash"})
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_snippet_window_and_highlights(self, client: AsyncClient, db_session):
+        """Test fereastra din jurul potrivirii și offset-urile de evidențiere."""
+        notes = "x" * 500 + " dosare Carbochim 1950-1989 " + "y" * 500
+        db_session.add(Fond(company_name="Fabrica Cluj", holder_name="Arhiva Cluj", notes=notes))
+        db_session.commit()
+
+        response = await client.get("/search", params={"query": "carbochim", "fields": "company_name,snippet"})
+        hit = response.json()[0]
+        assert set(hit) == {"id", "company_name", "snippet"}
+
+        snippet = hit["snippet"]
+        assert snippet["field"] == "notes"
+        assert snippet["text"].startswith("…") and snippet["text"].endswith("…")
+        assert len(snippet["text"]) < 300
+        start, end = snippet["highlights"][0]
+        assert snippet["text"][start:end] == "Carbochim"
+
+    @pytest.mark.asyncio
+    async def test_snippet_without_match_in_notes_is_preview(self, client: AsyncClient, sample_fonds, db_session):
+        """Test că fără potrivire în note se întoarce începutul lor, fără evidențieri."""
+        sample_fonds[0].notes = "Documente de personal"
+        db_session.commit()
+
+        response = await client.get("/search", params={"query": "tractorul", "fields": "snippet"})
+        hit = response.json()[0]
+        assert hit["snippet"] == {"field": "notes", "text": "Documente de personal", "highlights": []}
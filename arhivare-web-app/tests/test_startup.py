@@ -0,0 +1,55 @@
+# tests/test_startup.py - Cold-start budget for imports and lifespan warmup
+"""
+Bugetele sunt generoase (CI lent), dar prind regresiile mari: un import greu
+adăugat la nivel de modul sau un pas de warmup care ajunge să scaneze tabele mari.
+Se pot ajusta prin STARTUP_IMPORT_BUDGET_MS / STARTUP_WARMUP_BUDGET_MS.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+IMPORT_BUDGET_MS = float(os.getenv("STARTUP_IMPORT_BUDGET_MS", "5000"))
+WARMUP_BUDGET_MS = float(os.getenv("STARTUP_WARMUP_BUDGET_MS", "3000"))
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+
+
+class TestStartupBudget:
+    """Test suite for the startup report and cold-start budgets."""
+    
+    def test_import_time_within_budget(self):
+        """Test that importing app.main in a fresh interpreter stays within budget."""
+        output = subprocess.check_output(
+            [sys.executable, "-c", "import app.main as m; print(m.IMPORT_MS)"],
+            cwd=PROJECT_DIR, env={**os.environ, "LOG_LEVEL": "WARNING"}, text=True
+        )
+        import_ms = float(output.strip().splitlines()[-1])
+        assert import_ms < IMPORT_BUDGET_MS, f"app.main import took {import_ms}ms (budget {IMPORT_BUDGET_MS}ms)"
+    
+    @pytest.mark.asyncio
+    async def test_lifespan_warmup_report(self, sample_fonds):
+        """Test that the lifespan runs every warmup step, within budget, and exposes the report."""
+        from app.core.logging_config import setup_logging
+        from app.main import app
+        from app.services.name_suggestions import suggestion_index
+        
+        try:
+            async with app.router.lifespan_context(app):
+                report = app.state.startup_report
+                async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                    response = await client.get("/health/startup")
+        finally:
+            # Shutdown-ul oprește listener-ul de logging; celelalte teste îl folosesc
+            setup_logging()
+        
+        assert response.status_code == 200
+        assert set(report["steps"]) == {"pool", "mappers", "openapi", "passlib", "caches"}
+        assert report["errors"] == {}
+        assert report["import_ms"] > 0
+        assert report["warmup_ms"] < WARMUP_BUDGET_MS, f"warmup took {report['warmup_ms']}ms"
+        assert app.openapi_schema is not None
+        assert not suggestion_index.is_stale()
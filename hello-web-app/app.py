@@ -1,13 +1,383 @@
+import argparse
+import asyncio
+import mmap
+import os
+import signal
+import struct
+import time
 from http.server import HTTPServer, BaseHTTPRequestHandler
 
+HELLO_BODY = b'<h1>Hello World from Docker!</h1><p>This is running inside a container!</p>'
+MAX_HEADER_BYTES = 8192
+# The server only answers GET/HEAD; a request body is read (and discarded) only to keep
+# the connection in sync, so anything larger is refused before it is buffered
+MAX_BODY_BYTES = 65536
+
+
 class HelloHandler(BaseHTTPRequestHandler):
     def do_GET(self):
         self.send_response(200)
         self.send_header('Content-type', 'text/html')
         self.end_headers()
-        self.wfile.write(b'<h1>Hello World from Docker!</h1><p>This is running inside a container!</p>')
+        self.wfile.write(HELLO_BODY)
 
-if __name__ == '__main__':
-    server = HTTPServer(('0.0.0.0', 8080), HelloHandler)
-    print("Server running on port 8080...")
+
+def run_http_server(config):
+    """Original single-threaded server: one connection at a time, no keep-alive"""
+    server = HTTPServer((config.host, config.port), HelloHandler)
+    print(f"Server running on port {config.port}...")
     server.serve_forever()
+
+
+# === asyncio server ===
+
+def build_response(status, body, content_type='text/html', keep_alive=True, head=False, extra_headers=()):
+    headers = [
+        f'HTTP/1.1 {status}',
+        f'Content-Type: {content_type}',
+        f'Content-Length: {len(body)}',
+        'Connection: keep-alive' if keep_alive else 'Connection: close',
+    ]
+    headers.extend(extra_headers)
+    head_bytes = ('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1')
+    return head_bytes if head else head_bytes + body
+
+
+def _precomputed(status, body, **kwargs):
+    """(keep_alive, head) -> bytes, built once at startup"""
+    return {
+        (keep_alive, head): build_response(status, body, keep_alive=keep_alive, head=head, **kwargs)
+        for keep_alive in (True, False)
+        for head in (True, False)
+    }
+
+
+HELLO_RESPONSES = _precomputed('200 OK', HELLO_BODY)
+NOT_ALLOWED_RESPONSES = _precomputed(
+    '405 Method Not Allowed', b'Method Not Allowed\n', content_type='text/plain', extra_headers=('Allow: GET, HEAD',)
+)
+BAD_REQUEST_RESPONSE = build_response('400 Bad Request', b'Bad Request\n', content_type='text/plain', keep_alive=False)
+HEADERS_TOO_LARGE_RESPONSE = build_response(
+    '431 Request Header Fields Too Large', b'Request Header Fields Too Large\n',
+    content_type='text/plain', keep_alive=False,
+)
+PAYLOAD_TOO_LARGE_RESPONSE = build_response(
+    '413 Content Too Large', b'Content Too Large\n', content_type='text/plain', keep_alive=False,
+)
+BUSY_RESPONSE = build_response(
+    '503 Service Unavailable', b'Too many connections\n',
+    content_type='text/plain', keep_alive=False, extra_headers=('Retry-After: 1',),
+)
+
+
+class WorkerStats:
+    """
+    Per-worker request counters shared between processes: a memory-mapped file
+    with one (pid, requests) slot per worker. The supervisor claims a slot for
+    each worker it spawns; the worker updates its own counter on every request,
+    and any process can read all of them.
+    """
+
+    SLOT = struct.Struct('QQ')
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'r+b') as f:
+            self._map = mmap.mmap(f.fileno(), 0)
+        self.slots = len(self._map) // self.SLOT.size
+
+    @classmethod
+    def create(cls, path, slots):
+        with open(path, 'wb') as f:
+            f.truncate(slots * cls.SLOT.size)
+        return cls(path)
+
+    def claim(self, slot, pid):
+        self.SLOT.pack_into(self._map, slot * self.SLOT.size, pid, 0)
+
+    def release(self, slot):
+        self.SLOT.pack_into(self._map, slot * self.SLOT.size, 0, 0)
+
+    def record(self, slot, requests):
+        struct.pack_into('Q', self._map, slot * self.SLOT.size + 8, requests)
+
+    def free_slot(self):
+        for slot, pid, _ in self._entries():
+            if not pid:
+                return slot
+        return None
+
+    def read(self):
+        """[(slot, pid, requests)] for the slots in use"""
+        return [entry for entry in self._entries() if entry[1]]
+
+    def _entries(self):
+        return [(slot, *self.SLOT.unpack_from(self._map, slot * self.SLOT.size)) for slot in range(self.slots)]
+
+
+class Metrics:
+    def __init__(self, stats=None, slot=None):
+        self.stats = stats
+        self.slot = slot
+        self.started_at = time.monotonic()
+        self.requests_total = 0
+        self.connections_total = 0
+        self.connections_active = 0
+        self.connections_rejected = 0
+        self.bad_requests = 0
+
+    def render(self):
+        lines = [
+            ('hello_requests_total', 'counter', self.requests_total),
+            ('hello_connections_total', 'counter', self.connections_total),
+            ('hello_connections_active', 'gauge', self.connections_active),
+            ('hello_connections_rejected_total', 'counter', self.connections_rejected),
+            ('hello_bad_requests_total', 'counter', self.bad_requests),
+            ('hello_uptime_seconds', 'gauge', round(time.monotonic() - self.started_at, 3)),
+        ]
+        text = ''.join(f'# TYPE {name} {kind}\n{name} {value}\n' for name, kind, value in lines)
+        if self.stats is not None:
+            # Pre-fork mode: this worker's counters above, every live worker's requests here
+            text += '# TYPE hello_worker_requests_total counter\n' + ''.join(
+                f'hello_worker_requests_total{{slot="{slot}",pid="{pid}"}} {requests}\n'
+                for slot, pid, requests in self.stats.read()
+            )
+        return text.encode('ascii')
+
+
+def parse_request_head(head):
+    """(method, path, keep_alive, content_length) from the raw request head; ValueError if malformed"""
+    lines = head.decode('latin-1').split('\r\n')
+    method, target, version = lines[0].split(' ')
+    if not version.startswith('HTTP/1.'):
+        raise ValueError(f'unsupported version {version}')
+
+    headers = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip().lower()
+
+    connection = headers.get('connection', '')
+    if version == 'HTTP/1.0':
+        keep_alive = 'keep-alive' in connection
+    else:
+        keep_alive = 'close' not in connection
+    content_length = int(headers.get('content-length', '0'))
+    if content_length < 0:
+        raise ValueError('negative content-length')
+    return method, target.split('?', 1)[0], keep_alive, content_length
+
+
+class AsyncHelloServer:
+    """
+    HTTP/1.1 server on asyncio: persistent (keep-alive) connections, pipelined
+    requests, responses precomputed at startup, a limit on open connections and
+    graceful shutdown (stop accepting, let in-flight requests finish, close idle
+    keep-alive connections).
+    """
+
+    def __init__(self, config, stats=None):
+        self.config = config
+        self.metrics = Metrics(stats, config.worker_slot)
+        self.draining = False
+        self._server = None
+        self._connections = {}  # task -> writer while the connection is idle
+        self._stopped = None
+
+    async def start(self, reuse_port=False):
+        # With SO_REUSEPORT every pre-fork worker has its own listen socket on the
+        # same port and the kernel spreads incoming connections between them
+        self._server = await asyncio.start_server(
+            self._handle, self.config.host, self.config.port, backlog=self.config.backlog,
+            reuse_address=True, reuse_port=reuse_port, limit=MAX_HEADER_BYTES,
+        )
+        self._stopped = asyncio.Event()
+        return self._server
+
+    @property
+    def port(self):
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_until_stopped(self):
+        await self._stopped.wait()
+
+    async def shutdown(self):
+        if self.draining:
+            return
+        self.draining = True
+        self._server.close()
+        await self._server.wait_closed()
+
+        # Idle keep-alive connections are closed right away; busy ones answer their
+        # current request with "Connection: close" and then exit
+        for writer in list(self._connections.values()):
+            if writer is not None:
+                writer.close()
+
+        tasks = list(self._connections)
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=self.config.shutdown_timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+        self._stopped.set()
+
+    def install_signal_handlers(self, loop):
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, lambda: asyncio.ensure_future(self.shutdown()))
+
+    async def _handle(self, reader, writer):
+        metrics = self.metrics
+        metrics.connections_total += 1
+        if self.draining or metrics.connections_active >= self.config.max_connections:
+            metrics.connections_rejected += 1
+            writer.write(BUSY_RESPONSE)
+            await self._close(writer)
+            return
+
+        task = asyncio.current_task()
+        metrics.connections_active += 1
+        try:
+            await self._serve_connection(task, reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.pop(task, None)
+            metrics.connections_active -= 1
+            await self._close(writer)
+
+    async def _serve_connection(self, task, reader, writer):
+        metrics = self.metrics
+        while not self.draining:
+            self._connections[task] = writer  # idle: safe to close on shutdown
+            try:
+                head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), self.config.keepalive_timeout)
+            except asyncio.TimeoutError:
+                return
+            except asyncio.LimitOverrunError:
+                metrics.bad_requests += 1
+                writer.write(HEADERS_TOO_LARGE_RESPONSE)
+                return
+            except asyncio.IncompleteReadError:
+                return  # client closed the connection between requests
+            self._connections[task] = None
+
+            try:
+                method, path, keep_alive, content_length = parse_request_head(head)
+            except ValueError:
+                metrics.bad_requests += 1
+                writer.write(BAD_REQUEST_RESPONSE)
+                return
+            if content_length > MAX_BODY_BYTES:
+                metrics.bad_requests += 1
+                writer.write(PAYLOAD_TOO_LARGE_RESPONSE)
+                return
+            if content_length:
+                await reader.readexactly(content_length)
+
+            metrics.requests_total += 1
+            if metrics.stats is not None:
+                metrics.stats.record(metrics.slot, metrics.requests_total)
+            keep_alive = keep_alive and not self.draining
+            head_only = method == 'HEAD'
+            if method not in ('GET', 'HEAD'):
+                writer.write(NOT_ALLOWED_RESPONSES[keep_alive, head_only])
+            elif path == '/metrics':
+                writer.write(build_response(
+                    '200 OK', metrics.render(), content_type='text/plain; version=0.0.4',
+                    keep_alive=keep_alive, head=head_only,
+                ))
+            else:
+                writer.write(HELLO_RESPONSES[keep_alive, head_only])
+
+            await writer.drain()
+            if not keep_alive:
+                return
+
+    @staticmethod
+    async def _close(writer):
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def _exit_with_parent(server, parent_pid):
+    # A worker whose supervisor died (SIGKILL, OOM) must not keep the port
+    while os.getppid() == parent_pid:
+        await asyncio.sleep(1)
+    await server.shutdown()
+
+
+def run_asyncio_server(config):
+    async def main():
+        worker = config.worker_slot is not None
+        stats = WorkerStats(config.stats_file) if worker else None
+        server = AsyncHelloServer(config, stats)
+        await server.start(reuse_port=worker)
+        server.install_signal_handlers(asyncio.get_running_loop())
+
+        if worker:
+            os.write(config.ready_fd, b'1')  # supervisor: listening, old workers may go
+            os.close(config.ready_fd)
+            watchdog = asyncio.ensure_future(_exit_with_parent(server, os.getppid()))
+            print(f"Worker {os.getpid()} (slot {config.worker_slot}) listening on port {config.port}")
+        else:
+            print(
+                f"Async server running on port {config.port} "
+                f"(backlog={config.backlog}, max_connections={config.max_connections})..."
+            )
+        await server.serve_until_stopped()
+        if worker:
+            watchdog.cancel()
+        print("Server stopped")
+
+    asyncio.run(main())
+
+
+def parse_args(argv=None):
+    env = os.environ.get
+    parser = argparse.ArgumentParser(description='Hello World web server')
+    parser.add_argument('--mode', choices=('http', 'asyncio'), default=env('SERVER_MODE', 'http'))
+    parser.add_argument('--host', default=env('HOST', '0.0.0.0'))
+    parser.add_argument('--port', type=int, default=int(env('PORT', '8080')))
+    parser.add_argument('--backlog', type=int, default=int(env('BACKLOG', '1024')),
+                        help='Listen queue length (asyncio mode)')
+    parser.add_argument('--max-connections', type=int, default=int(env('MAX_CONNECTIONS', '1000')),
+                        help='Open connections above this get a 503 (asyncio mode)')
+    parser.add_argument('--keepalive-timeout', type=float, default=float(env('KEEPALIVE_TIMEOUT', '5')),
+                        help='Seconds an idle keep-alive connection stays open (asyncio mode)')
+    parser.add_argument('--shutdown-timeout', type=float, default=float(env('SHUTDOWN_TIMEOUT', '10')),
+                        help='Seconds to wait for in-flight requests on SIGTERM (asyncio mode)')
+    parser.add_argument('--workers', type=int, default=int(env('WORKERS', '1')),
+                        help='Pre-fork worker processes sharing the port (asyncio mode); 0 = one per CPU')
+    # Set by the supervisor when it starts a worker
+    parser.add_argument('--worker-slot', type=int, default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--stats-file', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--ready-fd', type=int, default=None, help=argparse.SUPPRESS)
+    config = parser.parse_args(argv)
+
+    if config.workers == 0:
+        config.workers = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count()
+    if config.workers > 1 and config.mode != 'asyncio':
+        parser.error('--workers > 1 requires --mode asyncio')
+    return config
+
+
+if __name__ == '__main__':
+    config = parse_args()
+    if config.workers > 1 and config.worker_slot is None:
+        from supervisor import Supervisor
+        Supervisor(config).run()
+    elif config.mode == 'asyncio':
+        run_asyncio_server(config)
+    else:
+        run_http_server(config)
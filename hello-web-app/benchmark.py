@@ -0,0 +1,148 @@
+"""
+Concurrency benchmark: the original http.server mode vs the asyncio mode.
+
+Each server is started as a subprocess on a free local port, then N concurrent
+clients send requests over raw sockets. Clients reuse their connection while the
+server keeps it open (asyncio mode) and reconnect when it closes it (http mode,
+which answers with HTTP/1.0 and closes after every response).
+
+Usage:
+    python benchmark.py --concurrency 1,16,64 --requests 5000
+"""
+import argparse
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+APP = Path(__file__).resolve().parent / 'app.py'
+REQUEST = b'GET / HTTP/1.1\r\nHost: localhost\r\n\r\n'
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode, port, extra_args=()):
+    process = subprocess.Popen(
+        [sys.executable, str(APP), '--mode', mode, '--host', '127.0.0.1', '--port', str(port), *extra_args],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,  # http.server access log
+    )
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError(f'{mode} server did not start on port {port}')
+
+
+async def read_response(reader):
+    """Body of one response and whether the server keeps the connection open"""
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split(' ')[1])
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip().lower()
+
+    keep_alive = lines[0].startswith('HTTP/1.1') and headers.get('connection') != 'close'
+    if 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length']))
+    else:
+        await reader.read()  # body delimited by the connection closing
+        keep_alive = False
+    return status, keep_alive
+
+
+async def client(port, count, latencies, errors):
+    reader = writer = None
+    for _ in range(count):
+        started = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(REQUEST)
+            status, keep_alive = await read_response(reader)
+            if status != 200:
+                errors.append(status)
+            if not keep_alive:
+                writer.close()
+                writer = None
+        except (OSError, asyncio.IncompleteReadError) as exc:
+            errors.append(type(exc).__name__)
+            if writer is not None:
+                writer.close()
+            writer = None
+            continue
+        latencies.append(time.perf_counter() - started)
+    if writer is not None:
+        writer.close()
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return round(ordered[index] * 1000, 3)
+
+
+async def run_load(port, concurrency, total):
+    latencies, errors = [], []
+    per_client = [total // concurrency + (1 if i < total % concurrency else 0) for i in range(concurrency)]
+    started = time.perf_counter()
+    await asyncio.gather(*(client(port, count, latencies, errors) for count in per_client))
+    elapsed = time.perf_counter() - started
+    return {
+        'requests': total,
+        'ok': len(latencies) - sum(1 for e in errors if isinstance(e, int)),
+        'errors': len(errors),
+        'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else None,
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'p99_ms': percentile(latencies, 99),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='hello-web-app server concurrency benchmark')
+    parser.add_argument('--modes', default='http,asyncio')
+    parser.add_argument('--concurrency', default='1,16,64', help='Comma-separated client counts')
+    parser.add_argument('--requests', type=int, default=5000, help='Requests per run')
+    parser.add_argument('--output', default=None, help='JSON results file')
+    args = parser.parse_args(argv)
+
+    report = {}
+    for mode in args.modes.split(','):
+        port = free_port()
+        process = start_server(mode, port)
+        try:
+            report[mode] = {}
+            for concurrency in (int(c) for c in args.concurrency.split(',')):
+                row = asyncio.run(run_load(port, concurrency, args.requests))
+                report[mode][str(concurrency)] = row
+                print(
+                    f"{mode:<8} c={concurrency:<4} {row['throughput_rps']:>10,.0f} req/s  "
+                    f"p50 {row['p50_ms']}ms  p95 {row['p95_ms']}ms  p99 {row['p99_ms']}ms  errors={row['errors']}"
+                )
+        finally:
+            process.terminate()
+            process.wait(timeout=15)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
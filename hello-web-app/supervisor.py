@@ -0,0 +1,249 @@
+"""
+Pre-fork supervisor for the asyncio server (`app.py --mode asyncio --workers N`).
+
+Starts N worker processes (`app.py` re-executed with --worker-slot), each with its
+own SO_REUSEPORT listen socket on the same port, so the kernel spreads
+connections across all of them and the container can use every core it is given.
+
+  - a worker that exits unexpectedly is restarted (exponential backoff when it
+    keeps crashing right after start);
+  - SIGHUP starts a new generation of workers from the code on disk and stops the
+    old generation only once every new worker is listening (zero-downtime reload);
+  - SIGTERM/SIGINT stop all workers gracefully;
+  - SIGUSR1 prints the per-worker request counts (also served by /metrics).
+"""
+import os
+import select
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from app import WorkerStats
+
+APP = Path(__file__).resolve().parent / 'app.py'
+READY_TIMEOUT = 10        # seconds for a new worker to start listening
+STABLE_AFTER = 1.0        # a worker alive longer than this resets the crash backoff
+MAX_RESTART_DELAY = 5.0
+KILL_GRACE = 5.0          # after shutdown_timeout, before SIGKILL
+
+
+def log(message):
+    print(f"[supervisor] {message}", flush=True)
+
+
+class Worker:
+    def __init__(self, index, slot, generation, process, ready_fd):
+        self.index = index
+        self.slot = slot
+        self.generation = generation
+        self.process = process
+        self.ready_fd = ready_fd
+        self.ready = False
+        self.retiring = False
+        self.started_at = time.monotonic()
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+
+class Supervisor:
+    def __init__(self, config):
+        self.config = config
+        self.workers = {}                     # pid -> Worker
+        self.generation = 0
+        self.crashes = [0] * config.workers   # consecutive quick crashes per worker index
+        self.restarts = {}                    # index -> monotonic time of the next restart
+        self.reload = None                    # (old pids, new pids, deadline) while a generation starts
+        self.stopping_since = None
+        self.retired_requests = 0
+        self.exit_code = 0
+        self._signals = []
+
+        shm = '/dev/shm' if os.path.isdir('/dev/shm') else None
+        fd, path = tempfile.mkstemp(prefix='hello-worker-stats-', dir=shm)
+        os.close(fd)
+        # Old and new generations overlap during a reload, and old workers may still be draining
+        self.stats = WorkerStats.create(path, slots=4 * config.workers)
+
+    # --- process management ---
+
+    def _spawn(self, index):
+        slot = self.stats.free_slot()
+        if slot is None:
+            raise RuntimeError('no free worker stats slot')
+        ready_r, ready_w = os.pipe()
+        config = self.config
+        args = [
+            sys.executable, str(APP), '--mode', 'asyncio', '--workers', '1',
+            '--host', config.host, '--port', str(config.port), '--backlog', str(config.backlog),
+            '--max-connections', str(config.max_connections),
+            '--keepalive-timeout', str(config.keepalive_timeout),
+            '--shutdown-timeout', str(config.shutdown_timeout),
+            '--worker-slot', str(slot), '--stats-file', self.stats.path, '--ready-fd', str(ready_w),
+        ]
+        try:
+            process = subprocess.Popen(args, pass_fds=(ready_w,))
+        finally:
+            os.close(ready_w)
+        self.stats.claim(slot, process.pid)
+        worker = Worker(index, slot, self.generation, process, ready_r)
+        self.workers[worker.pid] = worker
+        return worker
+
+    def _start_generation(self):
+        old = {pid for pid, worker in self.workers.items() if not worker.retiring}
+        if len(self.workers) + self.config.workers > self.stats.slots:
+            log("reload ignored: previous workers are still draining")
+            return
+        self.generation += 1
+        self.restarts.clear()
+        new = {self._spawn(index).pid for index in range(self.config.workers)}
+        self.reload = (old, new, time.monotonic() + READY_TIMEOUT)
+        log(f"generation {self.generation}: started workers {sorted(new)}")
+
+    def _retire(self, pids, sig=signal.SIGTERM):
+        for pid in pids:
+            worker = self.workers.get(pid)
+            if worker is not None and worker.process.poll() is None:
+                worker.retiring = True
+                worker.process.send_signal(sig)
+
+    def _check_reload(self):
+        old, new, deadline = self.reload
+        failed = [pid for pid in new if pid not in self.workers]
+        if not failed and all(self.workers[pid].ready for pid in new):
+            self.reload = None
+            self._retire(old)
+            log(f"generation {self.generation} ready" + (f", stopping {sorted(old)}" if old else ""))
+        elif failed or time.monotonic() > deadline:
+            self.reload = None
+            self._retire(new)
+            if not old:
+                log("workers failed to start, exiting")
+                self.exit_code = 1
+                self._stop()
+            else:
+                # Old generation keeps serving; its workers are restarted as before
+                self.generation -= 1
+                log("reload failed, keeping the previous workers")
+
+    def _reap(self):
+        for pid, worker in list(self.workers.items()):
+            returncode = worker.process.poll()
+            if returncode is None:
+                continue
+            del self.workers[pid]
+            self._close_ready_fd(worker)
+            for slot, slot_pid, requests in self.stats.read():
+                if slot == worker.slot and slot_pid == pid:
+                    self.retired_requests += requests
+            self.stats.release(worker.slot)
+
+            if worker.retiring or self.stopping_since is not None or worker.generation != self.generation:
+                continue
+            if self.reload is not None and pid in self.reload[1]:
+                continue  # failed start of a new generation, handled by _check_reload
+
+            uptime = time.monotonic() - worker.started_at
+            self.crashes[worker.index] = self.crashes[worker.index] + 1 if uptime < STABLE_AFTER else 1
+            delay = min(0.1 * 2 ** (self.crashes[worker.index] - 1), MAX_RESTART_DELAY)
+            self.restarts[worker.index] = time.monotonic() + delay
+            log(f"worker {pid} (slot {worker.slot}) exited with {returncode}, restarting in {delay:.1f}s")
+
+    def _restart_due(self):
+        now = time.monotonic()
+        for index, when in list(self.restarts.items()):
+            if when <= now:
+                del self.restarts[index]
+                worker = self._spawn(index)
+                log(f"worker {worker.pid} started (slot {worker.slot})")
+
+    def _stop(self):
+        if self.stopping_since is None:
+            self.stopping_since = time.monotonic()
+            self.restarts.clear()
+            self.reload = None
+            self._retire(list(self.workers))
+
+    # --- signals and readiness ---
+
+    def _on_signal(self, signum, frame):
+        self._signals.append(signum)
+
+    def _handle_signals(self):
+        while self._signals:
+            signum = self._signals.pop(0)
+            if signum in (signal.SIGTERM, signal.SIGINT):
+                log("shutting down")
+                self._stop()
+            elif signum == signal.SIGHUP and self.stopping_since is None:
+                if self.reload is None:
+                    self._start_generation()
+            elif signum == signal.SIGUSR1:
+                self.report()
+
+    def _read_ready(self, fd):
+        worker = next((w for w in self.workers.values() if w.ready_fd == fd), None)
+        data = os.read(fd, 1)
+        if worker is not None:
+            worker.ready = data == b'1'
+            self._close_ready_fd(worker)
+
+    @staticmethod
+    def _close_ready_fd(worker):
+        if worker.ready_fd is not None:
+            os.close(worker.ready_fd)
+            worker.ready_fd = None
+
+    def report(self):
+        rows = sorted(self.stats.read())
+        total = sum(requests for _, _, requests in rows)
+        for slot, pid, requests in rows:
+            log(f"  slot {slot} pid {pid}: {requests} requests")
+        log(f"  live workers: {total} requests, exited workers: {self.retired_requests} requests")
+
+    # --- main loop ---
+
+    def run(self):
+        wakeup_r, wakeup_w = os.pipe()
+        os.set_blocking(wakeup_r, False)
+        os.set_blocking(wakeup_w, False)
+        signal.set_wakeup_fd(wakeup_w)
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGUSR1, signal.SIGCHLD):
+            signal.signal(signum, self._on_signal)
+
+        log(f"starting {self.config.workers} workers on port {self.config.port} (pid {os.getpid()})")
+        try:
+            self._start_generation()
+            while self.workers or self.stopping_since is None:
+                ready_fds = [w.ready_fd for w in self.workers.values() if w.ready_fd is not None]
+                readable, _, _ = select.select([wakeup_r] + ready_fds, [], [], 0.5)
+                for fd in readable:
+                    if fd == wakeup_r:
+                        while True:
+                            try:
+                                if not os.read(wakeup_r, 512):
+                                    break
+                            except BlockingIOError:
+                                break
+                    else:
+                        self._read_ready(fd)
+
+                self._handle_signals()
+                self._reap()
+                if self.reload is not None:
+                    self._check_reload()
+                if self.stopping_since is None:
+                    self._restart_due()
+                elif time.monotonic() - self.stopping_since > self.config.shutdown_timeout + KILL_GRACE:
+                    self._retire(list(self.workers), signal.SIGKILL)
+        finally:
+            self.report()
+            for worker in self.workers.values():
+                worker.process.kill()
+            os.unlink(self.stats.path)
+        sys.exit(self.exit_code)